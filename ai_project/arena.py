@@ -0,0 +1,760 @@
+"""Headless engine-vs-engine arena and benchmark suite.
+
+Authors: Trevor Arcieri and Demetri Karras
+Course: CS 481 Artificial Intelligence
+Term: Spring 2025
+Project: DualBoard Negamax AI
+"""
+
+import argparse
+import copy
+import json
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from math import ceil
+from typing import Any
+
+import numpy as np
+
+from ai_project.board import AbstractBoard
+from ai_project.engine import AbstractEngine
+from ai_project.perft import make_board
+
+GAMES = ["checkers", "tic-tac-toe"]
+PERCENTILES = (50, 90, 99)
+
+# Checkers benchmark positions as (white men, white kings, black men, black kings,
+# turn), taken from seeded random games after 0, 5, 10, ... 40 plies
+CHECKERS_BENCH = [
+    (0xFFF00000, 0x0, 0xFFF, 0x0, -1),
+    (0x7FF20000, 0x0, 0x3CFF, 0x0, 1),
+    (0xFF241000, 0x0, 0x4BBB, 0x0, -1),
+    (0x76F98000, 0x0, 0x25DEE, 0x0, 1),
+    (0xD7B00010, 0x0, 0x484AC7, 0x0, -1),
+    (0x333C8200, 0x0, 0x401587B, 0x0, 1),
+    (0x83730000, 0x4, 0x4003938, 0x0, -1),
+    (0x095D8200, 0x1, 0x258C8, 0x20000000, -1),
+]
+
+# Tic-tac-toe benchmark positions as the moves played from the empty board
+TTT_BENCH = [(), (4,), (0, 4), (1, 4, 7), (0, 8, 4, 2), (4, 0, 8, 2, 1)]
+
+DEFAULT_BENCH_DEPTHS = {"checkers": 8, "tic-tac-toe": 9}
+
+MNK_SIZES = [7, 11, 15, 19]  # side lengths of the square m,n,k scaling boards
+
+
+@dataclass(frozen=True)
+class EngineConfig:
+    """Settings of one arena engine.
+
+    Attributes:
+        depth (int): Search depth in plies.
+        randomness (float): Randomness percentage of its moves (0-100).
+        time_budget_ms (float | None): Per-move search time, instead of ``depth``.
+        tt_size_mb (float): Transposition table size in megabytes.
+        pvs (bool): Use principal variation search.
+        aspiration_window (int | None): Aspiration window of iterative deepening.
+        quiescence_nodes (int): Quiescence search budget per horizon position.
+        batch_leaves (bool): Score the leaves of each frontier node in one batch.
+        detect_draws (bool): Score repetitions inside the search tree as draws.
+        lmr_moves (int): Moves searched before late move reductions start.
+        futility_margin (int): Futility pruning margin per ply.
+        razor_margin (int): Razoring margin per ply.
+        weights (str | None): File of tuned evaluation weights (see ``tune``).
+        exact_tt_depth (bool): Cut off only on same-depth transposition scores.
+    """
+
+    depth: int
+    randomness: float = 0.0
+    time_budget_ms: float | None = None
+    tt_size_mb: float = 16.0
+    pvs: bool = False
+    aspiration_window: int | None = None
+    quiescence_nodes: int = 0
+    batch_leaves: bool = False
+    detect_draws: bool = False
+    lmr_moves: int = 0
+    futility_margin: int = 0
+    razor_margin: int = 0
+    weights: str | None = None
+    exact_tt_depth: bool = False
+
+
+@dataclass(frozen=True)
+class GameSpec:
+    """Everything needed to replay one arena game exactly.
+
+    Attributes:
+        game (str): ``"checkers"`` or ``"tic-tac-toe"``.
+        index (int): Number of the game in its match.
+        seed (int): Seed of the opening moves and of the engines' random moves.
+        opening_plies (int): Random moves played before the engines take over.
+        engines (tuple[EngineConfig, EngineConfig]): Engines A and B.
+        a_moves_first (bool): Whether engine A makes the first engine move.
+        max_plies (int): Engine moves after which the game is adjudicated a draw.
+    """
+
+    game: str
+    index: int
+    seed: int
+    opening_plies: int
+    engines: tuple[EngineConfig, EngineConfig]
+    a_moves_first: bool
+    max_plies: int
+
+
+@dataclass
+class GameRecord:
+    """Outcome of an arena game and the cost of each engine move.
+
+    Attributes:
+        spec (GameSpec): The game played.
+        winner (str | None): ``"a"``, ``"b"``, or ``None`` for a draw.
+        moves (list[str]): Engine moves, in order.
+        engines (list[int]): Index of the engine (0 for A) that played each move.
+        seconds (list[float]): Latency of each move.
+        nodes (list[int]): Nodes searched for each move.
+    """
+
+    spec: GameSpec
+    winner: str | None = None
+    moves: list[str] = field(default_factory=list)
+    engines: list[int] = field(default_factory=list)
+    seconds: list[float] = field(default_factory=list)
+    nodes: list[int] = field(default_factory=list)
+
+
+def make_engine(game: str, config: EngineConfig, seed: int | None = None) -> Any:
+    """Create a statistics-collecting engine for ``game``."""
+    kwargs = {
+        "randomness": config.randomness,
+        "time_budget_ms": config.time_budget_ms,
+        "tt_size_mb": config.tt_size_mb,
+        "pvs": config.pvs,
+        "aspiration_window": config.aspiration_window,
+        "quiescence_nodes": config.quiescence_nodes,
+        "batch_leaves": config.batch_leaves,
+        "detect_draws": config.detect_draws,
+        "lmr_moves": config.lmr_moves,
+        "futility_margin": config.futility_margin,
+        "razor_margin": config.razor_margin,
+        "exact_tt_depth": config.exact_tt_depth,
+        "collect_stats": True,
+        "seed": seed,
+    }
+    if game == "tic-tac-toe":
+        from ai_project.tic_tac_toe.engine import TttEngine
+
+        return TttEngine(config.depth, weights=config.weights, **kwargs)
+    if game == "mnk":
+        from ai_project.mnk.engine import MnkEngine
+
+        return MnkEngine(config.depth, **kwargs)
+    from ai_project.checkers.engine import CheckersEngine
+
+    return CheckersEngine(config.depth, weights=config.weights, **kwargs)
+
+
+def timed_search(
+    engine: AbstractEngine, board: AbstractBoard
+) -> tuple[Any, float, int]:
+    """Search ``board``, returning the move, the latency and the nodes searched."""
+    start = time.perf_counter()
+    move, stats = engine.search(board)
+    return move, time.perf_counter() - start, stats.nodes if stats else 0
+
+
+def play_game(spec: GameSpec) -> GameRecord:
+    """Play one arena game; the pool's unit of work."""
+    rng = random.Random(spec.seed)
+    board = make_board(spec.game, "bitboard")
+    for _ in range(spec.opening_plies):
+        if board.game_over:
+            break
+        board.push(rng.choice(board.legal_move_list()))
+
+    engines = [
+        make_engine(spec.game, config, spec.seed * 2 + i)
+        for i, config in enumerate(spec.engines)
+    ]
+    a_turn = board.turn if spec.a_moves_first else -board.turn
+    record = GameRecord(spec)
+    while not board.game_over and len(record.moves) < spec.max_plies:
+        side = 0 if board.turn == a_turn else 1
+        move, seconds, nodes = timed_search(engines[side], board)
+        record.moves.append(str(move))
+        record.engines.append(side)
+        record.seconds.append(seconds)
+        record.nodes.append(nodes)
+        board.push(move)
+
+    if board.game_over and not board.is_draw:  # the side to move has lost
+        record.winner = "b" if board.turn == a_turn else "a"
+    return record
+
+
+def run_match(specs: list[GameSpec], workers: int) -> list[GameRecord]:
+    """Play the games, in a pool of ``workers`` processes if above 1."""
+    if workers == 1:
+        return [play_game(spec) for spec in specs]
+    with ProcessPoolExecutor(workers) as pool:
+        return list(pool.map(play_game, specs))
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values``, 0 if there are none."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[max(0, ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def summarize(records: list[GameRecord]) -> dict[str, Any]:
+    """Results from engine A's point of view, and the move costs of both engines."""
+    games = len(records)
+    wins = sum(record.winner == "a" for record in records)
+    losses = sum(record.winner == "b" for record in records)
+    summary: dict[str, Any] = {
+        "games": games,
+        "win_rate": wins / games if games else 0.0,
+        "draw_rate": (games - wins - losses) / games if games else 0.0,
+        "loss_rate": losses / games if games else 0.0,
+    }
+    for side, name in enumerate("ab"):
+        seconds, nodes = [], []
+        for record in records:
+            for i, engine in enumerate(record.engines):
+                if engine == side:
+                    seconds.append(record.seconds[i])
+                    nodes.append(record.nodes[i])
+        summary[name] = {
+            "moves": len(seconds),
+            **{
+                f"latency_p{pct}_ms": percentile(seconds, pct) * 1000
+                for pct in PERCENTILES
+            },
+            "latency_max_ms": max(seconds, default=0.0) * 1000,
+            "mean_nodes": sum(nodes) / len(nodes) if nodes else 0.0,
+            "nodes_per_second": sum(nodes) / sum(seconds) if sum(seconds) else 0.0,
+        }
+    return summary
+
+
+def bench_positions(game: str) -> list[AbstractBoard]:
+    """The fixed benchmark positions of ``game``."""
+    if game == "tic-tac-toe":
+        boards = []
+        for moves in TTT_BENCH:
+            board = make_board(game, "bitboard")
+            for move in moves:
+                board.push(move)
+            boards.append(board)
+        return boards
+    from ai_project.checkers.bitboard import CheckersBitboard
+    from ai_project.engine import AbstractPlayer
+
+    boards: list[AbstractBoard] = [
+        CheckersBitboard(
+            white_men, white_kings, black_men, black_kings, AbstractPlayer(turn)
+        )
+        for white_men, white_kings, black_men, black_kings, turn in CHECKERS_BENCH
+    ]
+    return boards
+
+
+def run_bench(game: str, config: EngineConfig) -> dict[str, Any]:
+    """Search every benchmark position of ``game`` with a fresh engine."""
+    positions = []
+    for board in bench_positions(game):
+        engine = make_engine(game, config, seed=0)
+        move, seconds, nodes = timed_search(engine, board)
+        positions.append({"move": str(move), "seconds": seconds, "nodes": nodes})
+    nodes = sum(position["nodes"] for position in positions)
+    seconds = sum(position["seconds"] for position in positions)
+    return {
+        "engine": asdict(config),
+        "nodes": nodes,
+        "seconds": seconds,
+        "nodes_per_second": nodes / seconds if seconds else 0.0,
+        "positions": positions,
+    }
+
+
+def bench_mnk(
+    config: EngineConfig,
+    sizes: list[int],
+    k: int,
+    *,
+    stones: int = 8,
+    positions: int = 4,
+    seed: int = 0,
+) -> dict[int, dict[str, Any]]:
+    """Search m,n,k positions of growing board size to compare the node rates.
+
+    On every size, ``positions`` positions of ``stones`` random candidate moves
+    are searched with a fresh engine, from the same seeds. Lines are ``k`` long,
+    or as long as the board if smaller.
+    """
+    from ai_project.mnk.board import MnkBoard
+
+    results = {}
+    for size in sizes:
+        nodes = 0
+        seconds = 0.0
+        for i in range(positions):
+            rng = random.Random(seed + i)
+            board = MnkBoard(size, size, min(k, size))
+            for _ in range(stones):
+                if board.game_over:
+                    break
+                board.push(rng.choice(board.candidate_moves()))
+            engine = make_engine("mnk", config, seed=0)
+            _, move_seconds, move_nodes = timed_search(engine, board)
+            nodes += move_nodes
+            seconds += move_seconds
+        results[size] = {
+            "nodes": nodes,
+            "seconds": seconds,
+            "nodes_per_second": nodes / seconds if seconds else 0.0,
+        }
+    return results
+
+
+def _leaf_groups(game: str) -> list[list[AbstractBoard]]:
+    """Non-terminal leaves below the benchmark positions and their children.
+
+    Leaves are grouped by parent, as a search with ``batch_leaves`` scores them.
+    """
+    parents = []
+    for root in bench_positions(game):
+        parents.append(root)
+        for move in root.legal_move_list():
+            root.push(move)
+            if not root.game_over:
+                parents.append(copy.deepcopy(root))
+            root.pop()
+    groups = []
+    for parent in parents:
+        group = []
+        for move in parent.legal_move_list():
+            parent.push(move)
+            if not parent.game_over:
+                group.append(copy.deepcopy(parent))
+            parent.pop()
+        if group:
+            groups.append(group)
+    return groups
+
+
+def bench_evaluation(game: str, repeats: int = 5) -> dict[str, Any]:
+    """Compare the per-leaf cost of scalar and batch evaluation.
+
+    Batches are timed per group of siblings including their encoding, as in the
+    search, and as a single batch of every leaf. Times are the best of
+    ``repeats`` runs.
+    """
+    engine = make_engine(game, EngineConfig(1))
+    groups = _leaf_groups(game)
+    leaves = [board for group in groups for board in group]
+    encoded = np.array([engine.encode(board) for board in leaves], dtype=np.uint64)
+
+    def best_ns_per_leaf(run: Any) -> float:
+        """Best time of ``repeats`` calls of ``run``, per leaf in nanoseconds."""
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+        return min(times) / len(leaves) * 1e9
+
+    scalar = best_ns_per_leaf(lambda: [engine.evaluate(board) for board in leaves])
+    grouped = best_ns_per_leaf(
+        lambda: [
+            engine.evaluate_batch(
+                np.array([engine.encode(board) for board in group], dtype=np.uint64)
+            )
+            for group in groups
+        ]
+    )
+    single = best_ns_per_leaf(lambda: engine.evaluate_batch(encoded))
+    return {
+        "leaves": len(leaves),
+        "mean_group_size": len(leaves) / len(groups),
+        "matches": engine.evaluate_batch(encoded).tolist()
+        == [engine.evaluate(board) for board in leaves],
+        "scalar_ns_per_leaf": scalar,
+        "batch_ns_per_leaf": grouped,
+        "single_batch_ns_per_leaf": single,
+    }
+
+
+def compare_bench(
+    results: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """List the regressions of ``results`` against a ``baseline`` run.
+
+    Node counts and moves are reproducible, so any change is reported; time is
+    not, so only slowdowns beyond ``tolerance`` percent are.
+    """
+    problems = []
+    for game, result in results.items():
+        old = baseline.get(game)
+        if old is None or old.get("engine") != result["engine"]:
+            continue  # not comparable
+        for i, (new, before) in enumerate(
+            zip(result["positions"], old["positions"], strict=True)
+        ):
+            if (new["nodes"], new["move"]) != (before["nodes"], before["move"]):
+                problems.append(
+                    f"{game} position {i}: {new['move']} in {new['nodes']} nodes,"
+                    f" was {before['move']} in {before['nodes']} nodes"
+                )
+        if result["seconds"] > old["seconds"] * (1 + tolerance / 100):
+            problems.append(
+                f"{game}: {result['seconds']:.3f}s, was {old['seconds']:.3f}s"
+            )
+    return problems
+
+
+def _play(args: argparse.Namespace) -> None:
+    """Run the ``play`` command."""
+    engines = tuple(
+        EngineConfig(
+            args.depth[i],
+            args.randomness[i],
+            args.time_budget,
+            args.hash_size,
+            quiescence_nodes=args.quiescence[i],
+            detect_draws=args.detect_draws,
+            lmr_moves=args.lmr[i],
+            futility_margin=args.futility[i],
+            razor_margin=args.razor[i],
+            weights=args.weights if i == 0 else None,
+        )
+        for i in range(2)  # engines A and B
+    )
+    specs = [
+        GameSpec(
+            game=args.game,
+            index=i,
+            seed=args.seed + i,
+            opening_plies=args.opening_plies,
+            engines=engines,  # pyright: ignore[reportArgumentType]
+            a_moves_first=i % 2 == 0,
+            max_plies=args.max_plies,
+        )
+        for i in range(args.games)
+    ]
+    records = run_match(specs, args.workers)
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            for record in records:
+                file.write(json.dumps(asdict(record)) + "\n")
+    print(json.dumps(summarize(records), indent=2))
+
+
+def _bench(args: argparse.Namespace) -> None:
+    """Run the ``bench`` command."""
+    games = GAMES if args.game == "all" else [args.game]
+    results = {}
+    for game in games:
+        config = EngineConfig(
+            args.depth or DEFAULT_BENCH_DEPTHS[game],
+            pvs=args.pvs,
+            quiescence_nodes=args.quiescence,
+            batch_leaves=args.batch_leaves,
+            detect_draws=args.detect_draws,
+            lmr_moves=args.lmr,
+            futility_margin=args.futility,
+            razor_margin=args.razor,
+            exact_tt_depth=args.exact_tt_depth,
+        )
+        results[game] = result = run_bench(game, config)
+        print(
+            f"{game}: depth {config.depth}, {result['nodes']} nodes in"
+            f" {result['seconds']:.3f}s ({result['nodes_per_second']:,.0f} nodes/s)"
+        )
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            problems = compare_bench(results, json.load(file), args.tolerance)
+        if problems:
+            raise SystemExit("Regressions:\n" + "\n".join(problems))
+        print("No regressions")
+
+
+def _evaluate(args: argparse.Namespace) -> None:
+    """Run the ``eval`` command."""
+    games = GAMES if args.game == "all" else [args.game]
+    results = {}
+    for game in games:
+        results[game] = result = bench_evaluation(game, args.repeats)
+        print(
+            f"{game}: {result['leaves']} leaves in groups of"
+            f" {result['mean_group_size']:.1f}, scalar"
+            f" {result['scalar_ns_per_leaf']:,.0f} ns/leaf, batch"
+            f" {result['batch_ns_per_leaf']:,.0f} ns/leaf (single batch"
+            f" {result['single_batch_ns_per_leaf']:,.0f} ns/leaf)"
+        )
+        if not result["matches"]:
+            raise SystemExit(f"{game}: batch scores differ from scalar scores")
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+def _mnk(args: argparse.Namespace) -> None:
+    """Run the ``mnk`` command."""
+    config = EngineConfig(args.depth, tt_size_mb=args.hash_size)
+    results = bench_mnk(
+        config,
+        args.sizes,
+        args.k,
+        stones=args.stones,
+        positions=args.positions,
+        seed=args.seed,
+    )
+    for size, result in results.items():
+        print(
+            f"{size}x{size}: depth {config.depth}, {result['nodes']} nodes in"
+            f" {result['seconds']:.3f}s ({result['nodes_per_second']:,.0f} nodes/s)"
+        )
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+def main() -> None:
+    """Play engine-vs-engine matches, or run the search or evaluation benchmarks."""
+    parser = argparse.ArgumentParser(
+        description="Headless engine arena and benchmark suite",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    play = commands.add_parser(
+        "play",
+        help="Play engine A against engine B, alternating who moves first",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    play.add_argument("-g", "--game", choices=GAMES, default="checkers")
+    play.add_argument("-n", "--games", type=int, default=10, help="Games to play")
+    play.add_argument(
+        "-d",
+        "--depth",
+        type=int,
+        nargs=2,
+        default=[4, 4],
+        help="Search depths of engines A and B",
+        metavar=("A", "B"),
+    )
+    play.add_argument(
+        "-r",
+        "--randomness",
+        type=float,
+        nargs=2,
+        default=[0.0, 0.0],
+        help="Randomness percentages of engines A and B",
+        metavar=("A", "B"),
+    )
+    play.add_argument(
+        "-q",
+        "--quiescence",
+        type=int,
+        nargs=2,
+        default=[0, 0],
+        help="Quiescence search budgets of engines A and B (0 disables it)",
+        metavar=("A", "B"),
+    )
+    play.add_argument(
+        "--lmr",
+        type=int,
+        nargs=2,
+        default=[0, 0],
+        help="Moves before late move reductions of engines A and B (0 disables them)",
+        metavar=("A", "B"),
+    )
+    play.add_argument(
+        "--futility",
+        type=int,
+        nargs=2,
+        default=[0, 0],
+        help="Futility pruning margins of engines A and B (0 disables it)",
+        metavar=("A", "B"),
+    )
+    play.add_argument(
+        "--razor",
+        type=int,
+        nargs=2,
+        default=[0, 0],
+        help="Razoring margins of engines A and B (0 disables it)",
+        metavar=("A", "B"),
+    )
+    play.add_argument(
+        "--weights",
+        default=None,
+        help="Evaluation weights of engine A (see tune); B keeps the default ones",
+        metavar="FILE",
+    )
+    play.add_argument(
+        "--detect-draws",
+        action="store_true",
+        help="Score repetitions inside the search tree as draws, in both engines",
+    )
+    play.add_argument(
+        "-t",
+        "--time-budget",
+        type=float,
+        default=None,
+        help="Search each move for this many milliseconds instead of to a depth",
+        metavar="MS",
+    )
+    play.add_argument(
+        "--hash-size", type=float, default=16.0, help="TT size in MB", metavar="MB"
+    )
+    play.add_argument("-s", "--seed", type=int, default=0, help="Seed of game 0")
+    play.add_argument(
+        "--opening-plies",
+        type=int,
+        default=2,
+        help="Random moves played before the engines take over",
+    )
+    play.add_argument(
+        "--max-plies",
+        type=int,
+        default=200,
+        help="Engine moves after which a game is a draw",
+    )
+    play.add_argument(
+        "-w", "--workers", type=int, default=1, help="Processes playing games"
+    )
+    play.add_argument(
+        "-o", "--output", help="Write every game to FILE as JSON lines", metavar="FILE"
+    )
+
+    bench = commands.add_parser(
+        "bench",
+        help="Search the fixed benchmark positions",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    bench.add_argument("-g", "--game", choices=[*GAMES, "all"], default="all")
+    bench.add_argument(
+        "-d",
+        "--depth",
+        type=int,
+        default=None,
+        help=f"Search depth (default: {DEFAULT_BENCH_DEPTHS})",
+    )
+    bench.add_argument(
+        "--pvs", action="store_true", help="Use principal variation search"
+    )
+    bench.add_argument(
+        "-q",
+        "--quiescence",
+        type=int,
+        default=0,
+        help="Quiescence search budget per horizon position (0 disables it)",
+        metavar="NODES",
+    )
+    bench.add_argument(
+        "--batch-leaves",
+        action="store_true",
+        help="Score the leaves of each frontier node in one batch",
+    )
+    bench.add_argument(
+        "--lmr",
+        type=int,
+        default=0,
+        help="Moves before late move reductions (0 disables them)",
+        metavar="N",
+    )
+    bench.add_argument(
+        "--futility",
+        type=int,
+        default=0,
+        help="Futility pruning margin per ply (0 disables it)",
+        metavar="MARGIN",
+    )
+    bench.add_argument(
+        "--razor",
+        type=int,
+        default=0,
+        help="Razoring margin per ply (0 disables it)",
+        metavar="MARGIN",
+    )
+    bench.add_argument(
+        "--detect-draws",
+        action="store_true",
+        help="Score repetitions inside the search tree as draws",
+    )
+    bench.add_argument(
+        "-o", "--output", help="Write the results to FILE as JSON", metavar="FILE"
+    )
+    bench.add_argument(
+        "--baseline",
+        help="Fail on changed node counts or moves, or slowdowns, against FILE",
+        metavar="FILE",
+    )
+    bench.add_argument(
+        "--tolerance",
+        type=float,
+        default=10.0,
+        help="Allowed slowdown against the baseline, in percent",
+    )
+    bench.add_argument(
+        "--exact-tt-depth",
+        action="store_true",
+        help="Cut off only on transposition table scores of the same depth",
+    )
+
+    evaluate = commands.add_parser(
+        "eval",
+        help="Compare the per-leaf cost of scalar and batch evaluation",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    evaluate.add_argument("-g", "--game", choices=[*GAMES, "all"], default="all")
+    evaluate.add_argument(
+        "-r", "--repeats", type=int, default=5, help="Timed runs, the best is kept"
+    )
+    evaluate.add_argument(
+        "-o", "--output", help="Write the results to FILE as JSON", metavar="FILE"
+    )
+
+    mnk = commands.add_parser(
+        "mnk",
+        help="Compare the node rates of m,n,k boards of growing size",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    mnk.add_argument(
+        "--sizes", type=int, nargs="+", default=MNK_SIZES, help="Board side lengths"
+    )
+    mnk.add_argument("-k", type=int, default=5, help="Marks in a row that win")
+    mnk.add_argument("-d", "--depth", type=int, default=3, help="Search depth")
+    mnk.add_argument(
+        "--stones", type=int, default=8, help="Random moves played before searching"
+    )
+    mnk.add_argument(
+        "--positions", type=int, default=4, help="Positions searched per size"
+    )
+    mnk.add_argument(
+        "--hash-size", type=float, default=16.0, help="TT size in MB", metavar="MB"
+    )
+    mnk.add_argument("-s", "--seed", type=int, default=0, help="Seed of position 0")
+    mnk.add_argument(
+        "-o", "--output", help="Write the results to FILE as JSON", metavar="FILE"
+    )
+
+    args = parser.parse_args()
+    if args.command == "play":
+        _play(args)
+    elif args.command == "bench":
+        _bench(args)
+    elif args.command == "mnk":
+        _mnk(args)
+    else:
+        _evaluate(args)
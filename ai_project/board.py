@@ -25,6 +25,11 @@ class AbstractBoard(ABC, Generic[MoveT]):
     """Abstract base class for a board."""
 
     turn: AbstractPlayer
+    zobrist_key: int
+    """Zobrist key of the current position, kept up to date by ``push``/``pop``."""
+    movegen_calls: int = 0
+    """Number of times `legal_move_list` had to generate the legal moves."""
+    _legal_move_cache: list | None = None  # cleared by ``push``/``pop``
 
     @property
     @abstractmethod
@@ -38,10 +43,25 @@ class AbstractBoard(ABC, Generic[MoveT]):
         """Check if the game is a draw."""
         pass
 
+    def legal_move_list(self) -> list[MoveT]:
+        """Legal moves of the current position, generated at most once per position.
+
+        The list is shared until the next ``push``/``pop``; do not modify it.
+        """
+        if self._legal_move_cache is None:
+            self.movegen_calls += 1
+            self._legal_move_cache = list(self.legal_moves)
+        return self._legal_move_cache
+
+    @property
+    def has_legal_moves(self) -> bool:
+        """Returns ``True`` if the current player has a legal move."""
+        return bool(self.legal_move_list())
+
     @property
     def game_over(self) -> bool:
         """Returns ``True`` if the game is over."""
-        return self.is_draw or not bool(list(self.legal_moves))
+        return self.is_draw or not self.has_legal_moves
 
     @abstractmethod
     def push(self, move: MoveT) -> None:
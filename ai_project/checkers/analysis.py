@@ -0,0 +1,367 @@
+"""Bulk analysis of checkers game archives in PDN (Portable Draughts Notation).
+
+Games are read one at a time from the archive, replayed on a bitboard and
+searched move by move in a pool of processes. Each analyzed game is appended to
+a JSON lines file as soon as it is done, so an interrupted run resumes where it
+stopped.
+
+Authors: Trevor Arcieri and Demetri Karras
+Course: CS 481 Artificial Intelligence
+Term: Spring 2025
+Project: DualBoard Negamax AI
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import deque
+from collections.abc import Generator, Iterable
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, NamedTuple, TextIO
+
+from ai_project.arena import EngineConfig, make_engine
+from ai_project.checkers.bitboard import NUM_SQUARES, BitMove, CheckersBitboard
+
+WIN_SCORE = 1000  # score written for a won position, beyond any evaluation
+DEFAULT_BLUNDER = 5  # score lost by a blunder, the value of a man
+
+TAG_RE = re.compile(r'\[(\w+)\s+"([^"]*)"\]')
+MOVE_RE = re.compile(r"\d+(?:[-x]\d+)+")
+RESULTS = ("1-0", "0-1", "1/2-1/2", "2-0", "0-2", "1-1", "*")
+
+_worker_engine: Any = None  # the engine of an analysis worker process
+
+
+class PdnGame(NamedTuple):
+    """A game read from a PDN archive.
+
+    Attributes:
+        number (int): Number of the game in the archive, from 0.
+        tags (dict[str, str]): The tag pairs of the game, such as ``Event``.
+        moves (list[str]): The moves, e.g. ``11-15`` or ``15x24``.
+    """
+
+    number: int
+    tags: dict[str, str]
+    moves: list[str]
+
+
+def _movetext_tokens(line: str, depth: int) -> tuple[list[str], int]:
+    """Split a line of movetext into tokens outside comments and variations.
+
+    ``depth`` is the nesting of ``{}`` comments and ``()`` variations open at
+    the start of the line, and the returned one that at its end.
+    """
+    tokens = []
+    for token in re.findall(r"[{}()]|[^\s{}()]+", line):
+        if token in "{(":
+            depth += 1
+        elif token in "})":
+            depth = max(depth - 1, 0)
+        elif not depth:
+            tokens.append(token)
+    return tokens, depth
+
+
+def read_pdn(file: TextIO) -> Generator[PdnGame, None, None]:
+    """Read the games of a PDN archive one at a time, without loading it whole.
+
+    Move numbers, results, comments, variations and annotations such as ``!?``
+    are left out of the moves.
+    """
+    index = 0
+    tags: dict[str, str] = {}
+    moves: list[str] = []
+    depth = 0
+    for line in file:
+        tag = TAG_RE.match(line.strip()) if not depth else None
+        if tag is not None:
+            if moves:  # a new game starts without a result after the last one
+                yield PdnGame(index, tags, moves)
+                index, tags, moves = index + 1, {}, []
+            tags[tag[1]] = tag[2]
+            continue
+        tokens, depth = _movetext_tokens(line, depth)
+        for token in tokens:
+            if token in RESULTS:
+                yield PdnGame(index, tags, moves)
+                index, tags, moves = index + 1, {}, []
+                continue
+            move = MOVE_RE.search(token.split(".")[-1])
+            if move is not None:
+                moves.append(move[0])
+    if moves or tags:
+        yield PdnGame(index, tags, moves)
+
+
+def _parse_move(
+    board: CheckersBitboard, notation: str, flipped: bool
+) -> BitMove | None:
+    """Find the legal move written as ``notation``, or ``None`` if there is none.
+
+    Captures may list only their first and last squares. ``flipped`` numbers
+    the squares the PDN way, from the side that moves first.
+    """
+    squares = [int(square) for square in re.split("[-x]", notation)]
+    if flipped:
+        squares = [NUM_SQUARES + 1 - square for square in squares]
+    squares = [square - 1 for square in squares]
+    for move in board.legal_move_list():
+        path = move.square_list
+        if path[0] == squares[0] and path[-1] == squares[-1]:
+            if len(squares) == 2 or list(path) == squares:
+                return move
+    return None
+
+
+def replay(game: PdnGame) -> tuple[list[BitMove], bool]:
+    """Replay a game from the starting position.
+
+    PDN numbers the squares from the side that moves first, unlike
+    `py-draughts`; games that only replay with `py-draughts`' numbering are
+    read that way.
+
+    Returns:
+        tuple[list[BitMove], bool]: The moves, and whether the squares are
+            numbered the PDN way.
+
+    Raises:
+        ValueError: If the game has a setup position or an illegal move.
+    """
+    if "FEN" in game.tags:
+        raise ValueError("games from a setup position are not supported")
+    error = ""
+    for flipped in (True, False):
+        board = CheckersBitboard()
+        moves = []
+        for ply, notation in enumerate(game.moves):
+            move = _parse_move(board, notation, flipped)
+            if move is None:
+                error = f"illegal move {ply // 2 + 1}. {notation}"
+                break
+            moves.append(move)
+            board.push(move)
+        else:
+            return moves, flipped
+    raise ValueError(error)
+
+
+def _to_notation(move: BitMove, flipped: bool) -> str:
+    """Write a move with the squares numbered as in the archive; see `replay`."""
+    if not flipped:
+        return str(move)
+    separator = "x" if move.captured else "-"
+    return f"{NUM_SQUARES - move.src}{separator}{NUM_SQUARES - move.dst}"
+
+
+def _clamp(score: float) -> float:
+    """Replace the infinite scores of won and lost positions by ``WIN_SCORE``."""
+    return max(-WIN_SCORE, min(WIN_SCORE, score))
+
+
+def _init_analysis_worker(config: EngineConfig) -> None:
+    """Set up a worker process with its own engine."""
+    global _worker_engine
+    _worker_engine = make_engine("checkers", config)
+
+
+def analyze_game(game: PdnGame, blunder: float) -> dict[str, Any]:
+    """Search every position of a game with the worker's engine.
+
+    Each move gets the score of the position before it and of the engine's best
+    move, both for the side to move, the score of the move played (the negated
+    score of the next position), and a blunder flag when it loses at least
+    ``blunder`` against the best move. Moves recorded after the game is over,
+    e.g. by `py-draughts`' repetition rule, are left out and counted as
+    ``ignored_moves``.
+
+    Returns:
+        dict[str, Any]: The game's number, tags, analyzed moves and the number of
+            positions searched; or an ``error`` if it does not replay.
+    """
+    engine = _worker_engine
+    try:
+        moves, flipped = replay(game)
+    except ValueError as error:
+        return {"game": game.number, "tags": game.tags, "error": str(error)}
+    if engine.tt is not None:
+        engine.tt.clear()  # the same game analyzes the same on any worker
+
+    board = CheckersBitboard()
+    searched: list[tuple[BitMove, float]] = []  # best move and score by ply
+    for move in moves:
+        if board.game_over:
+            break
+        best, stats = engine.search(board)
+        searched.append((best, stats.score))
+        board.push(move)
+    if board.game_over:
+        final = engine.terminal_score(board)
+    else:
+        final = engine.search(board).stats.score
+    scores = [score for _, score in searched[1:]] + [final]
+
+    analyzed = []
+    for ply, ((best, score), next_score) in enumerate(
+        zip(searched, scores, strict=True)
+    ):
+        notation = game.moves[ply]
+        played = _clamp(-next_score)
+        score = _clamp(score)
+        analyzed.append({
+            "ply": ply + 1,
+            "move": notation,
+            "best": _to_notation(best, flipped),
+            "score": score,
+            "played_score": played,
+            "blunder": score - played >= blunder,
+        })
+    return {
+        "game": game.number,
+        "tags": game.tags,
+        "moves": analyzed,
+        "ignored_moves": len(moves) - len(searched),
+        "positions": len(searched) + (not board.game_over),
+    }
+
+
+def _completed_games(path: str) -> set[int]:
+    """Indices of the games already in an output file.
+
+    A line cut off by an interruption is removed from the file.
+    """
+    if not os.path.exists(path):
+        return set()
+    done = set()
+    with open(path, "rb+") as file:
+        end = 0
+        for line in file:
+            if not line.endswith(b"\n"):
+                break
+            done.add(json.loads(line)["game"])
+            end += len(line)
+        file.truncate(end)
+    return done
+
+
+def analyze_archive(
+    games: Iterable[PdnGame],
+    output: str,
+    config: EngineConfig,
+    *,
+    workers: int = 1,
+    blunder: float = DEFAULT_BLUNDER,
+    progress: TextIO | None = None,
+) -> dict[str, Any]:
+    """Analyze games into a JSON lines file, one line per game, resuming it.
+
+    Games already in ``output`` are skipped. At most two games per worker are
+    in flight, so the archive is read only as fast as it is analyzed, and games
+    are written in archive order as they finish.
+
+    Returns:
+        dict[str, Any]: Games analyzed, skipped and failed, and the positions
+            searched per second.
+    """
+    done = _completed_games(output)
+    summary = {"games": 0, "skipped": 0, "errors": 0, "positions": 0}
+    start = time.perf_counter()
+    pending: deque[Future] = deque()
+
+    def write(result: dict[str, Any]) -> None:
+        """Append a finished game to the output and count it."""
+        out.write(json.dumps(result) + "\n")
+        out.flush()
+        summary["games"] += 1
+        summary["errors"] += "error" in result
+        summary["positions"] += result.get("positions", 0)
+        if progress is not None:
+            elapsed = time.perf_counter() - start
+            print(
+                f"game {result['game']}: {summary['positions']} positions,"
+                f" {summary['positions'] / elapsed:,.1f} positions/s",
+                file=progress,
+            )
+
+    with (
+        open(output, "a") as out,
+        ProcessPoolExecutor(
+            workers, initializer=_init_analysis_worker, initargs=(config,)
+        ) as pool,
+    ):
+        for game in games:
+            if game.number in done:
+                summary["skipped"] += 1
+                continue
+            pending.append(pool.submit(analyze_game, game, blunder))
+            if len(pending) >= 2 * workers:
+                write(pending.popleft().result())
+        while pending:
+            write(pending.popleft().result())
+
+    seconds = time.perf_counter() - start
+    return {
+        **summary,
+        "seconds": seconds,
+        "positions_per_second": summary["positions"] / seconds if seconds else 0.0,
+    }
+
+
+def main() -> None:
+    """Analyze the games of a PDN archive."""
+    parser = argparse.ArgumentParser(
+        description="Analyze checkers games from a PDN archive",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("archive", help="PDN file to analyze")
+    parser.add_argument(
+        "output", help="JSON lines file of the analyzed games, resumed if it exists"
+    )
+    strength = parser.add_mutually_exclusive_group()
+    strength.add_argument(
+        "-d", "--depth", type=int, default=6, help="Search depth of every position"
+    )
+    strength.add_argument(
+        "-t",
+        "--time-budget",
+        type=float,
+        default=None,
+        help="Search every position for this many milliseconds instead",
+        metavar="MS",
+    )
+    parser.add_argument(
+        "--blunder",
+        type=float,
+        default=DEFAULT_BLUNDER,
+        help="Score lost against the best move that flags a blunder",
+    )
+    parser.add_argument(
+        "--hash-size",
+        type=float,
+        default=16.0,
+        help="Transposition table size of each worker",
+        metavar="MB",
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=1, help="Processes analyzing games"
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="Do not report every game"
+    )
+    args = parser.parse_args()
+    config = EngineConfig(
+        args.depth, time_budget_ms=args.time_budget, tt_size_mb=args.hash_size
+    )
+    with open(args.archive) as archive:
+        summary = analyze_archive(
+            read_pdn(archive),
+            args.output,
+            config,
+            workers=args.workers,
+            blunder=args.blunder,
+            progress=None if args.quiet else sys.stderr,
+        )
+    print(json.dumps(summary, indent=2))
@@ -0,0 +1,577 @@
+"""Bitboard representation of american checkers.
+
+Authors: Trevor Arcieri and Demetri Karras
+Course: CS 481 Artificial Intelligence
+Term: Spring 2025
+Project: DualBoard Negamax AI
+"""
+
+from __future__ import annotations
+
+import copy
+from collections.abc import Callable, Generator
+
+import numpy as np
+from draughts.boards.base import BaseBoard
+from draughts.models import FIGURE_REPR, Color, Figure
+from draughts.move import Move
+
+from ai_project.checkers.board import ZOBRIST_PIECES, CheckersBoard, piece_index
+from ai_project.engine import AbstractBoard, AbstractPlayer
+from ai_project.transposition import ZOBRIST_TURN
+
+BOARD_SIZE = 8  # Squares per side
+NUM_SQUARES = 32  # Playable (dark) squares, numbered like `py-draughts`: 0 is B8
+FULL_MASK = (1 << NUM_SQUARES) - 1
+
+ROW = [square // 4 for square in range(NUM_SQUARES)]  # 0 is black's back rank
+COL = [2 * (square % 4) + 1 - ROW[square] % 2 for square in range(NUM_SQUARES)]
+BIT = [1 << square for square in range(NUM_SQUARES)]
+
+# Positional features kept up to date by ``push``: rows advanced from the own back
+# rank, and twice the column distance from the center of the board
+WHITE_ADVANCE = [BOARD_SIZE - 1 - ROW[square] for square in range(NUM_SQUARES)]
+BLACK_ADVANCE = ROW
+CENTER_DIST = [abs(BOARD_SIZE - 1 - 2 * COL[square]) for square in range(NUM_SQUARES)]
+
+WHITE = AbstractPlayer(Color.WHITE.value)  # moves first, from the bottom rows
+BLACK = AbstractPlayer(Color.BLACK.value)
+
+NO_PROGRESS_PLIES = 80  # 40 moves each without a man move or capture draw a game
+
+WHITE_MEN_START = FULL_MASK ^ ((1 << 20) - 1)  # squares 20...31
+BLACK_MEN_START = (1 << 12) - 1  # squares 0...11
+
+type Direction = tuple[int, int]  # (row step, column step)
+
+UP_RIGHT: Direction = (-1, 1)
+UP_LEFT: Direction = (-1, -1)
+DOWN_LEFT: Direction = (1, -1)
+DOWN_RIGHT: Direction = (1, 1)
+
+# Direction order matches `py-draughts`' american move generator so both backends
+# list moves in the same order. Men use the first two (forward) directions.
+WHITE_DIRECTIONS = (UP_RIGHT, UP_LEFT, DOWN_LEFT, DOWN_RIGHT)
+BLACK_DIRECTIONS = (DOWN_LEFT, DOWN_RIGHT, UP_RIGHT, UP_LEFT)
+
+# Fields of a packed `BitMove`
+DST_SHIFT = 5  # destination square, above the 5-bit starting square
+CAPTURED_SHIFT = 10  # mask of the captured squares
+PATH_SHIFT = CAPTURED_SHIFT + NUM_SQUARES  # 2 bits per jump: its direction index
+SQUARE_MASK = (1 << DST_SHIFT) - 1
+
+WHITE_MAN_Z = piece_index(Figure.WHITE_MAN)
+WHITE_KING_Z = piece_index(Figure.WHITE_KING)
+BLACK_MAN_Z = piece_index(Figure.BLACK_MAN)
+BLACK_KING_Z = piece_index(Figure.BLACK_KING)
+
+
+def _square_at(row: int, col: int) -> int:
+    """Return the square at ``(row, col)``, or -1 if it is off the board."""
+    if 0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE:
+        return row * 4 + col // 2
+    return -1
+
+
+def _rays(
+    directions: tuple[Direction, ...],
+) -> list[tuple[tuple[int, int, int], ...]]:
+    """Precompute ``(step square, jump square, direction index)`` per square.
+
+    The direction index is that of the direction in `WHITE_DIRECTIONS`.
+    """
+    return [
+        tuple(
+            (
+                _square_at(ROW[sq] + d_row, COL[sq] + d_col),
+                _square_at(ROW[sq] + 2 * d_row, COL[sq] + 2 * d_col),
+                WHITE_DIRECTIONS.index((d_row, d_col)),
+            )
+            for d_row, d_col in directions
+        )
+        for sq in range(NUM_SQUARES)
+    ]
+
+
+WHITE_MAN_RAYS = _rays(WHITE_DIRECTIONS[:2])
+WHITE_KING_RAYS = _rays(WHITE_DIRECTIONS)
+BLACK_MAN_RAYS = _rays(BLACK_DIRECTIONS[:2])
+BLACK_KING_RAYS = _rays(BLACK_DIRECTIONS)
+JUMPS = WHITE_KING_RAYS  # ray of each square in each direction, by direction index
+
+
+class BitMove(int):
+    """A checkers move on the bitboard, packed into an int.
+
+    Bits 0-4 hold the starting square, the next 5 bits the destination, the next
+    32 the mask of the captured squares, and the rest 2 bits per jump for the
+    index of its direction in `WHITE_DIRECTIONS`, in jump order. Two moves are
+    equal exactly when they visit the same squares.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_squares(cls, square_list: tuple[int, ...]) -> BitMove:
+        """Pack the move that visits ``square_list``, starting square included."""
+        src, dst = square_list[0], square_list[-1]
+        if abs(ROW[dst] - ROW[src]) == 1:
+            return cls(src | dst << DST_SHIFT)
+        captured = path = 0
+        for i, (sq, jump) in enumerate(zip(square_list, square_list[1:])):
+            direction = (
+                (ROW[jump] - ROW[sq]) // 2,
+                (COL[jump] - COL[sq]) // 2,
+            )
+            index = WHITE_DIRECTIONS.index(direction)
+            captured |= BIT[JUMPS[sq][index][0]]
+            path |= index << 2 * i
+        return cls(
+            src | dst << DST_SHIFT | captured << CAPTURED_SHIFT | path << PATH_SHIFT
+        )
+
+    @classmethod
+    def from_draughts(cls, move: Move) -> BitMove:
+        """Convert a `py-draughts` move."""
+        return cls.from_squares(tuple(int(sq) for sq in move.square_list))
+
+    @property
+    def src(self) -> int:
+        """Starting square."""
+        return self & SQUARE_MASK
+
+    @property
+    def dst(self) -> int:
+        """Destination square."""
+        return self >> DST_SHIFT & SQUARE_MASK
+
+    @property
+    def captured(self) -> int:
+        """Bitmask of the captured squares."""
+        return self >> CAPTURED_SHIFT & FULL_MASK
+
+    @property
+    def square_list(self) -> tuple[int, ...]:
+        """Visited squares, starting square included."""
+        return self._unpack()[0]
+
+    @property
+    def captured_list(self) -> tuple[int, ...]:
+        """Captured squares in capture order."""
+        return self._unpack()[1]
+
+    def _unpack(self) -> tuple[tuple[int, ...], tuple[int, ...]]:
+        """Return the visited and captured squares."""
+        sq = self.src
+        jumps = self.captured.bit_count()
+        if not jumps:
+            return (sq, self.dst), ()
+        squares, captured = [sq], []
+        path = self >> PATH_SHIFT
+        for _ in range(jumps):
+            step, sq, _index = JUMPS[sq][path & 3]
+            captured.append(step)
+            squares.append(sq)
+            path >>= 2
+        return tuple(squares), tuple(captured)
+
+    def __str__(self) -> str:
+        """Return the move in `py-draughts`' notation, e.g. ``22-17`` or ``22x13``."""
+        separator = "x" if self.captured else "-"
+        return f"{self.src + 1}{separator}{self.dst + 1}"
+
+    def __repr__(self) -> str:
+        """Return the move with its visited squares."""
+        return f"BitMove.from_squares({self.square_list})"
+
+
+def _jumps(
+    src: int,
+    sq: int,
+    step: int,
+    jump: int,
+    index: int,
+    rays: list[tuple[tuple[int, int, int], ...]],
+    occupied: int,
+    enemies: int,
+    move: int,
+    shift: int,
+) -> Generator[BitMove, None, None]:
+    """Yield the jump ``sq`` x ``step`` -> ``jump`` and every chain extending it.
+
+    ``move`` holds the captures and jump directions of the chain from ``src`` to
+    ``sq``, and ``shift`` the position of the next jump's direction in it.
+    """
+    move |= BIT[step] << CAPTURED_SHIFT | index << shift
+    yield BitMove(move | jump << DST_SHIFT)
+
+    occupied ^= BIT[sq] | BIT[step] | BIT[jump]  # piece moved, enemy removed
+    enemies ^= BIT[step]
+    for next_step, next_jump, next_index in rays[jump]:
+        if (
+            next_jump >= 0
+            and enemies & BIT[next_step]
+            and not occupied & BIT[next_jump]
+        ):
+            yield from _jumps(
+                src,
+                jump,
+                next_step,
+                next_jump,
+                next_index,
+                rays,
+                occupied,
+                enemies,
+                move,
+                shift + 2,
+            )
+
+
+def _feature_sum(mask: int, table: list[int]) -> int:
+    """Sum ``table`` over the squares in ``mask``."""
+    total = 0
+    while mask:
+        low = mask & -mask
+        total += table[low.bit_length() - 1]
+        mask ^= low
+    return total
+
+
+class CheckersBitboard(AbstractBoard[BitMove]):
+    """American checkers on four 32-bit masks (men and kings per color).
+
+    Follows the rules of `py-draughts`' american ``Board`` exactly, so that moves
+    found here can be played on the `Server`'s board: white starts at the bottom
+    and moves first, captures are optional, every prefix of a jump chain is a
+    legal move, and the game is drawn when the last move was also played four and
+    eight plies earlier.
+
+    The board also counts how often each position occurred, for the search to
+    treat repetitions as draws; see `repetitions`.
+    """
+
+    def __init__(
+        self,
+        white_men: int = WHITE_MEN_START,
+        white_kings: int = 0,
+        black_men: int = BLACK_MEN_START,
+        black_kings: int = 0,
+        turn: AbstractPlayer = WHITE,
+    ) -> None:
+        """Initialize the board, by default to the starting position."""
+        self.white_men = white_men
+        self.white_kings = white_kings
+        self.black_men = black_men
+        self.black_kings = black_kings
+        self.turn = turn
+        self.halfmove_clock = 0
+        self._history: list[BitMove] = []  # past moves
+        self._undo: list[tuple] = []  # board state for ``pop`` to restore
+        self._legal_move_cache: list[BitMove] | None = None
+        self._move_lists: list[list[BitMove]] = []  # reused by each depth of pushes
+        self._sorted_lists: list[list[BitMove]] = []  # likewise, for sorted_move_list
+        self.zobrist_key = self.compute_zobrist_key()
+        self.advance, self.center_dist = self.compute_features()
+        # Occurrences of each position, by Zobrist key. A man move or a capture
+        # can never be undone, so positions before it cannot recur and need no
+        # separate bookkeeping.
+        self._key_counts = {self.zobrist_key: 1}
+
+    @classmethod
+    def from_draughts(cls, board: BaseBoard) -> CheckersBitboard:
+        """Convert an american `py-draughts` board, keeping its move history.
+
+        The positions since the last man move or capture are counted too, so the
+        search sees repetitions of them.
+        """
+        bitboard = cls._from_position(board)
+        bitboard.halfmove_clock = board.halfmove_clock
+        bitboard._history = [BitMove.from_draughts(move) for move in board._moves_stack]
+        plies = min(board.halfmove_clock, len(board._moves_stack))
+        if plies:
+            earlier = copy.deepcopy(board)
+            for _ in range(plies):
+                earlier.pop()
+                key = cls._from_position(earlier).zobrist_key
+                bitboard._key_counts[key] = bitboard._key_counts.get(key, 0) + 1
+        return bitboard
+
+    @classmethod
+    def _from_position(cls, board: BaseBoard) -> CheckersBitboard:
+        """Convert the position of a `py-draughts` board, without its history."""
+        masks = {figure: 0 for figure in Figure}
+        for sq, figure in enumerate(board.position.tolist()):
+            masks[figure] |= BIT[sq]
+        return cls(
+            masks[Figure.WHITE_MAN],
+            masks[Figure.WHITE_KING],
+            masks[Figure.BLACK_MAN],
+            masks[Figure.BLACK_KING],
+            AbstractPlayer(board.turn.value),
+        )
+
+    def to_draughts(self) -> CheckersBoard:
+        """Convert to a (hashed) `py-draughts` board, without move history."""
+        board = CheckersBoard(
+            np.array(self.position, dtype=np.int8), Color(self.turn.value)
+        )
+        board.halfmove_clock = self.halfmove_clock
+        return board
+
+    @staticmethod
+    def to_draughts_move(move: BitMove, board: BaseBoard) -> Move:
+        """Find the `py-draughts` move on ``board`` that visits the same squares."""
+        square_list = move.square_list
+        for legal_move in board.legal_moves:
+            if tuple(legal_move.square_list) == square_list:
+                return legal_move
+        raise ValueError(f"{move} is not legal on the given board")
+
+    @property
+    def position(self) -> list[int]:
+        """Figure values of all 32 squares, as in `py-draughts`' ``position``."""
+        position = [0] * NUM_SQUARES
+        for mask, figure in (
+            (self.white_men, Figure.WHITE_MAN),
+            (self.white_kings, Figure.WHITE_KING),
+            (self.black_men, Figure.BLACK_MAN),
+            (self.black_kings, Figure.BLACK_KING),
+        ):
+            while mask:
+                low = mask & -mask
+                position[low.bit_length() - 1] = figure.value
+                mask ^= low
+        return position
+
+    def __repr__(self) -> str:
+        """Return the board drawn like `py-draughts`' boards."""
+        rows = [["."] * BOARD_SIZE for _ in range(BOARD_SIZE)]
+        for sq, figure in enumerate(self.position):
+            rows[ROW[sq]][COL[sq]] = FIGURE_REPR[Figure(figure)]
+        return "".join(" " + " ".join(row) + "\n" for row in rows)
+
+    def compute_zobrist_key(self) -> int:
+        """Compute the Zobrist key from scratch; equals `CheckersBoard`'s key."""
+        key = 0 if self.turn is WHITE else ZOBRIST_TURN
+        for sq, figure in enumerate(self.position):
+            if figure:
+                key ^= ZOBRIST_PIECES[sq][piece_index(figure)]
+        return key
+
+    def compute_features(self) -> tuple[int, int]:
+        """Compute the positional features from scratch.
+
+        Returns:
+            tuple[int, int]: White's minus black's sum of `WHITE_ADVANCE` /
+                `BLACK_ADVANCE` and of `CENTER_DIST` over their pieces, as kept in
+                ``advance`` and ``center_dist``.
+        """
+        white = self.white_men | self.white_kings
+        black = self.black_men | self.black_kings
+        return (
+            _feature_sum(white, WHITE_ADVANCE) - _feature_sum(black, BLACK_ADVANCE),
+            _feature_sum(white, CENTER_DIST) - _feature_sum(black, CENTER_DIST),
+        )
+
+    @property
+    def legal_moves(self) -> Generator[BitMove, None, None]:
+        """All legal moves for the current player."""
+        if self.turn is WHITE:
+            men, kings = self.white_men, self.white_kings
+            enemies = self.black_men | self.black_kings
+            man_rays, king_rays = WHITE_MAN_RAYS, WHITE_KING_RAYS
+        else:
+            men, kings = self.black_men, self.black_kings
+            enemies = self.white_men | self.white_kings
+            man_rays, king_rays = BLACK_MAN_RAYS, BLACK_KING_RAYS
+        occupied = men | kings | enemies
+
+        pieces = men | kings
+        while pieces:
+            low = pieces & -pieces
+            pieces ^= low
+            sq = low.bit_length() - 1
+            rays = king_rays if kings & low else man_rays
+            for step, jump, index in rays[sq]:
+                if step < 0:
+                    continue
+                if not occupied & BIT[step]:
+                    yield BitMove(sq | step << DST_SHIFT)
+                elif jump >= 0 and enemies & BIT[step] and not occupied & BIT[jump]:
+                    yield from _jumps(
+                        sq,
+                        sq,
+                        step,
+                        jump,
+                        index,
+                        rays,
+                        occupied,
+                        enemies,
+                        sq,
+                        PATH_SHIFT,
+                    )
+
+    def legal_move_list(self) -> list[BitMove]:
+        """Legal moves of the current position, generated at most once per position.
+
+        The moves are generated into a list kept for each number of moves pushed,
+        so no list is allocated per position. The list is shared until moves are
+        generated for another position at the same depth; do not modify it.
+        """
+        if self._legal_move_cache is None:
+            self.movegen_calls += 1
+            depth = len(self._undo)
+            while len(self._move_lists) <= depth:
+                self._move_lists.append([])
+            moves = self._move_lists[depth]
+            moves.clear()
+            moves.extend(self.legal_moves)
+            self._legal_move_cache = moves
+        return self._legal_move_cache
+
+    def sorted_move_list(self, key: Callable[[BitMove], int]) -> list[BitMove]:
+        """Legal moves of the current position, sorted by ``key``.
+
+        Like `legal_move_list`, the moves are sorted in place in a list kept for
+        each number of moves pushed, so no list is allocated per position. The
+        caller may modify it, until moves are sorted for another position at the
+        same depth.
+        """
+        depth = len(self._undo)
+        while len(self._sorted_lists) <= depth:
+            self._sorted_lists.append([])
+        moves = self._sorted_lists[depth]
+        moves[:] = self.legal_move_list()
+        moves.sort(key=key)
+        return moves
+
+    @property
+    def is_draw(self) -> bool:
+        """Check for `py-draughts`' threefold repetition of the last move."""
+        history = self._history
+        return len(history) >= 9 and history[-1] == history[-5] == history[-9]
+
+    @property
+    def repetitions(self) -> int:
+        """Number of earlier occurrences of the current position."""
+        return self._key_counts[self.zobrist_key] - 1
+
+    @property
+    def is_no_progress(self) -> bool:
+        """Whether `NO_PROGRESS_PLIES` passed without a man move or capture."""
+        return self.halfmove_clock >= NO_PROGRESS_PLIES
+
+    def push(self, move: BitMove) -> None:
+        """Apply a move to the board."""
+        self._undo.append((
+            self.white_men,
+            self.white_kings,
+            self.black_men,
+            self.black_kings,
+            self.zobrist_key,
+            self.halfmove_clock,
+            self.advance,
+            self.center_dist,
+            self._legal_move_cache,
+        ))
+        self._legal_move_cache = None
+        self._history.append(move)
+        if self.turn is WHITE:
+            self._push_white(move)
+            self.turn = BLACK
+        else:
+            self._push_black(move)
+            self.turn = WHITE
+        self.zobrist_key ^= ZOBRIST_TURN
+        self._key_counts[self.zobrist_key] = (
+            self._key_counts.get(self.zobrist_key, 0) + 1
+        )
+
+    def _push_white(self, move: BitMove) -> None:
+        """Apply a white move."""
+        src, dst = move & SQUARE_MASK, move >> DST_SHIFT & SQUARE_MASK
+        captured = move >> CAPTURED_SHIFT & FULL_MASK
+        key = self.zobrist_key
+        if self.white_kings & BIT[src]:
+            self.white_kings ^= BIT[src] ^ BIT[dst]  # src == dst cancels out
+            key ^= ZOBRIST_PIECES[src][WHITE_KING_Z] ^ ZOBRIST_PIECES[dst][WHITE_KING_Z]
+            self.halfmove_clock = 0 if captured else self.halfmove_clock + 1
+        elif dst < 4:  # promotion, which leaves the halfmove clock untouched
+            self.white_men ^= BIT[src]
+            self.white_kings |= BIT[dst]
+            key ^= ZOBRIST_PIECES[src][WHITE_MAN_Z] ^ ZOBRIST_PIECES[dst][WHITE_KING_Z]
+        else:
+            self.white_men ^= BIT[src] | BIT[dst]
+            key ^= ZOBRIST_PIECES[src][WHITE_MAN_Z] ^ ZOBRIST_PIECES[dst][WHITE_MAN_Z]
+            self.halfmove_clock = 0
+        self.advance += WHITE_ADVANCE[dst] - WHITE_ADVANCE[src]
+        self.center_dist += CENTER_DIST[dst] - CENTER_DIST[src]
+        remaining = captured
+        while remaining:
+            low = remaining & -remaining
+            remaining ^= low
+            sq = low.bit_length() - 1
+            if self.black_kings & low:
+                key ^= ZOBRIST_PIECES[sq][BLACK_KING_Z]
+            else:
+                key ^= ZOBRIST_PIECES[sq][BLACK_MAN_Z]
+            self.advance += BLACK_ADVANCE[sq]
+            self.center_dist += CENTER_DIST[sq]
+        self.black_men &= ~captured
+        self.black_kings &= ~captured
+        self.zobrist_key = key
+
+    def _push_black(self, move: BitMove) -> None:
+        """Apply a black move."""
+        src, dst = move & SQUARE_MASK, move >> DST_SHIFT & SQUARE_MASK
+        captured = move >> CAPTURED_SHIFT & FULL_MASK
+        key = self.zobrist_key
+        if self.black_kings & BIT[src]:
+            self.black_kings ^= BIT[src] ^ BIT[dst]  # src == dst cancels out
+            key ^= ZOBRIST_PIECES[src][BLACK_KING_Z] ^ ZOBRIST_PIECES[dst][BLACK_KING_Z]
+            self.halfmove_clock = 0 if captured else self.halfmove_clock + 1
+        elif dst >= 28:  # promotion, which leaves the halfmove clock untouched
+            self.black_men ^= BIT[src]
+            self.black_kings |= BIT[dst]
+            key ^= ZOBRIST_PIECES[src][BLACK_MAN_Z] ^ ZOBRIST_PIECES[dst][BLACK_KING_Z]
+        else:
+            self.black_men ^= BIT[src] | BIT[dst]
+            key ^= ZOBRIST_PIECES[src][BLACK_MAN_Z] ^ ZOBRIST_PIECES[dst][BLACK_MAN_Z]
+            self.halfmove_clock = 0
+        self.advance -= BLACK_ADVANCE[dst] - BLACK_ADVANCE[src]
+        self.center_dist -= CENTER_DIST[dst] - CENTER_DIST[src]
+        remaining = captured
+        while remaining:
+            low = remaining & -remaining
+            remaining ^= low
+            sq = low.bit_length() - 1
+            if self.white_kings & low:
+                key ^= ZOBRIST_PIECES[sq][WHITE_KING_Z]
+            else:
+                key ^= ZOBRIST_PIECES[sq][WHITE_MAN_Z]
+            self.advance -= WHITE_ADVANCE[sq]
+            self.center_dist -= CENTER_DIST[sq]
+        self.white_men &= ~captured
+        self.white_kings &= ~captured
+        self.zobrist_key = key
+
+    def pop(self) -> None:
+        """Undo the last move applied to the board."""
+        count = self._key_counts[self.zobrist_key]
+        if count > 1:
+            self._key_counts[self.zobrist_key] = count - 1
+        else:
+            del self._key_counts[self.zobrist_key]
+        (
+            self.white_men,
+            self.white_kings,
+            self.black_men,
+            self.black_kings,
+            self.zobrist_key,
+            self.halfmove_clock,
+            self.advance,
+            self.center_dist,
+            self._legal_move_cache,
+        ) = self._undo.pop()
+        self._history.pop()
+        self.turn = BLACK if self.turn is WHITE else WHITE
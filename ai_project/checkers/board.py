@@ -10,16 +10,80 @@ from __future__ import annotations
 
 import math
 
+import numpy as np
+from draughts.boards.american import Board as AmericanBoard
 from draughts.boards.base import BaseBoard
+from draughts.models import Color
 from draughts.move import Move
 
 from ai_project.engine import AbstractBoard
+from ai_project.transposition import ZOBRIST_TURN, zobrist_table
 
+ZOBRIST_PIECES = zobrist_table(32, 4)  # keys indexed by [square][piece index]
 
-class CheckersBoard(BaseBoard, AbstractBoard[Move]):
+
+def piece_index(figure: int) -> int:
+    """Map a figure value (-2, -1, 1, 2) to a Zobrist piece index (0...3)."""
+    return figure + 2 - (figure > 0)
+
+
+# NOTE: `BaseBoard.__init_subclass__` copies public attributes that shadow the parent's
+# onto the parent class, so only names the american `Board` does not define itself
+# (e.g. `push`/`pop`, which live on `BaseBoard`) are overridden here.
+class CheckersBoard(AmericanBoard, AbstractBoard[Move]):
     """Class representing the Checkers board, inheriting from `py-draught`'s `Board` and `AbstractBoard`."""
 
+    def __init__(
+        self, starting_position: np.ndarray | None = None, turn: Color | None = None
+    ) -> None:
+        """Initialize the board and compute the Zobrist key of the position."""
+        super().__init__(starting_position, turn)  # pyright: ignore[reportArgumentType]
+        self._key_stack: list[int] = []
+        self.zobrist_key = self.compute_zobrist_key()
+
+    @classmethod
+    def from_board(cls, board: BaseBoard) -> CheckersBoard:
+        """Return a hashed copy of any american `py-draughts` board, history included."""
+        copy = cls(board.position.copy(), board.turn)
+        copy._moves_stack = list(board._moves_stack)
+        copy.halfmove_clock = board.halfmove_clock
+        return copy
+
     @staticmethod
     def size(board: CheckersBoard) -> int:
         """Return the size of the board."""
         return int(math.sqrt(len(board.STARTING_POSITION) * 2))
+
+    def compute_zobrist_key(self) -> int:
+        """Compute the Zobrist key of the current position from scratch."""
+        key = 0 if self.turn == Color.WHITE else ZOBRIST_TURN
+        for square, figure in enumerate(self._pos.tolist()):
+            if figure:
+                key ^= ZOBRIST_PIECES[square][piece_index(figure)]
+        return key
+
+    def _squares_key(self, squares: set[int]) -> int:
+        """XOR of the Zobrist keys of the pieces currently on ``squares``."""
+        key = 0
+        for square in squares:
+            figure = int(self._pos[square])
+            if figure:
+                key ^= ZOBRIST_PIECES[square][piece_index(figure)]
+        return key
+
+    def push(self, move: Move, is_finished: bool = True) -> None:
+        """Apply a move to the board, updating the Zobrist key incrementally."""
+        touched = {move.square_list[0], move.square_list[-1], *move.captured_list}
+        self._key_stack.append(self.zobrist_key)
+        key = self.zobrist_key ^ self._squares_key(touched)
+        super().push(move, is_finished)
+        self._legal_move_cache = None
+        self.zobrist_key = key ^ self._squares_key(touched)
+        if is_finished:
+            self.zobrist_key ^= ZOBRIST_TURN
+
+    def pop(self, is_finished: bool = True) -> None:
+        """Undo the last move applied to the board and restore its Zobrist key."""
+        super().pop(is_finished)
+        self._legal_move_cache = None
+        self.zobrist_key = self._key_stack.pop()
@@ -0,0 +1,400 @@
+"""Opening book and endgame database for checkers.
+
+Both are tables of positions sorted by Zobrist key, stored in a compact binary
+file that is memory-mapped and binary-searched on probe, so loading is instant
+and only the pages touched by probes are read from disk.
+
+Authors: Trevor Arcieri and Demetri Karras
+Course: CS 481 Artificial Intelligence
+Term: Spring 2025
+Project: DualBoard Negamax AI
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections import deque
+from collections.abc import Generator
+from itertools import combinations, product
+from typing import TYPE_CHECKING, ClassVar, Self
+
+import numpy as np
+
+from ai_project.checkers.bitboard import (
+    BIT,
+    BLACK,
+    NUM_SQUARES,
+    PATH_SHIFT,
+    WHITE,
+    BitMove,
+    CheckersBitboard,
+)
+
+if TYPE_CHECKING:
+    from ai_project.checkers.engine import CheckersEngine
+
+HEADER_BYTES = 16  # 8-byte magic, then the record count as a little-endian uint64
+WHITE_PROMOTION_SQUARES = BIT[0] | BIT[1] | BIT[2] | BIT[3]  # no white men here
+BLACK_PROMOTION_SQUARES = BIT[28] | BIT[29] | BIT[30] | BIT[31]  # no black men here
+BOOK_MOVE_MASK = (1 << PATH_SHIFT) - 1  # start, destination and captured squares
+
+
+class PositionTable:
+    """Records keyed by position, in a memory-mapped file sorted by Zobrist key.
+
+    The file holds a header, all keys as one contiguous ``uint64`` array, and the
+    records' values as a packed array of `VALUE_DTYPE`.
+    """
+
+    MAGIC: ClassVar[bytes]
+    VALUE_DTYPE: ClassVar[np.dtype]
+
+    def __init__(self, keys: np.ndarray, values: np.ndarray) -> None:
+        """Initialize the table from keys sorted in ascending order and their values."""
+        if len(keys) != len(values):
+            raise ValueError("keys and values must have the same length")
+        self.keys = keys
+        self.values = values
+
+    def __len__(self) -> int:
+        """Return the number of positions in the table."""
+        return len(self.keys)
+
+    @classmethod
+    def from_records(cls, records: dict[int, tuple]) -> Self:
+        """Build a table from a ``{zobrist_key: value tuple}`` mapping."""
+        keys = np.array(sorted(records), dtype=np.uint64)
+        values = np.array(
+            [records[int(key)] for key in keys], dtype=cls.VALUE_DTYPE
+        ).reshape(len(keys))
+        return cls(keys, values)
+
+    @classmethod
+    def load(cls, path: str) -> Self:
+        """Memory-map a table saved with `save`."""
+        with open(path, "rb") as file:
+            header = file.read(HEADER_BYTES)
+        if len(header) != HEADER_BYTES or header[:8] != cls.MAGIC:
+            raise ValueError(f"{path} is not a {cls.__name__} file")
+        count = int.from_bytes(header[8:], "little")
+        if not count:
+            return cls(np.empty(0, np.uint64), np.empty(0, cls.VALUE_DTYPE))
+        keys = np.memmap(path, np.uint64, "r", HEADER_BYTES, (count,))
+        values = np.memmap(
+            path, cls.VALUE_DTYPE, "r", HEADER_BYTES + keys.nbytes, (count,)
+        )
+        return cls(keys, values)
+
+    def save(self, path: str) -> None:
+        """Write the table to ``path``."""
+        with open(path, "wb") as file:
+            file.write(self.MAGIC + len(self).to_bytes(8, "little"))
+            file.write(np.ascontiguousarray(self.keys, "<u8").tobytes())
+            file.write(np.ascontiguousarray(self.values, self.VALUE_DTYPE).tobytes())
+
+    def find(self, key: int) -> np.void | None:
+        """Return the value stored for a Zobrist key, or ``None`` if absent."""
+        i = int(np.searchsorted(self.keys, np.uint64(key)))
+        if i < len(self.keys) and int(self.keys[i]) == key:
+            return self.values[i]
+        return None
+
+
+class OpeningBook(PositionTable):
+    """Best moves of early positions, found offline by a deep `CheckersEngine` search.
+
+    Moves are stored as their packed `BitMove` without the jump directions,
+    which always fits in 64 bits; the start, destination and captured squares
+    determine the position a move leads to.
+    """
+
+    MAGIC = b"CKBOOK02"
+    VALUE_DTYPE = np.dtype([("move", "<u8"), ("depth", "u1")])
+
+    def probe(self, board: CheckersBitboard, min_depth: int = 0) -> BitMove | None:
+        """Return the book move of ``board``, or ``None`` if it is not in the book.
+
+        Moves searched shallower than ``min_depth`` count as not in the book, and
+        so does a stored move that is not legal in ``board``, as after a Zobrist
+        key collision.
+        """
+        value = self.find(board.zobrist_key)
+        if value is None or int(value["depth"]) < min_depth:
+            return None
+        packed = int(value["move"])
+        for move in board.legal_move_list():
+            if move & BOOK_MOVE_MASK == packed:
+                return move
+        return None
+
+    @classmethod
+    def build(
+        cls, plies: int, engine: CheckersEngine, *, verbose: bool = False
+    ) -> OpeningBook:
+        """Search every position up to ``plies`` moves from the start with ``engine``.
+
+        Args:
+            plies (int): Number of moves from the starting position to cover.
+            engine (CheckersEngine): Engine whose fixed-depth search picks the moves.
+            verbose (bool): Print progress.
+
+        Returns:
+            OpeningBook: The book of all positions searched.
+        """
+        records: dict[int, tuple[int, int]] = {}
+        frontier = [CheckersBitboard()]
+        for ply in range(plies + 1):
+            children: dict[int, CheckersBitboard] = {}
+            for board in frontier:
+                if board.game_over or board.zobrist_key in records:
+                    continue
+                move = engine.get_best_move(board)
+                records[board.zobrist_key] = (move & BOOK_MOVE_MASK, engine.depth)
+                for child_move in board.legal_move_list():
+                    child = CheckersBitboard(
+                        board.white_men,
+                        board.white_kings,
+                        board.black_men,
+                        board.black_kings,
+                        board.turn,
+                    )
+                    child.push(child_move)
+                    children.setdefault(child.zobrist_key, child)
+            if verbose:
+                print(f"Ply {ply}: {len(records)} positions in the book")
+            frontier = list(children.values())
+        return cls.from_records(records)
+
+
+class EndgameDatabase(PositionTable):
+    """Perfect-play results of every position with few pieces left.
+
+    Results are from the side to move's point of view, with the number of plies to
+    the end of the game under best play (shortest win, longest loss). Like most
+    endgame databases, repetition draws are not taken into account. Each record
+    also holds the squares occupied in its position, to check probes against.
+    """
+
+    MAGIC = b"CKENDG02"
+    VALUE_DTYPE = np.dtype([("result", "i1"), ("plies", "<u2"), ("occupied", "<u4")])
+
+    WIN = 1
+    DRAW = 0
+    LOSS = -1
+
+    def probe(self, board: CheckersBitboard) -> tuple[int, int] | None:
+        """Return ``(result, plies)`` for ``board``, or ``None`` if not covered.
+
+        A record of other occupied squares, as after a Zobrist key collision or
+        from a table built with other keys, counts as not covered.
+        """
+        value = self.find(board.zobrist_key)
+        if value is None or int(value["occupied"]) != _occupied(board):
+            return None
+        return int(value["result"]), int(value["plies"])
+
+    def best_move(
+        self, board: CheckersBitboard, moves: list[BitMove]
+    ) -> BitMove | None:
+        """Pick the move with the best database result, or ``None`` if not covered.
+
+        Wins are played as fast as possible, losses delayed as long as possible,
+        and ties go to the earliest of ``moves``.
+        """
+        best_move = None
+        best_rank = (-2, 0)
+        for move in moves:
+            board.push(move)
+            try:
+                if not board.has_legal_moves:
+                    outcome = (self.LOSS, 0)  # the opponent is out of moves
+                else:
+                    outcome = self.probe(board)
+            finally:
+                board.pop()
+            if outcome is None:
+                return None
+            result, plies = outcome
+            rank = (-result, plies if result == self.WIN else -plies)
+            if best_move is None or rank > best_rank:
+                best_move, best_rank = move, rank
+        return best_move
+
+    @classmethod
+    def build(cls, max_pieces: int, *, verbose: bool = False) -> EndgameDatabase:
+        """Solve all positions with at most ``max_pieces`` pieces by retrograde analysis.
+
+        Terminal losses are propagated backwards through the move graph: a
+        position is won if some move reaches a lost position, and lost once every
+        move reaches a won one. Positions never resolved are draws.
+
+        Args:
+            max_pieces (int): Maximum number of pieces on the board.
+            verbose (bool): Print progress.
+
+        Returns:
+            EndgameDatabase: The solved positions.
+        """
+        if max_pieces < 2:
+            raise ValueError("max_pieces must be at least 2")
+        start = time.perf_counter()
+        keys, occupied, children = _move_graph(max_pieces)
+        if verbose:
+            print(f"{len(keys)} positions in {time.perf_counter() - start:.1f}s")
+        result, plies = _retrograde(keys, children)
+        if verbose:
+            print(
+                f"Solved in {time.perf_counter() - start:.1f}s:"
+                f" {result.count(cls.WIN)} wins, {result.count(cls.LOSS)} losses,"
+                f" {result.count(cls.DRAW)} draws"
+            )
+        return cls.from_records({
+            key: (result[i], plies[i], occupied[i]) for i, key in enumerate(keys)
+        })
+
+
+def _occupied(board: CheckersBitboard) -> int:
+    """Return the mask of the squares holding a piece."""
+    return board.white_men | board.white_kings | board.black_men | board.black_kings
+
+
+def _move_graph(max_pieces: int) -> tuple[list[int], list[int], list[list[int]]]:
+    """Return the keys, occupied squares and children's keys of endgame positions."""
+    keys: list[int] = []
+    occupied: list[int] = []
+    children: list[list[int]] = []
+    for board in _endgame_positions(max_pieces):
+        keys.append(board.zobrist_key)
+        occupied.append(_occupied(board))
+        child_keys = []
+        for move in board.legal_move_list():
+            board.push(move)
+            child_keys.append(board.zobrist_key)
+            board.pop()
+        children.append(child_keys)
+    return keys, occupied, children
+
+
+def _retrograde(
+    keys: list[int], children: list[list[int]]
+) -> tuple[list[int], list[int]]:
+    """Solve a move graph from its terminal positions backwards.
+
+    Children missing from ``keys`` are positions where the side to move has no
+    pieces left.
+
+    Returns:
+        tuple[list[int], list[int]]: The result of each position for the side to
+            move and its distance to the end of the game in plies.
+    """
+    index = {key: i for i, key in enumerate(keys)}
+    wiped_out = len(keys)  # stands for every position without pieces to move
+    parents: list[list[int]] = [[] for _ in range(wiped_out + 1)]
+    remaining = [len(child_keys) for child_keys in children]
+    result = [EndgameDatabase.DRAW] * wiped_out + [EndgameDatabase.LOSS]
+    plies = [0] * (wiped_out + 1)
+    queue = deque([wiped_out])  # positions are queued by distance to the end
+    for i, child_keys in enumerate(children):
+        if not child_keys:
+            result[i] = EndgameDatabase.LOSS
+            queue.append(i)
+        for child_key in child_keys:
+            parents[index.get(child_key, wiped_out)].append(i)
+
+    while queue:
+        i = queue.popleft()
+        for parent in parents[i]:
+            if result[parent] != EndgameDatabase.DRAW:
+                continue
+            if result[i] == EndgameDatabase.LOSS:
+                result[parent], plies[parent] = EndgameDatabase.WIN, plies[i] + 1
+                queue.append(parent)
+            else:
+                remaining[parent] -= 1
+                if not remaining[parent]:
+                    result[parent] = EndgameDatabase.LOSS
+                    plies[parent] = plies[i] + 1
+                    queue.append(parent)
+    return result[:wiped_out], plies[:wiped_out]
+
+
+def _placements(
+    count: int, occupied: int, no_men: int
+) -> Generator[tuple[int, int], None, None]:
+    """Yield ``(men, kings)`` masks of ``count`` pieces on squares not in ``occupied``.
+
+    Men are never placed on the ``no_men`` squares, where they would have been
+    promoted.
+    """
+    free = [sq for sq in range(NUM_SQUARES) if not occupied & BIT[sq]]
+    for squares in combinations(free, count):
+        for kinds in product((False, True), repeat=count):
+            men = kings = 0
+            for sq, is_king in zip(squares, kinds, strict=True):
+                if is_king:
+                    kings |= BIT[sq]
+                else:
+                    men |= BIT[sq]
+            if not men & no_men:
+                yield men, kings
+
+
+def _endgame_positions(max_pieces: int) -> Generator[CheckersBitboard, None, None]:
+    """Yield every position with 2...``max_pieces`` pieces and both colors on board."""
+    for num_white in range(1, max_pieces):
+        for num_black in range(1, max_pieces - num_white + 1):
+            for white_men, white_kings in _placements(
+                num_white, 0, WHITE_PROMOTION_SQUARES
+            ):
+                for black_men, black_kings in _placements(
+                    num_black, white_men | white_kings, BLACK_PROMOTION_SQUARES
+                ):
+                    for turn in (WHITE, BLACK):
+                        yield CheckersBitboard(
+                            white_men, white_kings, black_men, black_kings, turn
+                        )
+
+
+def main() -> None:
+    """Build the opening book or the endgame database."""
+    parser = argparse.ArgumentParser(
+        description="Build checkers opening books and endgame databases",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    subparsers = parser.add_subparsers(dest="kind", required=True)
+    book = subparsers.add_parser(
+        "book",
+        help="Search the early positions with the engine",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    book.add_argument("output", help="File to write the book to")
+    book.add_argument(
+        "-p", "--plies", type=int, default=4, help="Moves from the start to cover"
+    )
+    book.add_argument("-d", "--depth", type=int, default=10, help="Search depth")
+    book.add_argument(
+        "-w", "--workers", type=int, default=1, help="Parallel search processes"
+    )
+    endgame = subparsers.add_parser(
+        "endgame",
+        help="Solve the positions with few pieces",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    endgame.add_argument("output", help="File to write the database to")
+    endgame.add_argument(
+        "-n", "--pieces", type=int, default=3, help="Maximum number of pieces"
+    )
+    args = parser.parse_args()
+    from ai_project.checkers.engine import CheckersEngine  # imports this module
+
+    if args.kind == "book":
+        engine = CheckersEngine(args.depth, workers=args.workers)
+        try:
+            table = OpeningBook.build(args.plies, engine, verbose=True)
+        finally:
+            engine.close()
+    else:
+        table = EndgameDatabase.build(args.pieces, verbose=True)
+    table.save(args.output)
+    print(f"Wrote {len(table)} positions to {args.output}")
@@ -7,12 +7,32 @@ Project: DualBoard Negamax AI
 """
 
 from math import floor
+from typing import Any, NamedTuple, overload
 
+import numpy as np
+from draughts.boards.base import BaseBoard
 from draughts.models import Color, Figure
 from draughts.move import Move
 
-from ai_project.checkers.board import CheckersBoard
-from ai_project.engine import AbstractEngine
+from ai_project.checkers.bitboard import (
+    BLACK_ADVANCE,
+    BOARD_SIZE,
+    CAPTURED_SHIFT,
+    CENTER_DIST,
+    COL,
+    DST_SHIFT,
+    FULL_MASK,
+    NUM_SQUARES,
+    ROW,
+    SQUARE_MASK,
+    WHITE_ADVANCE,
+    BitMove,
+    CheckersBitboard,
+)
+from ai_project.checkers.database import EndgameDatabase, OpeningBook
+from ai_project.engine import AbstractEngine, AbstractPlayer, SearchResult
+from ai_project.stats import SearchStats
+from ai_project.weights import load_weights
 
 MAN_VALUE = 5  # Value of a regular piece
 KING_VALUE = 10  # Value of a king piece
@@ -20,63 +40,358 @@ WALL_DIST_VALUE = 3  # Distance to the wall value for evaluation
 SIDE_DIST_VALUE = 2  # Distance to the side value for evaluation
 
 
-class CheckersEngine(AbstractEngine[CheckersBoard, Move]):
-    """Class for the Checkers AI engine using Negamax and Alpha-Beta Pruning."""
+class CheckersWeights(NamedTuple):
+    """Weights of the evaluation terms, the hand-picked values by default."""
 
-    def evaluate(self, board: CheckersBoard) -> int:
-        """Evaluate the board state."""
-        score = 0
+    man: float = MAN_VALUE
+    king: float = KING_VALUE
+    wall_dist: float = WALL_DIST_VALUE
+    side_dist: float = SIDE_DIST_VALUE
 
-        # Evaluate the board position based on the number of pieces
-        for i, square in enumerate(board.friendly_form):
-            row = i // CheckersBoard.size(board)
-            col = i % CheckersBoard.size(board)
-            if square == Figure.EMPTY:
-                continue
-            if square == Figure.WHITE_MAN:
-                score += MAN_VALUE
-            elif square == Figure.BLACK_MAN:
-                score -= MAN_VALUE
-            elif square == Figure.WHITE_KING:
-                score += KING_VALUE
-            elif square == Figure.BLACK_KING:
-                score -= KING_VALUE
-
-            if square / abs(square) == Color.WHITE.value:
-                score += (
-                    WALL_DIST_VALUE
-                    * (CheckersBoard.size(board) - 1 - row)
-                    / (CheckersBoard.size(board) - 1)
-                )
-                score += (
-                    SIDE_DIST_VALUE
-                    * abs(((CheckersBoard.size(board) - 1) / 2) - col)
-                    / ((CheckersBoard.size(board) - 1) / 2)
-                )
-            else:
-                score -= WALL_DIST_VALUE * row / (CheckersBoard.size(board) - 1)
-                score -= (
-                    SIDE_DIST_VALUE
-                    * abs(((CheckersBoard.size(board) - 1) / 2) - col)
-                    / ((CheckersBoard.size(board) - 1) / 2)
+
+def _piece_terms(figure: Figure, square: int) -> tuple[int, float, float]:
+    """Material, wall distance and side distance terms of a piece, as floats."""
+    row, col = ROW[square], COL[square]
+    material = {
+        Figure.WHITE_MAN: MAN_VALUE,
+        Figure.BLACK_MAN: -MAN_VALUE,
+        Figure.WHITE_KING: KING_VALUE,
+        Figure.BLACK_KING: -KING_VALUE,
+    }[figure]
+    side = SIDE_DIST_VALUE * abs(((BOARD_SIZE - 1) / 2) - col) / ((BOARD_SIZE - 1) / 2)
+    if figure.value / abs(figure.value) == Color.WHITE.value:
+        return (
+            material,
+            WALL_DIST_VALUE * (BOARD_SIZE - 1 - row) / (BOARD_SIZE - 1),
+            side,
+        )
+    return material, -(WALL_DIST_VALUE * row / (BOARD_SIZE - 1)), -side
+
+
+# Per-square terms of each piece type, keyed by figure value
+PIECE_TERMS = {
+    figure.value: [_piece_terms(figure, square) for square in range(NUM_SQUARES)]
+    for figure in Figure
+    if figure != Figure.EMPTY
+}
+WHITE_MAN_TERMS = PIECE_TERMS[Figure.WHITE_MAN.value]
+WHITE_KING_TERMS = PIECE_TERMS[Figure.WHITE_KING.value]
+BLACK_MAN_TERMS = PIECE_TERMS[Figure.BLACK_MAN.value]
+BLACK_KING_TERMS = PIECE_TERMS[Figure.BLACK_KING.value]
+
+# The same terms as an array indexed by [piece code, square, term], where the
+# code of an empty square is 0 and that of a piece 1 + its mask's index in
+# `CheckersEngine.encode`
+PIECE_TERM_ARRAY = np.array([
+    [(0, 0.0, 0.0)] * NUM_SQUARES,
+    *(
+        PIECE_TERMS[figure.value]
+        for figure in (
+            Figure.WHITE_MAN,
+            Figure.WHITE_KING,
+            Figure.BLACK_MAN,
+            Figure.BLACK_KING,
+        )
+    ),
+])
+# Sum of the terms of each piece code and square, in sevenths
+PIECE_SEVENTHS = np.rint(PIECE_TERM_ARRAY.sum(axis=2) * (BOARD_SIZE - 1)).astype(
+    np.int64
+)
+PIECE_CODES = np.arange(1, 5, dtype=np.uint8)  # code of each mask of `encode`
+SQUARES = np.arange(NUM_SQUARES)
+
+# Features of each piece code and square, in the order of `CheckersWeights`:
+# men, kings, rows advanced and half columns from the center, positive for white
+PIECE_FEATURES = np.array([
+    [(0, 0, 0, 0)] * NUM_SQUARES,
+    [(1, 0, WHITE_ADVANCE[sq], CENTER_DIST[sq]) for sq in range(NUM_SQUARES)],
+    [(0, 1, WHITE_ADVANCE[sq], CENTER_DIST[sq]) for sq in range(NUM_SQUARES)],
+    [(-1, 0, -BLACK_ADVANCE[sq], -CENTER_DIST[sq]) for sq in range(NUM_SQUARES)],
+    [(0, -1, -BLACK_ADVANCE[sq], -CENTER_DIST[sq]) for sq in range(NUM_SQUARES)],
+])
+FEATURE_SCALE = np.array([1, 1, BOARD_SIZE - 1, BOARD_SIZE - 1])  # weight units
+
+
+def _weighted_sum(
+    weights: CheckersWeights, men: Any, kings: Any, advance: Any, center_dist: Any
+) -> Any:
+    """Weigh the features of a position, or of arrays of positions alike.
+
+    Both kinds are summed in the same order, so they score the same.
+    """
+    return (
+        weights.man * men
+        + weights.king * kings
+        + (weights.wall_dist * advance + weights.side_dist * center_dist)
+        / (BOARD_SIZE - 1)
+    )
+
+
+def _max_order_key(move: BitMove) -> int:
+    """Sort key of the maximizing side's moves; see `CheckersEngine.get_ordered_moves`."""
+    return (
+        -8 * (move >> CAPTURED_SHIFT & FULL_MASK).bit_count()
+        - (move >> DST_SHIFT & SQUARE_MASK) // BOARD_SIZE
+    )
+
+
+def _min_order_key(move: BitMove) -> int:
+    """Sort key of the minimizing side's moves; see `CheckersEngine.get_ordered_moves`."""
+    return (
+        -8 * (move >> CAPTURED_SHIFT & FULL_MASK).bit_count()
+        + (move >> DST_SHIFT & SQUARE_MASK) // BOARD_SIZE
+    )
+
+
+class CheckersEngine(AbstractEngine[CheckersBitboard, BitMove]):
+    """Class for the Checkers AI engine using Negamax and Alpha-Beta Pruning.
+
+    The search runs on a `CheckersBitboard`; `py-draughts` boards passed to
+    `get_best_move` are converted at the root.
+    """
+
+    def __init__(
+        self,
+        depth: int,
+        *,
+        book: OpeningBook | str | None = None,
+        endgame: EndgameDatabase | str | None = None,
+        weights: CheckersWeights | str | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize the engine, optionally with an opening book and endgame database.
+
+        ``book`` and ``endgame`` are loaded tables or paths to their files. Both
+        are probed before every search, which only runs when neither has the
+        position; book moves searched shallower than a fixed ``depth`` are not
+        played. ``weights`` replaces the hand-picked evaluation weights, e.g.
+        with a file written by the ``tune`` command. Other arguments are those of
+        `AbstractEngine`.
+        """
+        super().__init__(depth, **kwargs)
+        self.book = OpeningBook.load(book) if isinstance(book, str) else book
+        self.endgame = (
+            EndgameDatabase.load(endgame) if isinstance(endgame, str) else endgame
+        )
+        if isinstance(weights, str):
+            weights = load_weights(weights, CheckersWeights)
+        self.weights = weights or CheckersWeights()
+        self._custom_weights = self.weights != CheckersWeights()
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Leave the tables out of the copies sent to worker processes.
+
+        Workers only search below the root, where the tables are not probed.
+        """
+        state = super().__getstate__()
+        state["book"] = state["endgame"] = None
+        return state
+
+    def evaluate(self, board: CheckersBitboard) -> int:
+        """Evaluate the board state.
+
+        Per piece: its material value, ``WALL_DIST_VALUE`` scaled by how far it has
+        advanced, and ``SIDE_DIST_VALUE`` scaled by its distance from the center
+        column, positive for white and negative for black. The board keeps the
+        positional sums up to date in whole rows and half columns, so the score is
+        summed exactly in sevenths with integers, in O(1). Whole scores, about one
+        evaluation in seven in the bench searches, are summed again as floats in
+        O(pieces); see `_float_evaluate`. With custom ``weights``, the same terms
+        are weighted by them and rounded down.
+        """
+        if self._custom_weights:
+            return floor(
+                _weighted_sum(
+                    self.weights,
+                    board.white_men.bit_count() - board.black_men.bit_count(),
+                    board.white_kings.bit_count() - board.black_kings.bit_count(),
+                    board.advance,
+                    board.center_dist,
                 )
+            )
+        material = MAN_VALUE * (
+            board.white_men.bit_count() - board.black_men.bit_count()
+        ) + KING_VALUE * (board.white_kings.bit_count() - board.black_kings.bit_count())
+        sevenths = (
+            (BOARD_SIZE - 1) * material
+            + WALL_DIST_VALUE * board.advance
+            + SIDE_DIST_VALUE * board.center_dist
+        )
+        if sevenths % (BOARD_SIZE - 1):
+            return sevenths // (BOARD_SIZE - 1)
+        # A whole score: the float sum this evaluation has always used may have
+        # rounded to just below it (e.g. -1 in the starting position), so redo it
+        return self._float_evaluate(board)
+
+    @staticmethod
+    def _float_evaluate(board: CheckersBitboard) -> int:
+        """Evaluate by summing the float terms of every piece in square order.
 
+        Only the occupied squares are visited, lowest first.
+        """
+        white_men, white_kings = board.white_men, board.white_kings
+        black_men = board.black_men
+        occupied = white_men | white_kings | black_men | board.black_kings
+        score = 0
+        while occupied:
+            low = occupied & -occupied
+            occupied ^= low
+            if low & white_men:
+                terms = WHITE_MAN_TERMS
+            elif low & white_kings:
+                terms = WHITE_KING_TERMS
+            elif low & black_men:
+                terms = BLACK_MAN_TERMS
+            else:
+                terms = BLACK_KING_TERMS
+            material, wall_dist, side_dist = terms[low.bit_length() - 1]
+            score += material
+            score += wall_dist
+            score += side_dist
         return floor(score)
 
+    def encode(self, board: CheckersBitboard) -> tuple[int, ...]:
+        """Encode a position as its white men, white kings, black men and black kings."""
+        return board.white_men, board.white_kings, board.black_men, board.black_kings
+
+    def evaluate_batch(self, positions: np.ndarray) -> np.ndarray:
+        """Evaluate encoded positions like `evaluate`, summing terms per square.
+
+        The masks are unpacked to the piece code of every square, whose terms are
+        summed in sevenths. As in `evaluate`, whole scores are summed again as
+        floats, with a cumulative sum in the order of `_float_evaluate`.
+        """
+        if self._custom_weights:
+            features = self._feature_sums(positions).T
+            scores = _weighted_sum(self.weights, *features)
+            return np.floor(scores).astype(np.int64)
+        codes = self._piece_codes(positions)
+        sevenths = PIECE_SEVENTHS[codes, SQUARES].sum(axis=1)
+        scores = sevenths // (BOARD_SIZE - 1)
+        whole = sevenths % (BOARD_SIZE - 1) == 0
+        if whole.any():
+            terms = PIECE_TERM_ARRAY[codes[whole], SQUARES]
+            sums = np.cumsum(terms.reshape(len(terms), -1), axis=1)[:, -1]
+            scores[whole] = np.floor(sums)
+        return scores
+
+    def feature_batch(self, positions: np.ndarray) -> np.ndarray:
+        """Features of encoded positions in the units of `CheckersWeights`.
+
+        The positional features are in sevenths, as their weights count for
+        advancing all the way or standing at the side.
+        """
+        return self._feature_sums(positions) / FEATURE_SCALE
+
+    def _feature_sums(self, positions: np.ndarray) -> np.ndarray:
+        """Sum the `PIECE_FEATURES` of the pieces of encoded positions."""
+        return PIECE_FEATURES[self._piece_codes(positions), SQUARES].sum(axis=1)
+
+    @staticmethod
+    def _piece_codes(positions: np.ndarray) -> np.ndarray:
+        """Unpack encoded positions to the piece code of every square."""
+        bits = np.unpackbits(
+            positions.astype("<u4").view(np.uint8), axis=1, bitorder="little"
+        ).reshape(len(positions), 4, NUM_SQUARES)
+        return PIECE_CODES @ bits
+
+    def to_search_board(self, board: CheckersBitboard | BaseBoard) -> CheckersBitboard:
+        """Convert a `py-draughts` board to a bitboard; bitboards are kept."""
+        if isinstance(board, CheckersBitboard):
+            return board
+        return CheckersBitboard.from_draughts(board)
+
+    def to_game_move(
+        self, move: BitMove, board: CheckersBitboard | BaseBoard
+    ) -> BitMove | Move:
+        """Convert a move to a `py-draughts` move if ``board`` is a draughts board."""
+        if isinstance(board, CheckersBitboard):
+            return move
+        return CheckersBitboard.to_draughts_move(move, board)
+
+    def is_search_draw(self, board: CheckersBitboard) -> bool:
+        """Whether the position repeats an earlier one, or no progress was made."""
+        return board.repetitions > 0 or board.is_no_progress
+
+    def is_quiet(self, move: BitMove) -> bool:
+        """Whether a move captures nothing, i.e. has no bits above its squares."""
+        return not move >> CAPTURED_SHIFT
+
+    def probe_root(
+        self, board: CheckersBitboard, stats: SearchStats | None
+    ) -> BitMove | None:
+        """Play from the opening book, else from the endgame database if possible."""
+        if self.book is not None:
+            move = self.book.probe(
+                board, 0 if self.time_budget_ms is not None else self.depth
+            )
+            if move is not None:
+                if stats is not None:
+                    stats.book_hits += 1
+                return move
+        if self.endgame is not None and self.endgame.probe(board) is not None:
+            is_min_turn = board.turn.value == AbstractPlayer.MIN
+            move = self.endgame.best_move(
+                board, self.get_ordered_moves(board, is_min_turn=is_min_turn)
+            )
+            if move is not None:
+                if stats is not None:
+                    stats.tablebase_hits += 1
+                return move
+        return None
+
     def get_ordered_moves(
-        self, board: CheckersBoard, *, is_min_turn: bool = False
-    ) -> list[Move]:
-        """Get legal moves ordered by their potential effectiveness."""
-        return sorted(
-            board.legal_moves,
-            key=lambda move: (
-                -len(move.captured_list),  # prefer moves that capture more pieces
-                (1 if is_min_turn else -1)
-                * (
-                    (move.square_list[-1] // CheckersBoard.size(board)) / 2
-                    - ((CheckersBoard.size(board) - 1) / 2)
-                )
-                if len(move.square_list) > 0
-                else 0,  # prefer moves that advance to the opposite wall
-            ),
-        )
+        self, board: CheckersBitboard, *, is_min_turn: bool = False
+    ) -> list[BitMove]:
+        """Get legal moves ordered by their potential effectiveness.
+
+        Moves that capture more pieces come first, then those ending nearer the
+        opposite wall, in pairs of rows. The sort key packs both into one int:
+        8 per capture, more than the row pairs' range. The list is reused for
+        the next position at the same depth; see
+        `CheckersBitboard.sorted_move_list`.
+        """
+        return board.sorted_move_list(_min_order_key if is_min_turn else _max_order_key)
+
+    @overload
+    def get_best_move(self, board: CheckersBitboard) -> BitMove: ...
+
+    @overload
+    def get_best_move(self, board: BaseBoard) -> Move: ...
+
+    def get_best_move(self, board: CheckersBitboard | BaseBoard) -> BitMove | Move:
+        """Get the best move, converting `py-draughts` boards to a bitboard first.
+
+        Args:
+            board (CheckersBitboard | BaseBoard): A bitboard, or any american
+                `py-draughts` board such as the `Server`'s.
+
+        Returns:
+            BitMove | Move: The best move, of the same kind as ``board``'s moves.
+        """
+        return self.search(board).move
+
+    @overload
+    def search(self, board: CheckersBitboard) -> SearchResult[BitMove]: ...
+
+    @overload
+    def search(self, board: BaseBoard) -> SearchResult[Move]: ...
+
+    def search(
+        self, board: CheckersBitboard | BaseBoard
+    ) -> SearchResult[BitMove] | SearchResult[Move]:
+        """Search like `get_best_move`, also returning the search statistics."""
+        if isinstance(board, CheckersBitboard):
+            return super().search(board)
+        move, stats = super().search(CheckersBitboard.from_draughts(board))
+        return SearchResult(CheckersBitboard.to_draughts_move(move, board), stats)
+
+    def start_pondering(
+        self, board: CheckersBitboard | BaseBoard, move: BitMove | Move
+    ) -> None:
+        """Ponder like `AbstractEngine.start_pondering`, on either kind of board."""
+        board = self.to_search_board(board)
+        if isinstance(move, Move):
+            move = BitMove.from_draughts(move)
+        super().start_pondering(board, move)
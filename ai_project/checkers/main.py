@@ -7,19 +7,59 @@ Project: DualBoard Negamax AI
 """
 
 from draughts import Server, get_board
+from draughts.boards.base import BaseBoard
+from draughts.move import Move
 
 from ai_project.checkers.engine import CheckersEngine
-from ai_project.utils import parse_args
-
-args = parse_args()
-
-engine = CheckersEngine(
-    depth=args.difficulty, randomness=args.randomness, debug=args.debug
-)
-board = get_board("american")
-server = Server(board=board, get_best_move_method=engine.get_best_move)
+from ai_project.mcts import ITERATIONS_PER_LEVEL, MctsEngine
+from ai_project.utils import append_stats, parse_args
 
 
 def main():
     """Main function to run the checkers server."""
-    server.run()
+    args = parse_args()
+    engine = CheckersEngine(
+        depth=args.difficulty,
+        time_budget_ms=args.time_budget_ms,
+        randomness=args.randomness,
+        debug=args.debug,
+        tt_size_mb=args.tt_size_mb,
+        workers=args.workers,
+        collect_stats=args.stats_path is not None,
+        pvs=args.pvs,
+        aspiration_window=args.aspiration_window,
+        quiescence_nodes=args.quiescence_nodes,
+        lmr_moves=args.lmr_moves,
+        futility_margin=args.futility_margin,
+        razor_margin=args.razor_margin,
+        book=args.book_path,
+        endgame=args.endgame_path,
+        weights=args.weights_path,
+        ponder=args.ponder,
+        detect_draws=args.detect_draws,
+    )
+    if args.mcts:
+        engine = MctsEngine(
+            engine,
+            iterations=ITERATIONS_PER_LEVEL * args.difficulty,
+            time_budget_ms=args.time_budget_ms,
+            exploration=args.exploration,
+            workers=args.workers,
+            collect_stats=args.stats_path is not None,
+        )
+    else:
+        engine.start_workers()  # spares the first move the workers' start-up
+
+    def get_best_move(board: BaseBoard) -> Move:
+        """Search for the engine's move, recording its statistics if requested."""
+        move, stats = engine.search(board)
+        if args.stats_path is not None and stats is not None:
+            append_stats(args.stats_path, stats)
+        engine.start_pondering(board, move)
+        return move
+
+    server = Server(board=get_board("american"), get_best_move_method=get_best_move)
+    try:
+        server.run()
+    finally:
+        engine.close()
@@ -6,30 +6,203 @@ Term: Spring 2025
 Project: DualBoard Negamax AI
 """
 
+import copy
+import multiprocessing
 import random
+import sys
+import threading
+import time
 from abc import ABC, abstractmethod
+from concurrent.futures import Future, ProcessPoolExecutor, wait
 from math import inf
-from typing import Generic, TypeVar
+from typing import Any, Generic, NamedTuple, TypeVar
+
+import numpy as np
 
 from ai_project.board import AbstractBoard, AbstractPlayer, MoveT
+from ai_project.stats import DepthStats, SearchStats
+from ai_project.transposition import Bound, TranspositionTable
 
 BoardT = TypeVar("BoardT", bound="AbstractBoard")
 
+MAX_PLY = 128  # Deepest ply the principal variation table can track
+RESOLVED_DEPTH = 1000  # Stored depth for results that never reached the horizon
+TIME_CHECK_INTERVAL = 32  # Nodes searched between clock checks
+LMR_MIN_DEPTH = 3  # Shallowest remaining depth whose late moves are reduced
+SELECTIVE_DEPTH = 2  # Plies above the horizon where futility and razoring apply
+
+
+class SearchAborted(Exception):
+    """Raised inside the search when it must stop early, e.g. on a timeout."""
+
+
+class SearchResult(NamedTuple, Generic[MoveT]):
+    """Best move of a search, with its statistics when they are collected."""
+
+    move: MoveT
+    stats: SearchStats | None
+
+
+class RootMoveResult(NamedTuple):
+    """Result of searching one root move in a worker process."""
+
+    value: float
+    pv: tuple  # principal variation below the root move
+    nodes: int
+    horizon_hits: int
+    stats: SearchStats | None
+
+
+def _tie_bound(score: float) -> float:
+    """Largest score below ``score``; scores are integers or infinite."""
+    if score == inf:
+        return sys.float_info.max
+    return score - 1
+
+
+def _null_bound(score: float) -> float:
+    """Smallest score above ``score``; scores are integers or infinite.
+
+    The largest float stands for the scores just below +inf, see `_tie_bound`.
+    """
+    if score == -inf:
+        return -sys.float_info.max
+    if score == sys.float_info.max:
+        return inf
+    return score + 1
+
+
+_worker_engine: Any = None  # the engine of a root-parallel worker process
+
+
+def _init_worker(engine: "AbstractEngine", shared_alpha: Any) -> None:
+    """Set up a worker process with its own copy of the engine."""
+    global _worker_engine
+    engine._shared_alpha = shared_alpha
+    _worker_engine = engine
+
+
+def _worker_ready() -> None:
+    """Do nothing; run in every worker to wait until it is set up."""
+
+
+def _search_root_move(move: Any, *args: Any) -> RootMoveResult:
+    """Search a root move with the worker's engine; see `_search_shared_move`."""
+    return _worker_engine._search_shared_move(move, *args)
+
 
 class AbstractEngine(ABC, Generic[BoardT, MoveT]):
     """Abstract base class for an AI engine using Negamax and Alpha-Beta Pruning."""
 
     def __init__(
-        self, depth: int, *, randomness: float = 0.0, debug: bool = False
+        self,
+        depth: int,
+        *,
+        randomness: float = 0.0,
+        debug: bool = False,
+        tt_size_mb: float = 16.0,
+        exact_tt_depth: bool = False,
+        time_budget_ms: float | None = None,
+        workers: int = 1,
+        collect_stats: bool = False,
+        dynamic_ordering: bool = True,
+        seed: int | None = None,
+        pvs: bool = False,
+        aspiration_window: int | None = None,
+        quiescence_nodes: int = 0,
+        ponder: bool = False,
+        batch_leaves: bool = False,
+        detect_draws: bool = False,
+        lmr_moves: int = 0,
+        futility_margin: int = 0,
+        razor_margin: int = 0,
     ) -> None:
-        """Initialize the engine with a search depth."""
+        """Initialize the engine with a search depth.
+
+        Args:
+            depth (int): Search depth in plies.
+            randomness (float): Percentage of moves played at random (0-100).
+            debug (bool): Print every search's moves and counters.
+            tt_size_mb (float): Transposition table size in megabytes (0 disables it).
+            exact_tt_depth (bool): Cut off only on same-depth transposition scores.
+            time_budget_ms (float | None): Per-move search time, instead of ``depth``.
+            workers (int): Processes searching root moves in parallel.
+            collect_stats (bool): Return the `SearchStats` of every `search`.
+            dynamic_ordering (bool): Order quiet moves by killer moves and history.
+            seed (int | None): Seed of the random moves.
+            pvs (bool): Use principal variation search.
+            aspiration_window (int | None): Aspiration window of iterative deepening.
+            quiescence_nodes (int): Quiescence search budget per horizon position.
+            ponder (bool): Let `start_pondering` search on the opponent's time.
+            batch_leaves (bool): Score the leaves of each frontier node in one batch.
+            detect_draws (bool): Score `is_search_draw` positions as draws.
+            lmr_moves (int): Moves searched before late move reductions start.
+            futility_margin (int): Futility pruning margin per ply.
+            razor_margin (int): Razoring margin per ply.
+        """
         if not 0 <= randomness <= 100:
             raise ValueError("randomness must be in 0...100")
+        if tt_size_mb < 0:
+            raise ValueError("tt_size_mb must be non-negative")
+        if time_budget_ms is not None and time_budget_ms <= 0:
+            raise ValueError("time_budget_ms must be positive")
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if aspiration_window is not None and aspiration_window <= 0:
+            raise ValueError("aspiration_window must be positive")
+        if quiescence_nodes < 0:
+            raise ValueError("quiescence_nodes must be non-negative")
+        if ponder and workers > 1:
+            raise ValueError("pondering needs workers == 1")
+        if lmr_moves < 0 or futility_margin < 0 or razor_margin < 0:
+            raise ValueError("lmr_moves and the margins must be non-negative")
 
         self.depth = depth
+        self.time_budget_ms = time_budget_ms
         self._p_random = randomness / 100
-        self._rng = random.Random()
+        self._rng = random.Random(seed)
         self._dbg = debug
+        self.tt = TranspositionTable(tt_size_mb) if tt_size_mb else None
+        self.exact_tt_depth = exact_tt_depth
+        self.workers = workers
+        self._pool: ProcessPoolExecutor | None = None
+        self._shared_alpha: Any = None  # best root score found by any worker
+        self._search_id = 0
+        self.collect_stats = collect_stats
+        self._stats: SearchStats | None = None  # stats of the running search
+        self.dynamic_ordering = dynamic_ordering
+        self.batch_leaves = batch_leaves and self._has_batch_evaluation()
+        self.detect_draws = detect_draws
+        self.pvs = pvs
+        self.aspiration_window = aspiration_window
+        self.quiescence_nodes = quiescence_nodes
+        self._quiescence_left = 0  # nodes left to the running quiescence search
+        self.lmr_moves = lmr_moves
+        self.futility_margin = futility_margin
+        self.razor_margin = razor_margin
+        self.ponder = ponder
+        self._ponder_thread: threading.Thread | None = None
+        self._ponder_key = 0  # Zobrist key of the position being pondered
+        self._ponder_start = 0.0
+        self._ponder_result: SearchResult[MoveT] | None = None
+        self._ponder_misses = 0  # misses since the last search
+        self._stop_requested = False  # set to cancel the running search
+        self._cancel_flag: Any = None  # shared flag set by another process to cancel
+        self._last_pv: tuple[MoveT, ...] = ()  # principal variation of the last move
+        self._killers: list[list[MoveT | None]] = [
+            [None, None] for _ in range(MAX_PLY + 1)
+        ]  # two most recent quiet cutoff moves per ply
+        self._history: tuple[dict[MoveT, int], dict[MoveT, int]] = (
+            {},
+            {},
+        )  # cutoff credit of quiet moves, for the max and the min player
+
+        self._nodes = 0
+        self._horizon_hits = 0  # leaves cut off by the depth limit or a search draw
+        self._deadline: float | None = None
+        self._time_limit: float | None = None  # latest end of the running search
+        self._pv_table: list[tuple[MoveT, ...]] = [()] * (MAX_PLY + 1)
+        self._pv_hints: dict[int, MoveT] = {}  # previous iteration's PV by position
 
     def terminal_score(self, board: BoardT) -> float:
         """Return a terminal score for the board state.
@@ -56,6 +229,106 @@ class AbstractEngine(ABC, Generic[BoardT, MoveT]):
         """
         pass
 
+    def encode(self, board: BoardT) -> tuple[int, ...]:
+        """Encode a position as integers, such as its piece masks, for `evaluate_batch`.
+
+        Args:
+            board (AbstractBoard): The current board state.
+
+        Returns:
+            tuple[int, ...]: The encoded position.
+        """
+        raise NotImplementedError(f"{type(self).__name__} has no batch evaluation")
+
+    def evaluate_batch(self, positions: np.ndarray) -> np.ndarray:
+        """Evaluate many encoded positions in one vectorized call.
+
+        Args:
+            positions (np.ndarray): One row per position, as returned by `encode`.
+
+        Returns:
+            np.ndarray: The `evaluate` score of every position.
+        """
+        raise NotImplementedError(f"{type(self).__name__} has no batch evaluation")
+
+    def _has_batch_evaluation(self) -> bool:
+        """Whether the engine overrides `encode` and `evaluate_batch`."""
+        engine_type = type(self)
+        return (
+            engine_type.encode is not AbstractEngine.encode
+            and engine_type.evaluate_batch is not AbstractEngine.evaluate_batch
+        )
+
+    def feature_batch(self, positions: np.ndarray) -> np.ndarray:
+        """Compute the evaluation features of many encoded positions, for tuning.
+
+        Engines whose evaluation is linear in its ``weights`` score a position as
+        the dot product of its features with them, rounded down.
+
+        Args:
+            positions (np.ndarray): One row per position, as returned by `encode`.
+
+        Returns:
+            np.ndarray: One row of features per position, one per weight.
+        """
+        raise NotImplementedError(f"{type(self).__name__} has no evaluation features")
+
+    def to_search_board(self, board: Any) -> BoardT:
+        """Convert a board passed to `search` to the board the search runs on.
+
+        Args:
+            board (Any): A board of the game, such as the game's own board.
+
+        Returns:
+            AbstractBoard: The board to search; ``board`` itself by default.
+        """
+        return board
+
+    def to_game_move(self, move: MoveT, board: Any) -> Any:
+        """Convert a move found on `to_search_board`'s board to one of ``board``.
+
+        Args:
+            move (Move): The move found by the search.
+            board (Any): The board that was passed to `search`.
+
+        Returns:
+            Any: The move for ``board``; ``move`` itself by default.
+        """
+        return move
+
+    def is_search_draw(self, board: BoardT) -> bool:
+        """Whether the search may score a position as a draw, e.g. a repetition.
+
+        Called with ``detect_draws`` for every position inside the search tree,
+        which can be drawn in ways the game itself does not end on yet.
+
+        Args:
+            board (AbstractBoard): The current board state.
+
+        Returns:
+            bool: Whether to score the position as a draw.
+        """
+        return False
+
+    def is_quiet(self, move: MoveT) -> bool:
+        """Whether a move is quiet, i.e. eligible for killer and history ordering.
+
+        Non-quiet moves, such as captures, keep their `get_ordered_moves` order.
+        """
+        return True
+
+    def probe_root(self, board: BoardT, stats: SearchStats | None) -> MoveT | None:
+        """Look the root position up before searching, e.g. in an opening book.
+
+        Args:
+            board (AbstractBoard[Move]): The current board state.
+            stats (SearchStats | None): Statistics to count hits in, if collected.
+
+        Returns:
+            Move | None: The move to play, or ``None`` to search as usual.
+        """
+        return None
+
     @abstractmethod
     def get_ordered_moves(
         self, board: BoardT, *, is_min_turn: bool = False
@@ -79,6 +352,7 @@ class AbstractEngine(ABC, Generic[BoardT, MoveT]):
         beta: float,
         *,
         is_min_turn: bool = False,
+        ply: int = 0,
     ) -> float:
         """Perform Alpha-Beta pruning to find the best move.
 
@@ -88,35 +362,484 @@ class AbstractEngine(ABC, Generic[BoardT, MoveT]):
             alpha (float): The best score for the maximizing player.
             beta (float): The best score for the minimizing player.
             is_min_turn (bool): Whether it is the minimizing player's turn.
+            ply (int): Distance from the root of the search.
 
         Returns:
             float: The evaluation score for the board.
         """
-        if board.game_over:
-            return self.terminal_score(board)
+        self._count_node(ply)
+        self._pv_table[ply] = ()
+
+        terminal = self._terminal_value(board)
+        if terminal is not None:
+            return terminal
 
         if depth == 0:
-            return (1 if is_min_turn else -1) * self.evaluate(board)
+            return self._horizon_value(board, alpha, beta, is_min_turn)
 
+        tt_score, tt_move = self._probe_tt(board, depth, alpha, beta)
+        if tt_score is not None:
+            return tt_score
+        if depth == 1 and self.batch_leaves and not self.quiescence_nodes:
+            return self._search_frontier(board, alpha, beta, is_min_turn, ply, tt_move)
+        razored = self._razor(board, depth, alpha, beta, is_min_turn)
+        if razored is not None:
+            return razored
+        return self._search_moves(board, depth, alpha, beta, is_min_turn, ply, tt_move)
+
+    def _search_moves(
+        self,
+        board: BoardT,
+        depth: int,
+        alpha: float,
+        beta: float,
+        is_min_turn: bool,
+        ply: int,
+        tt_move: MoveT | None,
+    ) -> float:
+        """Search the moves of a position for `alpha_beta` and store the result."""
+        alpha_orig = alpha
+        horizon_hits = self._horizon_hits
+        futile = self._is_futile(board, depth, alpha, is_min_turn)
         best = -inf
-        for move in self.get_ordered_moves(board, is_min_turn=is_min_turn):
-            board.push(move)  # make move
-            val = -self.alpha_beta(
-                board, depth - 1, -beta, -alpha, is_min_turn=not is_min_turn
-            )  # recurse and negate
+        best_move = None
+        for i, move in enumerate(self._ordered_moves(board, is_min_turn, tt_move, ply)):
+            val = self._search_move(
+                board, move, i, depth, alpha, beta, is_min_turn, ply, futile
+            )
+            if val is None:  # pruned
+                continue
+
+            if best_move is None or val > best:
+                best = val
+                best_move = move
+            if val > alpha:
+                alpha = val
+                self._pv_table[ply] = (move, *self._pv_table[ply + 1])
+            if alpha >= beta:  # beta cutoff
+                self._record_cutoff(move, i, depth, ply, is_min_turn)
+                break
+
+        if self._horizon_hits == horizon_hits:  # subtree solved to the end
+            depth = RESOLVED_DEPTH
+        self._store_tt(board, depth, best, alpha_orig, beta, best_move)
+
+        return best
+
+    def _search_move(
+        self,
+        board: BoardT,
+        move: MoveT,
+        index: int,
+        depth: int,
+        alpha: float,
+        beta: float,
+        is_min_turn: bool,
+        ply: int,
+        futile: bool,
+    ) -> float | None:
+        """Search the ``index``-th move of a position, or ``None`` if it is pruned.
+
+        In a ``futile`` position, quiet moves after the first are pruned; late
+        quiet moves are reduced if ``lmr_moves`` is set.
+        """
+        quiet = index > 0 and self.is_quiet(move)
+        if futile and quiet:
+            # The pruned move was not searched, so neither is its position
+            self._horizon_hits += 1
+            if self._stats is not None:
+                self._stats.futility_prunes += 1
+            return None
+        reduce = (
+            quiet
+            and 0 < self.lmr_moves <= index
+            and depth >= LMR_MIN_DEPTH
+            and -inf < alpha
+        )
+        board.push(move)  # make move
+        try:
+            return self._search_child(
+                board,
+                depth - 1,
+                alpha,
+                beta,
+                not is_min_turn,
+                ply + 1,
+                index > 0,
+                reduce,
+            )
+        finally:
             board.pop()  # undo move
 
-            best = max(best, val)
-            alpha = max(alpha, val)
+    def _static_score(self, board: BoardT, is_min_turn: bool) -> float:
+        """Evaluate a position for the side to move, to decide on pruning it."""
+        return (1 if is_min_turn else -1) * self.evaluate(board)
+
+    def _is_futile(
+        self, board: BoardT, depth: int, alpha: float, is_min_turn: bool
+    ) -> bool:
+        """Whether quiet moves cannot raise a position near the horizon to alpha."""
+        return (
+            0 < self.futility_margin
+            and depth <= SELECTIVE_DEPTH
+            and -inf < alpha < inf
+            and self._static_score(board, is_min_turn) + self.futility_margin * depth
+            <= alpha
+        )
+
+    def _razor(
+        self, board: BoardT, depth: int, alpha: float, beta: float, is_min_turn: bool
+    ) -> float | None:
+        """Score a hopeless position near the horizon without searching it.
+
+        Returns:
+            float | None: The horizon score of the position if its evaluation plus
+                the razoring margin is below alpha and the horizon score (with
+                quiescence search, if enabled) confirms it, else ``None``.
+        """
+        if not (
+            0 < self.razor_margin
+            and depth <= SELECTIVE_DEPTH
+            and -inf < alpha < inf
+            and self._static_score(board, is_min_turn) + self.razor_margin * depth
+            < alpha
+        ):
+            return None
+        value = self._horizon_value(board, alpha, beta, is_min_turn)
+        if value > alpha:
+            return None
+        if self._stats is not None:
+            self._stats.razorings += 1
+        return value
+
+    def _terminal_value(self, board: BoardT) -> float | None:
+        """Score a position that ends the search, or ``None`` if it goes on.
+
+        With ``detect_draws``, search draws (see `is_search_draw`) end it too.
+        """
+        if self.detect_draws and self.is_search_draw(board):
+            # The draw depends on the path to the position, so the subtrees
+            # above it are not stored as solved.
+            self._horizon_hits += 1
+            if self._stats is not None:
+                self._stats.search_draws += 1
+            return 0
+        if board.game_over:
+            return self.terminal_score(board)
+        return None
+
+    def _horizon_value(
+        self, board: BoardT, alpha: float, beta: float, is_min_turn: bool
+    ) -> float:
+        """Score a position at the horizon, by quiescence search if enabled."""
+        if self.quiescence_nodes:
+            self._quiescence_left = self.quiescence_nodes
+            return self.quiescence(board, alpha, beta, is_min_turn=is_min_turn)
+        return self._leaf_score(board, is_min_turn)
+
+    def _search_frontier(
+        self,
+        board: BoardT,
+        alpha: float,
+        beta: float,
+        is_min_turn: bool,
+        ply: int,
+        tt_move: MoveT | None,
+    ) -> float:
+        """Search a position one ply above the horizon, like `alpha_beta`.
+
+        All children are made first and the non-terminal ones scored together by
+        `evaluate_batch`; the moves are then gone through in order, so the score,
+        the cutoff and the nodes counted are those of the sequential search.
+        """
+        horizon_hits = self._horizon_hits
+        moves = self._ordered_moves(board, is_min_turn, tt_move, ply)
+        terminal, positions = self._expand_frontier(board, moves)
+        scores = iter(self.evaluate_batch(positions).tolist() if len(positions) else [])
+
+        alpha_orig = alpha
+        best = -inf
+        best_move = None
+        for i, (move, val) in enumerate(zip(moves, terminal, strict=True)):
+            self._count_node(ply + 1)
+            self._pv_table[ply + 1] = ()
+            if val is None:
+                val = -self._horizon_score(next(scores), not is_min_turn)
+
+            if best_move is None or val > best:
+                best = val
+                best_move = move
+            if val > alpha:
+                alpha = val
+                self._pv_table[ply] = (move,)
             if alpha >= beta:  # beta cutoff
+                self._record_cutoff(move, i, 1, ply, is_min_turn)
                 break
 
+        depth = 1 if self._horizon_hits > horizon_hits else RESOLVED_DEPTH
+        self._store_tt(board, depth, best, alpha_orig, beta, best_move)
+        return best
+
+    def _expand_frontier(
+        self, board: BoardT, moves: list[MoveT]
+    ) -> tuple[list[float | None], np.ndarray]:
+        """Make each move and encode the position, or score it if the game is over.
+
+        Returns:
+            tuple[list[float | None], np.ndarray]: The negated terminal score of
+                each move, ``None`` if the game goes on, and the encoded positions
+                of those moves.
+        """
+        terminal: list[float | None] = []
+        positions = []
+        for move in moves:
+            board.push(move)
+            value = self._terminal_value(board)
+            terminal.append(None if value is None else -value)
+            if value is None:
+                positions.append(self.encode(board))
+            board.pop()
+        return terminal, np.array(positions, dtype=np.uint64)
+
+    def quiescence(
+        self, board: BoardT, alpha: float, beta: float, *, is_min_turn: bool
+    ) -> float:
+        """Search only non-quiet moves from a horizon position until it is quiet.
+
+        The side to move may instead stand pat on the static evaluation, which is
+        also returned once the node budget runs out.
+
+        Args:
+            board (AbstractBoard): The current board state.
+            alpha (float): The best score for the maximizing player.
+            beta (float): The best score for the minimizing player.
+            is_min_turn (bool): Whether it is the minimizing player's turn.
+
+        Returns:
+            float: The evaluation score for the board.
+        """
+        if board.game_over:
+            return self.terminal_score(board)
+
+        best = self._leaf_score(board, is_min_turn)  # stand pat
+        if best >= beta or self._quiescence_left <= 0:
+            return best
+        alpha = max(alpha, best)
+        for move in self.get_ordered_moves(board, is_min_turn=is_min_turn):
+            if self.is_quiet(move) or self._quiescence_left <= 0:
+                continue
+            self._quiescence_left -= 1
+            self._count_node(None)
+            board.push(move)
+            try:
+                val = -self.quiescence(
+                    board, -beta, -alpha, is_min_turn=not is_min_turn
+                )
+            finally:
+                board.pop()
+            best = max(best, val)
+            alpha = max(alpha, val)
+            if alpha >= beta:
+                break
         return best
 
+    def _search_child(
+        self,
+        board: BoardT,
+        depth: int,
+        alpha: float,
+        beta: float,
+        is_min_turn: bool,
+        ply: int,
+        null_window: bool,
+        reduce: bool = False,
+    ) -> float:
+        """Search the position after a move and return its negated score.
+
+        With PVS, a ``null_window`` search first tests whether the move beats
+        ``alpha``, even while that is still -inf; scores are integers, so a null
+        window is one point wide. Only a move that does is searched again with
+        the full window. A move to ``reduce`` is first tested the same way one ply
+        shallower.
+        """
+        if reduce:
+            if self._stats is not None:
+                self._stats.lmr_reductions += 1
+            val = -self.alpha_beta(
+                board,
+                depth - 1,
+                -_null_bound(alpha),
+                -alpha,
+                is_min_turn=is_min_turn,
+                ply=ply,
+            )
+            if val <= alpha:
+                return val
+            if self._stats is not None:
+                self._stats.lmr_researches += 1
+        if null_window and self.pvs and _null_bound(alpha) < beta:
+            val = -self.alpha_beta(
+                board,
+                depth,
+                -_null_bound(alpha),
+                -alpha,
+                is_min_turn=is_min_turn,
+                ply=ply,
+            )
+            if not alpha < val < beta:
+                return val  # no better than alpha, or enough for a beta cutoff
+            if self._stats is not None:
+                self._stats.pvs_researches += 1
+        return -self.alpha_beta(
+            board, depth, -beta, -alpha, is_min_turn=is_min_turn, ply=ply
+        )
+
+    def _count_node(self, ply: int | None) -> None:
+        """Count a searched node, aborting the search once the deadline passes.
+
+        Quiescence nodes, which have no ``ply``, are left out of the per-ply counts.
+        """
+        self._nodes += 1
+        if self._stats is not None:
+            if ply is None:
+                self._stats.count_quiescence_node()
+            else:
+                self._stats.count_node(ply)
+        if (
+            self._deadline is not None
+            and not self._nodes % TIME_CHECK_INTERVAL
+            and (
+                time.perf_counter() > self._deadline
+                or self._stop_requested
+                or (self._cancel_flag is not None and self._cancel_flag.value)
+            )
+        ):
+            raise SearchAborted
+
+    def _record_cutoff(
+        self, move: MoveT, index: int, depth: int, ply: int, is_min_turn: bool
+    ) -> None:
+        """Credit a move that caused a beta cutoff after ``index`` earlier moves."""
+        if self._stats is not None:
+            self._stats.count_cutoff(index)
+        if self.dynamic_ordering and self.is_quiet(move):
+            killers = self._killers[ply]
+            if killers[0] != move:
+                killers[1] = killers[0]
+                killers[0] = move
+            history = self._history[is_min_turn]
+            history[move] = history.get(move, 0) + depth * depth
+
+    def _reset_ordering(self) -> None:
+        """Forget the killer moves and history of previous searches."""
+        for killers in self._killers:
+            killers[0] = killers[1] = None
+        for history in self._history:
+            history.clear()
+
+    def _leaf_score(self, board: BoardT, is_min_turn: bool) -> float:
+        """Score a position at the search horizon for the side to move."""
+        return self._horizon_score(self.evaluate(board), is_min_turn)
+
+    def _horizon_score(self, score: int, is_min_turn: bool) -> float:
+        """Count an evaluation at the horizon and return it for the side to move."""
+        self._horizon_hits += 1
+        if self._stats is not None:
+            self._stats.leaf_evals += 1
+        return (1 if is_min_turn else -1) * score
+
+    def _probe_tt(
+        self, board: BoardT, depth: int, alpha: float, beta: float
+    ) -> tuple[float | None, MoveT | None]:
+        """Probe the transposition table for the current position.
+
+        Returns:
+            tuple[float | None, MoveT | None]: A score that can be returned without
+                searching (or ``None``), and the stored best move (or ``None``).
+        """
+        if self.tt is None:
+            return None, None
+        entry = self.tt.probe(board.zobrist_key)
+        if entry is None:
+            return None, None
+        if self.exact_tt_depth:
+            deep_enough = entry.depth == depth or entry.depth >= RESOLVED_DEPTH
+        else:
+            deep_enough = entry.depth >= depth
+        if deep_enough and (
+            entry.bound == Bound.EXACT
+            or (entry.bound == Bound.LOWER and entry.score >= beta)
+            or (entry.bound == Bound.UPPER and entry.score <= alpha)
+        ):
+            if entry.depth < RESOLVED_DEPTH:
+                self._horizon_hits += 1  # the stored score depends on a horizon
+            if self._stats is not None:
+                self._stats.tt_cutoffs += 1
+            return entry.score, entry.move
+        return None, entry.move
+
+    def _store_tt(
+        self,
+        board: BoardT,
+        depth: int,
+        best: float,
+        alpha: float,
+        beta: float,
+        best_move: MoveT | None,
+    ) -> None:
+        """Store a node's result, deriving its bound from the original window."""
+        if self.tt is None:
+            return
+        if best <= alpha:
+            bound = Bound.UPPER
+        elif best >= beta:
+            bound = Bound.LOWER
+        else:
+            bound = Bound.EXACT
+        self.tt.store(board.zobrist_key, depth, best, bound, best_move)
+
+    def _tt_move(self, board: BoardT) -> MoveT | None:
+        """Return the best move stored for the position, if any."""
+        if self.tt is None:
+            return None
+        entry = self.tt.probe(board.zobrist_key)
+        return None if entry is None else entry.move
+
+    def _ordered_moves(
+        self, board: BoardT, is_min_turn: bool, tt_move: MoveT | None, ply: int
+    ) -> list[MoveT]:
+        """Order moves with `get_ordered_moves`, trying the PV or hash move first.
+
+        The moves are counted as an expansion at ``ply`` in the statistics.
+        """
+        moves = self.get_ordered_moves(board, is_min_turn=is_min_turn)
+        if self._stats is not None:
+            self._stats.count_expansion(ply, len(moves))
+        if self.dynamic_ordering and len(moves) > 1:
+            killers = self._killers[ply]
+            history = self._history[is_min_turn]
+            moves.sort(  # stable, so ties keep their static order
+                key=lambda move: (
+                    (2, 0)
+                    if not self.is_quiet(move)
+                    else (1, 0)
+                    if move == killers[0] or move == killers[1]
+                    else (0, history.get(move, 0))
+                ),
+                reverse=True,
+            )
+        first = self._pv_hints.get(board.zobrist_key, tt_move)
+        if first is not None:
+            for i, move in enumerate(moves):
+                if move == first:
+                    moves.insert(0, moves.pop(i))
+                    break
+        return moves
+
     def _maybe_random_root_move(self, board: BoardT) -> MoveT | None:
         """With probability p_random, return a random legal move, else None."""
         if self._p_random and self._rng.random() < self._p_random:
-            return self._rng.choice(list(board.legal_moves))
+            return self._rng.choice(board.legal_move_list())
         return None
 
     def get_best_move(self, board: BoardT) -> MoveT:
@@ -128,41 +851,521 @@ class AbstractEngine(ABC, Generic[BoardT, MoveT]):
         Returns:
             Move: The best move for the current player.
         """
+        return self.search(board).move
+
+    def search(self, board: BoardT) -> SearchResult[MoveT]:
+        """Search for the best move, like `get_best_move`, and report statistics.
+
+        Args:
+            board (AbstractBoard[Move]): The current board state.
+
+        Returns:
+            SearchResult[Move]: The best move, and the search statistics if the
+                engine collects them (else ``None``).
+        """
+        result = self._collect_ponder(board)
+        if result is None:
+            result = self._search(board)
+            if result.stats is not None:
+                result.stats.ponder_misses = self._ponder_misses
+        self._ponder_misses = 0
+        pv = self._pv_table[0]
+        self._last_pv = pv if pv[:1] == (result.move,) else ()
+        return result
+
+    def start_pondering(self, board: BoardT, move: MoveT) -> None:
+        """Search ahead in the background while the opponent thinks.
+
+        The opponent's reply to the engine's ``move`` is predicted from the last
+        search's principal variation (else the hash move, else the first ordered
+        move), and the position after it is searched in a thread that shares the
+        transposition table. If the next `search` is of that position, it returns
+        the pondered result; otherwise the pondering is cancelled. Does nothing
+        unless the engine was created with ``ponder``.
+
+        Args:
+            board (AbstractBoard[Move]): The board before ``move``; not modified.
+            move (Move): The move the engine is about to play.
+        """
+        if not self.ponder:
+            return
+        self.stop_pondering()
+        board = copy.deepcopy(board)
+        board.push(move)
+        if board.game_over:
+            return
+        moves = board.legal_move_list()
+        pv = self._last_pv
+        reply = pv[1] if len(pv) > 1 and pv[0] == move else None
+        if reply not in moves:
+            reply = self._tt_move(board)
+        if reply not in moves:
+            reply = self.get_ordered_moves(board)[0]
+        board.push(reply)
+        if board.game_over:
+            return
+
+        self._ponder_key = board.zobrist_key
+        self._ponder_start = time.perf_counter()
+        self._ponder_result = None
+        self._stop_requested = False
+        self._ponder_thread = threading.Thread(
+            target=self._ponder_search, args=(board,), daemon=True
+        )
+        self._ponder_thread.start()
+
+    def stop_pondering(self) -> None:
+        """Cancel the background search, if any, and wait for it to stop."""
+        if self._ponder_thread is not None:
+            self._stop_requested = True
+            self._ponder_thread.join()
+            self._ponder_thread = None
+            self._stop_requested = False
+            self._ponder_misses += 1
+
+    def search_cancellable(
+        self, board: BoardT, cancel_flag: Any, time_limit_ms: float | None = None
+    ) -> SearchResult[MoveT] | None:
+        """Search like `search`, stopping early once ``cancel_flag`` is set.
+
+        Args:
+            board (AbstractBoard[Move]): The current game board.
+            cancel_flag (Any): A shared value, such as a `multiprocessing` one, whose
+                ``value`` another process sets to cancel the search.
+            time_limit_ms (float | None): Time after which the search stops with
+                its deepest completed iteration. It never searches longer or
+                deeper than the engine's depth or time budget.
+
+        Returns:
+            SearchResult[Move] | None: The search result, or ``None`` if cancelled.
+        """
+        if time_limit_ms is not None:
+            self._time_limit = time.perf_counter() + time_limit_ms / 1000
+        if self.time_budget_ms is None:
+            self._deadline = inf  # no deadline, but check for cancellation
+        self._cancel_flag = cancel_flag
+        try:
+            result = self.search(board)
+        except SearchAborted:
+            return None
+        finally:
+            self._time_limit = None
+            self._cancel_flag = None
+            self._deadline = None
+        return None if cancel_flag.value else result
+
+    def _ponder_search(self, board: BoardT) -> None:
+        """Search a pondered position; the target of the pondering thread."""
+        if self.time_budget_ms is None:
+            self._deadline = inf  # no deadline, but check for cancellation
+        try:
+            self._ponder_result = self._search(board)
+        except SearchAborted:
+            pass
+        finally:
+            self._deadline = None
+
+    def _collect_ponder(self, board: BoardT) -> SearchResult[MoveT] | None:
+        """Return the pondered result on a ponder hit, else cancel the pondering."""
+        if self._ponder_thread is None:
+            return None
+        if board.zobrist_key != self._ponder_key:
+            self.stop_pondering()
+            return None
+        hit = time.perf_counter()
+        self._ponder_thread.join()
+        self._ponder_thread = None
+        result = self._ponder_result
+        if result is not None and result.stats is not None:
+            result.stats.ponder_hits = 1
+            result.stats.ponder_misses = self._ponder_misses
+            result.stats.ponder_seconds_saved = min(
+                hit - self._ponder_start, result.stats.seconds
+            )
+        return result
+
+    def _search(self, board: BoardT) -> SearchResult[MoveT]:
+        """Search for the best move, as `search` does without pondering."""
+        stats = SearchStats() if self.collect_stats else None
+
         # Probabilistically return a random move, similar to epsilon-greedy strategy used in reinforcement learning.
         rnd = self._maybe_random_root_move(board)
         if rnd is not None:
-            return rnd
+            return SearchResult(rnd, stats)
 
-        best_move = None
-        alpha = -inf
+        return self._search_unless_probed(board, stats)
 
+    def _search_unless_probed(
+        self, board: BoardT, stats: SearchStats | None
+    ) -> SearchResult[MoveT]:
+        """Search the root, unless `probe_root` already knows the move."""
+        probed = self.probe_root(board, stats)
+        if probed is not None:
+            return SearchResult(probed, stats)
+
+        self.start_workers()  # before the clock, which only counts searching
         is_min_turn = board.turn.value == AbstractPlayer.MIN
+        nodes, movegen_calls = self._nodes, board.movegen_calls
+        start = time.perf_counter()
 
-        for move in self.get_ordered_moves(board, is_min_turn=is_min_turn):
+        self._reset_ordering()
+        tt_hits = tt_misses = 0
+        if self.tt is not None:
+            self.tt.new_search()
+            tt_hits, tt_misses = self.tt.hits, self.tt.misses
+
+        self._stats = stats
+        try:
+            best_move, alpha = self._search_in_time(board, is_min_turn, start)
+        finally:
+            self._stats = None
+
+        if stats is not None:
+            stats.seconds = time.perf_counter() - start
+            stats.score = alpha
+            if self.tt is not None:
+                stats.tt_hits += self.tt.hits - tt_hits
+                stats.tt_misses += self.tt.misses - tt_misses
+
+        if best_move is None:
+            if board.has_legal_moves:
+                return SearchResult(
+                    self.get_ordered_moves(board)[0], stats
+                )  # fallback to the first legal move
+            raise ValueError("No valid moves found")
+
+        if self._dbg:
+            print(f"Turn: {board.turn}, Best move: {best_move}, Alpha: {alpha}")
+            print(
+                f"Nodes: {self._nodes - nodes},"
+                f" move generations: {board.movegen_calls - movegen_calls}"
+            )
+            if self.tt is not None:
+                print(
+                    f"TT hits: {self.tt.hits}, misses: {self.tt.misses},"
+                    f" collisions: {self.tt.collisions}"
+                )
+        return SearchResult(best_move, stats)
+
+    def _search_in_time(
+        self, board: BoardT, is_min_turn: bool, start: float
+    ) -> tuple[MoveT | None, float]:
+        """Search the root to the fixed depth, or deepen until the time budget ends.
+
+        With a time limit (see `search_cancellable`), a fixed-depth search deepens
+        up to its depth instead, and both stop at the limit with their deepest
+        completed iteration. ``start`` is when the search started.
+        """
+        if self.time_budget_ms is not None:
+            deadline = start + self.time_budget_ms / 1000
+            if self._time_limit is not None:
+                deadline = min(deadline, self._time_limit)
+            return self._iterative_deepening(board, is_min_turn, deadline, MAX_PLY)
+        if self._time_limit is not None:
+            return self._iterative_deepening(
+                board, is_min_turn, self._time_limit, self.depth
+            )
+        result = self._search_root(board, self.depth, is_min_turn)
+        self._record_depth(self.depth, start, 0)
+        return result
+
+    def _search_root(
+        self,
+        board: BoardT,
+        depth: int,
+        is_min_turn: bool,
+        alpha: float = -inf,
+        beta: float = inf,
+    ) -> tuple[MoveT | None, float]:
+        """Search every root move to ``depth`` and return the best one with its value.
+
+        Leaves the principal variation of the search in ``self._pv_table[0]``. With
+        a window narrower than the default, no move is returned when all score at
+        most ``alpha``, and the search stops at the first move scoring ``beta``.
+        """
+        if self.workers > 1:
+            return self._search_root_parallel(board, depth, is_min_turn)
+
+        best_move = None
+        alpha_orig = alpha
+        horizon_hits = self._horizon_hits
+        self._pv_table[0] = ()
+
+        rank = self._root_ranks(board, is_min_turn)
+        moves = self._ordered_moves(board, is_min_turn, self._tt_move(board), 0)
+        if self._stats is not None:
+            self._stats.count_node(0)
+
+        for i, move in enumerate(moves):
+            # Equal scores go to the move `get_ordered_moves` ranks first, so the
+            # result does not depend on the hash or PV move searched first
+            tie_break = best_move is not None and rank[move] < rank[best_move]
             board.push(move)  # make move
-            move_value = -self.alpha_beta(
-                board,
-                self.depth - 1,
-                -inf,
-                -alpha,
-                is_min_turn=not is_min_turn,
-            )  # recurse and negate
-            board.pop()  # undo move
+            try:
+                move_value = self._search_child(
+                    board,
+                    depth - 1,
+                    _tie_bound(alpha) if tie_break else alpha,
+                    beta,
+                    not is_min_turn,
+                    1,
+                    i > 0,
+                )
+            finally:
+                board.pop()  # undo move
 
-            if move_value > alpha:
+            if move_value > alpha or (tie_break and move_value == alpha):
                 alpha = move_value
                 best_move = move
+                self._pv_table[0] = (move, *self._pv_table[1])
 
             if self._dbg:
                 print(f"Evaluated move: {move}, Value: {move_value}")
+            if alpha >= beta != inf:  # fail high; keep looking for equal wins
+                break
 
-        if best_move is None:
-            if list(board.legal_moves):
-                return self.get_ordered_moves(board)[
-                    0
-                ]  # fallback to the first legal move
-            raise ValueError("No valid moves found")
+        if best_move is not None:
+            if self._horizon_hits == horizon_hits:
+                depth = RESOLVED_DEPTH
+            self._store_tt(board, depth, alpha, alpha_orig, beta, best_move)
+        return best_move, alpha
 
-        if self._dbg:
-            print(f"Turn: {board.turn}, Best move: {best_move}, Alpha: {alpha}")
-        return best_move
+    def _record_depth(self, depth: int, start: float, nodes: int) -> None:
+        """Record a completed depth that started at ``start`` with ``nodes`` counted."""
+        if self._stats is not None:
+            self._stats.depths.append(
+                DepthStats(
+                    depth, time.perf_counter() - start, self._stats.nodes - nodes
+                )
+            )
+
+    def _root_ranks(self, board: BoardT, is_min_turn: bool) -> dict[MoveT, int]:
+        """Map each root move to its index in `get_ordered_moves`' order."""
+        moves = self.get_ordered_moves(board, is_min_turn=is_min_turn)
+        return {move: i for i, move in enumerate(moves)}
+
+    def _search_root_parallel(
+        self, board: BoardT, depth: int, is_min_turn: bool
+    ) -> tuple[MoveT | None, float]:
+        """Search the root moves in the worker pool, like `_search_root`.
+
+        The first move is searched alone, then the rest in parallel (Young
+        Brothers Wait). Workers share the best score found so far and search just
+        below it, so every move that could be best gets an exact score and the
+        result is the same as the serial search's.
+        """
+        pool = self._start_pool()
+        rank = self._root_ranks(board, is_min_turn)
+        moves = self._ordered_moves(board, is_min_turn, self._tt_move(board), 0)
+        if self._stats is not None:
+            self._stats.count_node(0)
+        deadline = None  # wall clock time, as workers do not share perf_counter
+        if self._deadline is not None:
+            deadline = time.time() + self._deadline - time.perf_counter()
+        self._shared_alpha.value = -inf
+        self._search_id += 1
+        args = (board, depth, is_min_turn, deadline, self._search_id, self._pv_hints)
+
+        results = self._await_results([
+            pool.submit(_search_root_move, move, *args) for move in moves[:1]
+        ])
+        results += self._await_results([
+            pool.submit(_search_root_move, move, *args) for move in moves[1:]
+        ])
+
+        best_move = None
+        alpha = -inf
+        best_pv = ()
+        for move, result in zip(moves, results, strict=True):
+            self._nodes += result.nodes
+            self._horizon_hits += result.horizon_hits
+            if self._stats is not None and result.stats is not None:
+                self._stats.merge(result.stats)
+            if result.value > alpha or (
+                result.value == alpha
+                and best_move is not None
+                and rank[move] < rank[best_move]
+            ):
+                alpha = result.value
+                best_move = move
+                best_pv = result.pv
+
+            if self._dbg:
+                print(f"Evaluated move: {move}, Value: {result.value}")
+
+        self._pv_table[0] = () if best_move is None else (best_move, *best_pv)
+        if best_move is not None:
+            if not any(result.horizon_hits for result in results):
+                depth = RESOLVED_DEPTH
+            self._store_tt(board, depth, alpha, -inf, inf, best_move)
+        return best_move, alpha
+
+    def _await_results(
+        self, futures: list[Future[RootMoveResult]]
+    ) -> list[RootMoveResult]:
+        """Wait for the results of root moves, aborting once the deadline passes."""
+        timeout = None
+        if self._deadline is not None and self._deadline != inf:
+            timeout = max(self._deadline - time.perf_counter(), 0)
+        _, not_done = wait(futures, timeout)
+        if not_done:  # the workers stop searching at the deadline too
+            for future in not_done:
+                future.cancel()
+            raise SearchAborted
+        return [future.result() for future in futures]
+
+    def _search_shared_move(
+        self,
+        move: MoveT,
+        board: BoardT,
+        depth: int,
+        is_min_turn: bool,
+        deadline: float | None,
+        search_id: int,
+        pv_hints: dict[int, MoveT],
+    ) -> RootMoveResult:
+        """Search one root move in a worker, just below the shared best score."""
+        if search_id != self._search_id:
+            self._search_id = search_id
+            self._reset_ordering()
+            if self.tt is not None:
+                self.tt.new_search()
+        self._pv_hints = pv_hints
+        if deadline is not None:
+            self._deadline = time.perf_counter() + deadline - time.time()
+        nodes, horizon_hits = self._nodes, self._horizon_hits
+        stats = self._stats = SearchStats() if self.collect_stats else None
+        if stats is not None and self.tt is not None:
+            stats.tt_hits, stats.tt_misses = -self.tt.hits, -self.tt.misses
+
+        bound = _tie_bound(self._shared_alpha.value)
+        board.push(move)
+        try:
+            value = -self.alpha_beta(
+                board, depth - 1, -inf, -bound, is_min_turn=not is_min_turn, ply=1
+            )
+        finally:
+            board.pop()
+            self._deadline = None
+            self._stats = None
+
+        if stats is not None and self.tt is not None:
+            stats.tt_hits += self.tt.hits
+            stats.tt_misses += self.tt.misses
+
+        if value > bound:  # exact score
+            with self._shared_alpha.get_lock():
+                self._shared_alpha.value = max(self._shared_alpha.value, value)
+        return RootMoveResult(
+            value,
+            self._pv_table[1],
+            self._nodes - nodes,
+            self._horizon_hits - horizon_hits,
+            stats,
+        )
+
+    def start_workers(self) -> None:
+        """Start the worker processes of a parallel engine, if not started yet.
+
+        `search` starts them before its clock, so a move's time budget is never
+        spent on them; calling this before the game also saves the first move's
+        wait for them.
+        """
+        if self.workers > 1:
+            self._start_pool()
+
+    def _start_pool(self) -> ProcessPoolExecutor:
+        """Start the worker processes and wait until every one is set up."""
+        if self._pool is None:
+            context = multiprocessing.get_context("spawn")
+            self._shared_alpha = context.Value("d", -inf)
+            self._pool = ProcessPoolExecutor(
+                self.workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(self, self._shared_alpha),
+            )
+            # Each task that finds no idle worker spawns one
+            wait([self._pool.submit(_worker_ready) for _ in range(self.workers)])
+        return self._pool
+
+    def close(self) -> None:
+        """Stop pondering, and shut down the worker processes of a parallel engine."""
+        self.stop_pondering()
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Drop the worker pool and pondering thread, which cannot be sent to other processes."""
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        state["_ponder_thread"] = None
+        state["_shared_alpha"] = None
+        return state
+
+    def _iterative_deepening(
+        self, board: BoardT, is_min_turn: bool, deadline: float, max_depth: int
+    ) -> tuple[MoveT | None, float]:
+        """Search depth 1, 2, 3... up to ``max_depth`` until ``deadline`` passes.
+
+        Each iteration tries the previous iteration's principal variation first.
+
+        Returns:
+            tuple[MoveT | None, float]: Best move and value of the deepest completed
+                iteration.
+        """
+        start = time.perf_counter()
+        self._deadline = deadline
+        best: tuple[MoveT | None, float] = (None, -inf)
+        try:
+            for depth in range(1, max_depth + 1):
+                horizon_hits = self._horizon_hits
+                depth_start = time.perf_counter()
+                depth_nodes = self._stats.nodes if self._stats is not None else 0
+                best = self._aspiration_search(board, depth, is_min_turn, best[1])
+                self._record_depth(depth, depth_start, depth_nodes)
+                self._pv_hints = self._collect_pv_hints(board, self._pv_table[0])
+                if self._dbg:
+                    print(
+                        f"Depth {depth}: best move {best[0]}, value {best[1]},"
+                        f" {time.perf_counter() - start:.3f}s"
+                    )
+                if self._horizon_hits == horizon_hits or abs(best[1]) == inf:
+                    break  # game tree solved, deeper iterations change nothing
+        except SearchAborted:
+            pass
+        finally:
+            self._deadline = None
+            self._pv_hints = {}
+        return best
+
+    def _aspiration_search(
+        self, board: BoardT, depth: int, is_min_turn: bool, previous: float
+    ) -> tuple[MoveT | None, float]:
+        """Search the root, first within the aspiration window around ``previous``.
+
+        A score outside the window is only a bound, so the root is then searched
+        again with the full window.
+        """
+        window = self.aspiration_window
+        if window is not None and self.workers == 1 and abs(previous) != inf:
+            best_move, value = self._search_root(
+                board, depth, is_min_turn, previous - window, previous + window
+            )
+            if best_move is not None and value < previous + window:
+                return best_move, value
+            if self._stats is not None:
+                self._stats.aspiration_researches += 1
+        return self._search_root(board, depth, is_min_turn)
+
+    @staticmethod
+    def _collect_pv_hints(board: BoardT, pv: tuple[MoveT, ...]) -> dict[int, MoveT]:
+        """Map the Zobrist key of every position along ``pv`` to its PV move."""
+        hints = {}
+        for move in pv:
+            hints[board.zobrist_key] = move
+            board.push(move)
+        for _ in pv:
+            board.pop()
+        return hints
@@ -0,0 +1,359 @@
+"""Monte Carlo Tree Search engine, an alternative to the Negamax search.
+
+Authors: Trevor Arcieri and Demetri Karras
+Course: CS 481 Artificial Intelligence
+Term: Spring 2025
+Project: DualBoard Negamax AI
+"""
+
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from math import inf, log, sqrt, tanh
+from typing import Any, Generic
+
+from ai_project.board import AbstractBoard, AbstractPlayer, MoveT
+from ai_project.engine import AbstractEngine, BoardT, SearchResult
+from ai_project.stats import SearchStats
+
+ITERATIONS_PER_LEVEL = 500  # iterations per difficulty level of the games
+
+_worker_mcts: Any = None  # the engine of a root-parallel worker process
+
+
+def _init_mcts_worker(engine: "MctsEngine") -> None:
+    """Set up a worker process with its own copy of the engine."""
+    global _worker_mcts
+    _worker_mcts = engine
+
+
+def _search_fresh_tree(
+    board: AbstractBoard, time_budget_ms: float | None, seed: int
+) -> tuple[dict[Any, tuple[int, float]], int, int]:
+    """Search a new tree in a worker process; see `MctsEngine._grow`.
+
+    The time budget is passed instead of a deadline, as processes do not share
+    perf_counter.
+
+    Returns:
+        tuple[dict[Any, tuple[int, float]], int, int]: The visits and total
+            reward of each root move, the playouts and the nodes created.
+    """
+    engine = _worker_mcts
+    engine._rng = random.Random(seed)
+    deadline = None
+    if time_budget_ms is not None:
+        deadline = time.perf_counter() + time_budget_ms / 1000
+    root = MctsNode(None, None, board.zobrist_key, engine._untried(board))
+    nodes = engine._grow(root, board, deadline)
+    return (
+        {child.move: (child.visits, child.reward) for child in root.children},
+        root.visits,
+        nodes,
+    )
+
+
+class MctsNode:
+    """A position in the search tree, reached by ``move`` from ``parent``.
+
+    ``reward`` sums the playout results from the point of view of the player
+    who made ``move``: 1 for a win, 0.5 for a draw and 0 for a loss.
+    """
+
+    __slots__ = ("move", "parent", "key", "untried", "children", "visits", "reward")
+
+    def __init__(
+        self, move: Any, parent: "MctsNode | None", key: int, untried: list
+    ) -> None:
+        """Initialize an unvisited node whose moves are all still ``untried``."""
+        self.move = move
+        self.parent = parent
+        self.key = key  # Zobrist key of the position
+        self.untried = untried  # moves not expanded yet, the next one last
+        self.children: list[MctsNode] = []
+        self.visits = 0
+        self.reward = 0.0
+
+    def size(self) -> int:
+        """Number of nodes in the subtree of this node."""
+        return 1 + sum(child.size() for child in self.children)
+
+
+class MctsEngine(Generic[BoardT, MoveT]):
+    """Chooses moves by Monte Carlo Tree Search with UCT.
+
+    The game specific parts come from a Negamax ``engine``: its move ordering
+    decides the order in which moves are expanded and guides the playouts, its
+    terminal scores score finished games, and its evaluation scores playouts
+    cut off after ``playout_plies``, and its ``randomness`` plays random moves
+    instead of searching. It offers the same `get_best_move` and `search` as
+    the engine, on the same kinds of boards, so the games can use either.
+    """
+
+    def __init__(
+        self,
+        engine: AbstractEngine[BoardT, MoveT],
+        *,
+        iterations: int = 1000,
+        time_budget_ms: float | None = None,
+        exploration: float = sqrt(2),
+        prior_weight: float = 0.5,
+        playout_plies: int = 40,
+        evaluation_scale: float = 10.0,
+        reuse_tree: bool = True,
+        workers: int = 1,
+        collect_stats: bool = False,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize the engine.
+
+        Every search runs ``iterations`` playouts, or as many as fit in
+        ``time_budget_ms`` if it is set. ``exploration`` is the UCT constant.
+        Playouts play the first move of ``engine.get_ordered_moves`` with
+        probability ``prior_weight`` and a random move otherwise; playouts still
+        going after ``playout_plies`` are scored by ``engine.evaluate``, as a
+        win probability that changes fastest within ``evaluation_scale`` of 0.
+        With ``reuse_tree``, the subtree of the position reached by the engine's
+        move and the opponent's reply is kept for the next search. With
+        ``workers`` above 1, as many trees are searched at once, all but one by a
+        pool of processes started on the first search, and their root visits are
+        added up.
+        """
+        if iterations < 1:
+            raise ValueError("iterations must be at least 1")
+        if time_budget_ms is not None and time_budget_ms <= 0:
+            raise ValueError("time_budget_ms must be positive")
+        if exploration < 0:
+            raise ValueError("exploration must be non-negative")
+        if not 0 <= prior_weight <= 1:
+            raise ValueError("prior_weight must be in 0...1")
+        if playout_plies < 0:
+            raise ValueError("playout_plies must be non-negative")
+        if evaluation_scale <= 0:
+            raise ValueError("evaluation_scale must be positive")
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+
+        self.engine = engine
+        self.iterations = iterations
+        self.time_budget_ms = time_budget_ms
+        self.exploration = exploration
+        self.prior_weight = prior_weight
+        self.playout_plies = playout_plies
+        self.evaluation_scale = evaluation_scale
+        self.reuse_tree = reuse_tree
+        self.workers = workers
+        self.collect_stats = collect_stats
+        self._rng = random.Random(seed)
+        self._root: MctsNode | None = None  # tree of the last search
+        self._pool: ProcessPoolExecutor | None = None
+
+    def get_best_move(self, board: Any) -> Any:
+        """Get the most visited move of the search.
+
+        Args:
+            board (AbstractBoard[Move]): The current board state, of any kind
+                the Negamax engine accepts.
+
+        Returns:
+            Move: The best move for the current player.
+        """
+        return self.search(board).move
+
+    def search(self, board: Any) -> SearchResult:
+        """Search for the best move, like `get_best_move`, and report statistics."""
+        search_board = self.engine.to_search_board(board)
+        move, stats = self._search(search_board)
+        return SearchResult(self.engine.to_game_move(move, board), stats)
+
+    def start_pondering(self, board: Any, move: Any) -> None:
+        """Do nothing: the tree kept by ``reuse_tree`` plays this part."""
+
+    def close(self) -> None:
+        """Shut down the worker processes, if any."""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Drop the worker pool and the tree, which workers do not need."""
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        state["_root"] = None
+        return state
+
+    def _search(self, board: BoardT) -> SearchResult[MoveT]:
+        """Search the board the Negamax engine would search."""
+        stats = SearchStats() if self.collect_stats else None
+        random_move = self.engine._maybe_random_root_move(board)
+        if random_move is not None:
+            return SearchResult(random_move, stats)
+        probed = self.engine.probe_root(board, stats)
+        if probed is not None:
+            return SearchResult(probed, stats)
+        if board.game_over:
+            raise ValueError("No valid moves found")
+
+        start = time.perf_counter()
+        deadline = None
+        if self.time_budget_ms is not None:
+            deadline = start + self.time_budget_ms / 1000
+        root = self._reused_root(board)
+        reused_visits = root.visits
+        futures = []
+        if self.workers > 1:
+            pool = self._start_pool()
+            futures = [
+                pool.submit(
+                    _search_fresh_tree,
+                    board,
+                    self.time_budget_ms,
+                    self._rng.getrandbits(64),
+                )
+                for _ in range(self.workers - 1)
+            ]
+        nodes = self._grow(root, board, deadline)
+        playouts = root.visits - reused_visits
+
+        visits = {child.move: child.visits for child in root.children}
+        for future in futures:
+            children, worker_playouts, worker_nodes = future.result()
+            for move, (child_visits, _) in children.items():
+                visits[move] = visits.get(move, 0) + child_visits
+            playouts += worker_playouts
+            nodes += worker_nodes
+        move = max(visits, key=visits.__getitem__)
+        self._root = root
+
+        if stats is not None:
+            stats.nodes = nodes
+            stats.playouts = playouts
+            stats.reused_visits = reused_visits
+            stats.seconds = time.perf_counter() - start
+        return SearchResult(move, stats)
+
+    def _start_pool(self) -> ProcessPoolExecutor:
+        """Start the worker processes on the first root-parallel search."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                self.workers - 1,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_mcts_worker,
+                initargs=(self,),
+            )
+        return self._pool
+
+    def _reused_root(self, board: BoardT) -> MctsNode:
+        """The node of the last tree for ``board``, else a new root.
+
+        The engine's own move and the opponent's reply are looked for among the
+        first two plies of the last tree, by Zobrist key.
+        """
+        if self.reuse_tree and self._root is not None:
+            for child in (self._root, *self._root.children):
+                for node in (child, *child.children):
+                    if node.key == board.zobrist_key:
+                        node.parent = None
+                        node.move = None
+                        return node
+        self._root = None
+        return MctsNode(None, None, board.zobrist_key, self._untried(board))
+
+    def _untried(self, board: BoardT) -> list[MoveT]:
+        """Moves of a new node, to be expanded in `get_ordered_moves` order."""
+        if board.game_over:
+            return []
+        is_min_turn = board.turn.value == AbstractPlayer.MIN
+        return self.engine.get_ordered_moves(board, is_min_turn=is_min_turn)[::-1]
+
+    def _grow(self, root: MctsNode, board: BoardT, deadline: float | None) -> int:
+        """Run playouts from ``root`` until the budget is spent.
+
+        Returns:
+            int: Number of nodes added to the tree.
+        """
+        nodes = iterations = 0
+        while True:
+            if deadline is None:
+                if iterations == self.iterations:
+                    break
+            elif iterations and time.perf_counter() > deadline:
+                break
+            nodes += self._iterate(root, board)
+            iterations += 1
+        return nodes
+
+    def _iterate(self, root: MctsNode, board: BoardT) -> int:
+        """Select a leaf by UCT, expand it, play it out and back up the result.
+
+        Returns:
+            int: Number of nodes added to the tree (0 or 1).
+        """
+        node = root
+        pushed = 0
+        while not node.untried and node.children:
+            node = self._select(node)
+            board.push(node.move)
+            pushed += 1
+        added = 0
+        if node.untried:
+            move = node.untried.pop()
+            board.push(move)
+            pushed += 1
+            child = MctsNode(move, node, board.zobrist_key, self._untried(board))
+            node.children.append(child)
+            node = child
+            added = 1
+
+        reward = 1 - self._playout(board)  # for the player who moved into node
+        for _ in range(pushed):
+            board.pop()
+        while node is not None:
+            node.visits += 1
+            node.reward += reward
+            reward = 1 - reward
+            node = node.parent
+        return added
+
+    def _select(self, node: MctsNode) -> MctsNode:
+        """The child of ``node`` with the highest upper confidence bound."""
+        scale = self.exploration * sqrt(log(node.visits))
+        best, best_bound = node.children[0], -inf
+        for child in node.children:
+            bound = child.reward / child.visits + scale / sqrt(child.visits)
+            if bound > best_bound:
+                best, best_bound = child, bound
+        return best
+
+    def _playout(self, board: BoardT) -> float:
+        """Play on from ``board`` and score the result for its side to move."""
+        plies = 0
+        rng = self._rng
+        try:
+            while plies < self.playout_plies:
+                if board.game_over:
+                    return self._terminal_reward(board, plies)
+                is_min_turn = board.turn.value == AbstractPlayer.MIN
+                moves = self.engine.get_ordered_moves(board, is_min_turn=is_min_turn)
+                if rng.random() < self.prior_weight:
+                    board.push(moves[0])
+                else:
+                    board.push(rng.choice(moves))
+                plies += 1
+            if board.game_over:
+                return self._terminal_reward(board, plies)
+            score = self.engine.evaluate(board)  # positive for the min player
+            if board.turn.value != AbstractPlayer.MIN:
+                score = -score
+            reward = 0.5 + 0.5 * tanh(score / (2 * self.evaluation_scale))  # logistic
+            return reward if plies % 2 == 0 else 1 - reward
+        finally:
+            for _ in range(plies):
+                board.pop()
+
+    def _terminal_reward(self, board: BoardT, plies: int) -> float:
+        """Score a finished playout for the side to move ``plies`` before it."""
+        score = self.engine.terminal_score(board)
+        reward = 0.5 if score == 0 else 1.0 if score > 0 else 0.0
+        return reward if plies % 2 == 0 else 1 - reward
@@ -0,0 +1,241 @@
+"""Board of the m,n,k-game: k in a row on an m by n grid, like tic-tac-toe.
+
+Authors: Trevor Arcieri and Demetri Karras
+Course: CS 481 Artificial Intelligence
+Term: Spring 2025
+Project: DualBoard Negamax AI
+"""
+
+from collections.abc import Generator
+from functools import cache
+from typing import NamedTuple
+
+from ai_project.engine import AbstractBoard, AbstractPlayer
+from ai_project.tic_tac_toe.bitboard import OPPONENT
+from ai_project.tic_tac_toe.board import TttMark, TttPlayer
+from ai_project.transposition import ZOBRIST_TURN, zobrist_table
+
+type MnkMove = int  # cell index, row * cols + column
+
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))  # row and column steps of a line
+LINE_BASE = 10  # value of a line grows by this factor for each more mark in it
+
+
+class MnkGeometry(NamedTuple):
+    """Tables shared by all boards of the same shape.
+
+    Lines are the k cells long windows of a row, column or diagonal, and the
+    mark counts of a line are kept as one code, ``X marks * (k + 1) + O marks``.
+    """
+
+    cell_lines: tuple[tuple[int, ...], ...]  # lines through each cell
+    num_lines: int
+    neighbourhood: tuple[int, ...]  # mask of the cells near each cell
+    centrality: tuple[int, ...]  # higher for cells closer to the center
+    x_delta: tuple[int, ...]  # change in line value as X marks a line of a code
+    o_delta: tuple[int, ...]  # same for an O mark
+    zobrist: list[list[int]]  # keys indexed by [cell][0 for X, 1 for O]
+
+
+def line_value(x_marks: int, o_marks: int) -> int:
+    """Value of a line for O: ``LINE_BASE ** marks`` if only one player has marks."""
+    if x_marks and o_marks:
+        return 0
+    if o_marks:
+        return LINE_BASE**o_marks
+    if x_marks:
+        return -(LINE_BASE**x_marks)
+    return 0
+
+
+@cache
+def mnk_geometry(rows: int, cols: int, k: int, radius: int) -> MnkGeometry:
+    """Build the tables of an ``rows`` by ``cols`` board with lines of ``k``."""
+    cell_lines: list[list[int]] = [[] for _ in range(rows * cols)]
+    num_lines = 0
+    for row in range(rows):
+        for col in range(cols):
+            for row_step, col_step in DIRECTIONS:
+                end_row = row + row_step * (k - 1)
+                end_col = col + col_step * (k - 1)
+                if not (0 <= end_row < rows and 0 <= end_col < cols):
+                    continue
+                for i in range(k):
+                    cell = (row + row_step * i) * cols + col + col_step * i
+                    cell_lines[cell].append(num_lines)
+                num_lines += 1
+
+    neighbourhood = tuple(
+        sum(
+            1 << (r * cols + c)
+            for r in range(max(row - radius, 0), min(row + radius + 1, rows))
+            for c in range(max(col - radius, 0), min(col + radius + 1, cols))
+        )
+        for row in range(rows)
+        for col in range(cols)
+    )
+    centrality = tuple(
+        -abs(2 * row - rows + 1) - abs(2 * col - cols + 1)
+        for row in range(rows)
+        for col in range(cols)
+    )
+    codes = [(x, o) for x in range(k + 1) for o in range(k + 1)]
+    x_delta = tuple(
+        line_value(x + 1, o) - line_value(x, o) if x < k else 0 for x, o in codes
+    )
+    o_delta = tuple(
+        line_value(x, o + 1) - line_value(x, o) if o < k else 0 for x, o in codes
+    )
+    return MnkGeometry(
+        tuple(map(tuple, cell_lines)),
+        num_lines,
+        neighbourhood,
+        centrality,
+        x_delta,
+        o_delta,
+        zobrist_table(rows * cols, 2),
+    )
+
+
+class MnkBoard(AbstractBoard[MnkMove]):
+    """Board of the m,n,k-game, where X and O take turns to get k marks in a row.
+
+    The mark counts of every line are kept up to date by ``push``/``pop``, along
+    with the `evaluate` score, so a move only touches the lines through its cell:
+    a win is found by checking those lines, and the cost of a move does not grow
+    with the board. `candidate_moves` restricts the moves worth searching to the
+    empty cells within ``radius`` of a mark.
+    """
+
+    def __init__(self, rows: int = 15, cols: int = 15, k: int = 5, radius: int = 2):
+        """Initialize an empty ``rows`` by ``cols`` board with lines of ``k``."""
+        if rows < 1 or cols < 1:
+            raise ValueError("rows and cols must be at least 1")
+        if not 1 <= k <= max(rows, cols):
+            raise ValueError("k must be in 1...max(rows, cols)")
+        if radius < 1:
+            raise ValueError("radius must be at least 1")
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        self.radius = radius
+        self.num_cells = rows * cols
+        self.geometry = mnk_geometry(rows, cols, k, radius)
+        self._codes = [0] * self.geometry.num_lines  # mark counts of each line
+        self._stack: list[tuple[MnkMove, int, int, AbstractPlayer | None]] = []
+        self.x_mask = 0
+        self.o_mask = 0
+        self.near_mask = 0  # cells within ``radius`` of a mark
+        self.score = 0  # sum of `line_value` over all lines, positive for O
+        self.winner: AbstractPlayer | None = None
+        self.turn = AbstractPlayer(TttPlayer.x)
+        self.zobrist_key = 0
+
+    def __str__(self):
+        """Return a string representation of the board."""
+        marks = [mark.value if mark != TttMark.blank else "." for mark in self]
+        return "\n".join(
+            " ".join(marks[row * self.cols : (row + 1) * self.cols])
+            for row in range(self.rows)
+        )
+
+    def __getitem__(self, item: MnkMove) -> TttMark:
+        """Get the mark at the specified cell."""
+        if self.x_mask >> item & 1:
+            return TttMark.x
+        if self.o_mask >> item & 1:
+            return TttMark.o
+        return TttMark.blank
+
+    def __iter__(self):
+        """Iterate over the board marks."""
+        return (self[i] for i in range(self.num_cells))
+
+    @property
+    def is_win_loss(self) -> bool:
+        """Check if the last move completed a line."""
+        return self.winner is not None
+
+    @property
+    def is_draw(self) -> bool:
+        """Check if the board is full without a completed line."""
+        return self.winner is None and len(self._stack) == self.num_cells
+
+    @property
+    def game_over(self) -> bool:
+        """Returns `True` if the game is over."""
+        return self.winner is not None or len(self._stack) == self.num_cells
+
+    @property
+    def legal_moves(self) -> Generator[MnkMove, None, None]:
+        """All legal moves for the current player: the empty cells."""
+        yield from _cells((1 << self.num_cells) - 1 & ~(self.x_mask | self.o_mask))
+
+    def legal_move_list(self) -> list[MnkMove]:
+        """Legal moves of the current position, not cached like `TttBitboard`'s."""
+        self.movegen_calls += 1
+        return list(self.legal_moves)
+
+    def candidate_moves(self) -> list[MnkMove]:
+        """Empty cells within ``radius`` of a mark, or the center if there is none.
+
+        Moves further away are legal but never better in practice, and leaving
+        them out keeps the branching factor independent of the board size.
+        """
+        self.movegen_calls += 1
+        if not self._stack:
+            return [self.rows // 2 * self.cols + self.cols // 2]
+        return list(_cells(self.near_mask & ~(self.x_mask | self.o_mask)))
+
+    def push(self, move: MnkMove) -> None:
+        """Apply a move to the board, updating the lines through its cell."""
+        geometry = self.geometry
+        self._stack.append((move, self.near_mask, self.score, self.winner))
+        codes = self._codes
+        if self.turn == TttPlayer.x:
+            self.x_mask |= 1 << move
+            self.zobrist_key ^= geometry.zobrist[move][0] ^ ZOBRIST_TURN
+            delta, step, win = geometry.x_delta, self.k + 1, self.k * (self.k + 1)
+            for line in geometry.cell_lines[move]:
+                code = codes[line]
+                self.score += delta[code]
+                codes[line] = code = code + step
+                if code >= win:
+                    self.winner = self.turn
+        else:
+            self.o_mask |= 1 << move
+            self.zobrist_key ^= geometry.zobrist[move][1] ^ ZOBRIST_TURN
+            delta, k = geometry.o_delta, self.k
+            for line in geometry.cell_lines[move]:
+                code = codes[line]
+                self.score += delta[code]
+                codes[line] = code = code + 1
+                if code % (k + 1) == k:
+                    self.winner = self.turn
+        self.near_mask |= geometry.neighbourhood[move]
+        self.turn = OPPONENT[self.turn]
+
+    def pop(self) -> None:
+        """Undo the last move applied to the board."""
+        move, self.near_mask, self.score, self.winner = self._stack.pop()
+        self.turn = OPPONENT[self.turn]
+        geometry = self.geometry
+        codes = self._codes
+        if self.turn == TttPlayer.x:
+            self.x_mask &= ~(1 << move)
+            self.zobrist_key ^= geometry.zobrist[move][0] ^ ZOBRIST_TURN
+            step = self.k + 1
+        else:
+            self.o_mask &= ~(1 << move)
+            self.zobrist_key ^= geometry.zobrist[move][1] ^ ZOBRIST_TURN
+            step = 1
+        for line in geometry.cell_lines[move]:
+            codes[line] -= step
+
+
+def _cells(mask: int) -> Generator[MnkMove, None, None]:
+    """Indices of the set bits of ``mask``, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
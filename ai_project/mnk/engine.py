@@ -0,0 +1,34 @@
+"""m,n,k-game AI engine using Negamax and Alpha-Beta Pruning.
+
+Authors: Trevor Arcieri and Demetri Karras
+Course: CS 481 Artificial Intelligence
+Term: Spring 2025
+Project: DualBoard Negamax AI
+"""
+
+from ai_project.engine import AbstractEngine
+from ai_project.mnk.board import MnkBoard, MnkMove
+
+
+class MnkEngine(AbstractEngine[MnkBoard, MnkMove]):
+    """Class for the m,n,k-game AI engine using Negamax and Alpha-Beta Pruning.
+
+    Works on boards of any size: evaluation reads the score the board keeps up
+    to date, and only the board's candidate moves are searched.
+    """
+
+    def evaluate(self, board: MnkBoard) -> int:
+        """Evaluate the board state.
+
+        Every line without marks of both players is worth ``LINE_BASE`` to the
+        power of its marks, positive for O and negative for X, like
+        `TttEngine.evaluate` on a 3 by 3 board.
+        """
+        return board.score
+
+    def get_ordered_moves(
+        self, board: MnkBoard, *, is_min_turn: bool = False
+    ) -> list[MnkMove]:
+        """Get the candidate moves, the most central first."""
+        centrality = board.geometry.centrality
+        return sorted(board.candidate_moves(), key=centrality.__getitem__, reverse=True)
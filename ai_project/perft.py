@@ -0,0 +1,241 @@
+"""Perft: count the leaf nodes of the legal move tree to validate move generation.
+
+Authors: Trevor Arcieri and Demetri Karras
+Course: CS 481 Artificial Intelligence
+Term: Spring 2025
+Project: DualBoard Negamax AI
+"""
+
+import argparse
+import copy
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from ai_project.board import AbstractBoard
+
+# Named perft positions. Checkers positions are (white men, white kings, black
+# men, black kings, turn) masks of `CheckersBitboard`, tic-tac-toe positions the
+# moves played from the empty board.
+POSITIONS: dict[str, dict[str, tuple[int, ...]]] = {
+    "checkers": {
+        "start": (0xFFF00000, 0x0, 0xFFF, 0x0, -1),
+        "midgame": (0xD7B00010, 0x0, 0x484AC7, 0x0, -1),
+        "kings": (0x095D8200, 0x1, 0x258C8, 0x20000000, -1),
+    },
+    "tic-tac-toe": {
+        "start": (),
+        "center": (4,),
+        "corners": (0, 8, 4, 2),
+    },
+}
+
+# Known-correct perft counts at depth 1, 2, ... of every position, shared by all
+# board backends. Checkers follows `py-draughts`' american rules, where captures
+# are optional and every prefix of a jump chain is a move. Tic-tac-toe perft
+# keeps filling the board after a line is completed.
+KNOWN_COUNTS: dict[str, dict[str, list[int]]] = {
+    "checkers": {
+        "start": [7, 49, 379, 2872, 23582, 190647, 1607272, 13412443],
+        "midgame": [9, 78, 677, 5883, 51772, 461822],
+        "kings": [9, 73, 635, 4859, 43197, 333807],
+    },
+    "tic-tac-toe": {
+        "start": [9, 72, 504, 3024, 15120, 60480, 181440, 362880, 362880],
+        "center": [8, 56, 336, 1680, 6720, 20160, 40320, 40320],
+        "corners": [5, 20, 60, 120, 120],
+    },
+}
+
+_worker_cache: dict[tuple[int, int], int] | None = None  # a worker's perft cache
+
+
+def perft(
+    board: AbstractBoard,
+    depth: int,
+    *,
+    bulk: bool = True,
+    cache: dict[tuple[int, int], int] | None = None,
+) -> int:
+    """Count the move sequences of length ``depth`` from the current position.
+
+    Args:
+        board (AbstractBoard): The position to count from; restored on return.
+        depth (int): Number of plies to expand.
+        bulk (bool): Count the moves at the last ply instead of making them.
+        cache (dict[tuple[int, int], int] | None): Counts by Zobrist key and
+            depth, to reuse across transpositions.
+
+    Returns:
+        int: Number of leaf nodes at ``depth``.
+    """
+    if depth == 0:
+        return 1
+    moves = board.legal_move_list()
+    if bulk and depth == 1:
+        return len(moves)
+    if cache is not None:
+        key = (board.zobrist_key, depth)
+        if key in cache:
+            return cache[key]
+    nodes = 0
+    for move in moves:
+        board.push(move)
+        nodes += perft(board, depth - 1, bulk=bulk, cache=cache)
+        board.pop()
+    if cache is not None:
+        cache[board.zobrist_key, depth] = nodes
+    return nodes
+
+
+def _perft_child(board: AbstractBoard, depth: int, bulk: bool, use_cache: bool) -> int:
+    """Run `perft` in a worker process, keeping its cache across root moves."""
+    global _worker_cache
+    if use_cache and _worker_cache is None:
+        _worker_cache = {}
+    return perft(board, depth, bulk=bulk, cache=_worker_cache if use_cache else None)
+
+
+def divide(
+    board: AbstractBoard,
+    depth: int,
+    *,
+    bulk: bool = True,
+    use_cache: bool = False,
+    workers: int = 1,
+) -> list[tuple[str, int]]:
+    """Count the leaf nodes below each root move, like `perft` of ``depth``.
+
+    With ``workers`` above 1, the root moves are counted in a pool of processes,
+    each with its own cache.
+
+    Returns:
+        list[tuple[str, int]]: Each root move and its count, in move order.
+    """
+    if depth < 1:
+        raise ValueError("depth must be at least 1")
+    if workers == 1:
+        cache = {} if use_cache else None
+        counts = []
+        for move in board.legal_move_list():
+            board.push(move)
+            counts.append((str(move), perft(board, depth - 1, bulk=bulk, cache=cache)))
+            board.pop()
+        return counts
+
+    names, children = [], []
+    for move in board.legal_move_list():
+        board.push(move)
+        names.append(str(move))
+        children.append(copy.deepcopy(board))
+        board.pop()
+    with ProcessPoolExecutor(workers) as pool:
+        counts = pool.map(
+            _perft_child, children, repeat(depth - 1), repeat(bulk), repeat(use_cache)
+        )
+        return list(zip(names, counts, strict=True))
+
+
+def make_board(game: str, backend: str, position: str = "start") -> AbstractBoard:
+    """Create a named position of ``game`` (see `POSITIONS`) on a board backend."""
+    setup = POSITIONS[game][position]
+    if game == "tic-tac-toe":
+        from ai_project.tic_tac_toe.bitboard import TttBitboard
+        from ai_project.tic_tac_toe.board import TttBoard
+
+        board = TttBitboard() if backend == "bitboard" else TttBoard()
+        for move in setup:
+            board.push(move)
+        return board
+    from ai_project.checkers.bitboard import CheckersBitboard
+    from ai_project.engine import AbstractPlayer
+
+    white_men, white_kings, black_men, black_kings, turn = setup
+    bitboard = CheckersBitboard(
+        white_men, white_kings, black_men, black_kings, AbstractPlayer(turn)
+    )
+    return bitboard if backend == "bitboard" else bitboard.to_draughts()
+
+
+def main() -> None:
+    """Print perft counts and speed, optionally validating or cross-checking them."""
+    parser = argparse.ArgumentParser(
+        description="Perft move generation counter",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "-g", "--game", choices=["checkers", "tic-tac-toe"], default="checkers"
+    )
+    parser.add_argument(
+        "-b",
+        "--backend",
+        choices=["bitboard", "draughts"],
+        default="bitboard",
+        help="Board backend (draughts: py-draughts, or the list board for tic-tac-toe)",
+    )
+    parser.add_argument(
+        "-p",
+        "--position",
+        default="start",
+        help=f"Named position: {', '.join(POSITIONS['checkers'])} for"
+        f" checkers, {', '.join(POSITIONS['tic-tac-toe'])} for tic-tac-toe",
+    )
+    parser.add_argument("-d", "--depth", type=int, default=6, help="Maximum depth")
+    parser.add_argument(
+        "--divide", action="store_true", help="Print the count of each root move"
+    )
+    parser.add_argument(
+        "--no-bulk",
+        action="store_true",
+        help="Make the moves of the last ply instead of counting them",
+    )
+    parser.add_argument(
+        "--hash", action="store_true", help="Reuse the counts of transpositions"
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=1, help="Processes counting root moves"
+    )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="Compare the counts with the known-correct ones",
+    )
+    parser.add_argument(
+        "--cross-check",
+        action="store_true",
+        help="Compare the bitboard against the reference board at every depth",
+    )
+    args = parser.parse_args()
+    if args.position not in POSITIONS[args.game]:
+        parser.error(f"unknown {args.game} position {args.position!r}")
+
+    known = KNOWN_COUNTS[args.game][args.position]
+    backends = ["bitboard", "draughts"] if args.cross_check else [args.backend]
+    for depth in range(1, args.depth + 1):
+        counts = []
+        for backend in backends:
+            board = make_board(args.game, backend, args.position)
+            start = time.perf_counter()
+            moves = divide(
+                board,
+                depth,
+                bulk=not args.no_bulk,
+                use_cache=args.hash,
+                workers=args.workers,
+            )
+            elapsed = time.perf_counter() - start
+            nodes = sum(count for _, count in moves)
+            counts.append(nodes)
+            if args.divide and depth == args.depth:
+                for move, count in moves:
+                    print(f"{move}: {count}")
+            print(
+                f"{backend:>8} depth {depth}: {nodes} nodes in {elapsed:.3f}s"
+                f" ({nodes / max(elapsed, 1e-9):,.0f} nodes/s)"
+            )
+        if len(set(counts)) > 1:
+            raise SystemExit(f"Mismatch at depth {depth}: {counts}")
+        if args.validate and depth <= len(known) and counts[0] != known[depth - 1]:
+            raise SystemExit(
+                f"Depth {depth}: {counts[0]} nodes, expected {known[depth - 1]}"
+            )
@@ -0,0 +1,357 @@
+"""Asyncio engine service searching moves for many concurrent games.
+
+Authors: Trevor Arcieri and Demetri Karras
+Course: CS 481 Artificial Intelligence
+Term: Spring 2025
+Project: DualBoard Negamax AI
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Self
+
+from ai_project.arena import GAMES, PERCENTILES, EngineConfig, make_engine, percentile
+from ai_project.board import AbstractBoard
+from ai_project.engine import SearchResult
+from ai_project.perft import make_board
+
+DEADLINE_GRACE_S = 1.0  # time past a deadline before an unanswered request fails
+
+_service_engine: Any = None  # the engine of a service worker process
+_cancel_flags: list[Any] = []  # cancel flag of each request slot, shared by workers
+
+
+class ServiceBusy(Exception):
+    """Raised when a request finds every slot of the service taken."""
+
+
+def _init_service_worker(game: str, config: EngineConfig, cancel_flags: list) -> None:
+    """Set up a worker process with its own engine."""
+    global _service_engine, _cancel_flags
+    _service_engine = make_engine(game, config)
+    _cancel_flags = cancel_flags
+
+
+def _serve(
+    board: AbstractBoard, slot: int, deadline: float | None
+) -> SearchResult | None:
+    """Search a request in a worker process; ``None`` if it was cancelled.
+
+    With a ``deadline`` (wall clock time, as processes do not share
+    perf_counter), the search stops by then if it has not ended before.
+    """
+    flag = _cancel_flags[slot]
+    if flag.value:
+        return None
+    time_limit_ms = None
+    if deadline is not None:
+        time_limit_ms = max(deadline - time.time(), 1e-3) * 1000
+    return _service_engine.search_cancellable(board, flag, time_limit_ms)
+
+
+class EngineService:
+    """Searches moves for many independent games on a pool of engine processes.
+
+    Every request takes one of ``max_pending`` slots until its search ends, so at
+    most ``max_pending`` requests are queued or running; further requests wait
+    for a slot, or fail with `ServiceBusy` if they must not wait. A request with
+    a deadline is answered by then with the best move found so far, and a
+    cancelled request stops its search.
+
+    Use as an async context manager, or call `start` and `close`.
+    """
+
+    def __init__(
+        self,
+        game: str,
+        config: EngineConfig,
+        *,
+        workers: int = 1,
+        max_pending: int | None = None,
+    ) -> None:
+        """Initialize the service; ``max_pending`` defaults to 4 per worker."""
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if max_pending is None:
+            max_pending = 4 * workers
+        if max_pending < workers:
+            raise ValueError("max_pending must be at least workers")
+        self.game = game
+        self.config = config
+        self.workers = workers
+        self.max_pending = max_pending
+        self.cancelled = 0  # requests cancelled before their search ended
+        self.rejected = 0  # requests refused with ServiceBusy
+        self._pool: ProcessPoolExecutor | None = None
+        self._cancel_flags: list[Any] = []
+        self._free_slots: list[int] = []
+        self._slots: asyncio.Semaphore | None = None
+
+    async def __aenter__(self) -> Self:
+        """Start the worker processes."""
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Shut down the worker processes."""
+        self.close()
+
+    @property
+    def pending(self) -> int:
+        """Number of requests queued or being searched."""
+        return self.max_pending - len(self._free_slots)
+
+    def start(self) -> None:
+        """Start the worker processes; call from the event loop's thread."""
+        if self._pool is not None:
+            return
+        context = multiprocessing.get_context("spawn")
+        self._cancel_flags = [context.RawValue("b", 0) for _ in range(self.max_pending)]
+        self._free_slots = list(range(self.max_pending))
+        self._slots = asyncio.Semaphore(self.max_pending)
+        self._pool = ProcessPoolExecutor(
+            self.workers,
+            mp_context=context,
+            initializer=_init_service_worker,
+            initargs=(self.game, self.config, self._cancel_flags),
+        )
+
+    def close(self) -> None:
+        """Cancel every request and shut down the worker processes."""
+        if self._pool is None:
+            return
+        for flag in self._cancel_flags:
+            flag.value = 1
+        self._pool.shutdown(cancel_futures=True)
+        self._pool = None
+
+    async def best_move(
+        self,
+        board: AbstractBoard,
+        *,
+        deadline_ms: float | None = None,
+        wait: bool = True,
+    ) -> SearchResult:
+        """Search the best move of ``board`` in a worker process.
+
+        Args:
+            board (AbstractBoard): The position to search; not modified.
+            deadline_ms (float | None): Time from now, including any wait for a
+                slot, by which the move is needed. The engine searches to its own
+                depth or time budget, and stops early at the deadline.
+            wait (bool): Wait for a free slot instead of raising `ServiceBusy`.
+
+        Returns:
+            SearchResult: The best move and its search statistics.
+
+        Raises:
+            ServiceBusy: If every slot is taken and ``wait`` is false.
+            TimeoutError: If no slot frees up before the deadline, or no answer
+                arrives soon after it.
+        """
+        if self._pool is None or self._slots is None:
+            raise RuntimeError("the service is not started")
+        deadline = None if deadline_ms is None else time.time() + deadline_ms / 1000
+        if not wait and self._slots.locked():
+            self.rejected += 1
+            raise ServiceBusy(f"all {self.max_pending} slots are taken")
+        timeout = None if deadline is None else deadline - time.time()
+        await asyncio.wait_for(self._slots.acquire(), timeout)
+
+        slot = self._free_slots.pop()
+        flag = self._cancel_flags[slot]
+        flag.value = 0
+        try:
+            future = self._pool.submit(_serve, board, slot, deadline)
+        except BaseException:  # e.g. a broken pool: no callback will free the slot
+            self._release(slot)
+            raise
+        loop = asyncio.get_running_loop()
+        future.add_done_callback(
+            lambda _: loop.call_soon_threadsafe(self._release, slot)
+        )
+        try:
+            if deadline is not None:
+                timeout = deadline - time.time() + DEADLINE_GRACE_S
+            result = await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except (asyncio.CancelledError, TimeoutError):
+            self._cancel(future, flag)
+            raise
+        if result is None:  # cancelled by close
+            raise asyncio.CancelledError
+        return result
+
+    def _cancel(self, future: Future, flag: Any) -> None:
+        """Cancel a request, stopping its search if it already started."""
+        flag.value = 1
+        future.cancel()
+        self.cancelled += 1
+
+    def _release(self, slot: int) -> None:
+        """Free the slot of a request whose search ended."""
+        self._free_slots.append(slot)
+        if self._slots is not None:
+            self._slots.release()
+
+
+async def play_client(
+    service: EngineService,
+    seed: int,
+    *,
+    opening_plies: int,
+    max_plies: int,
+    deadline_ms: float | None,
+    cancel_rate: float,
+) -> dict[str, Any]:
+    """Play one game with the service moving both sides.
+
+    Each request is cancelled with probability ``cancel_rate`` after a random
+    delay, as if its player had left, and then the game ends. Requests that time
+    out are repeated.
+
+    Returns:
+        dict[str, Any]: The latency of each answered move, the number of timed
+            out requests, and whether the game ended with a cancellation.
+    """
+    rng = random.Random(seed)
+    board = make_board(service.game, "bitboard")
+    for _ in range(opening_plies):
+        if board.game_over:
+            break
+        board.push(rng.choice(board.legal_move_list()))
+
+    seconds: list[float] = []
+    timeouts = 0
+    while not board.game_over and len(seconds) < max_plies:
+        start = time.perf_counter()
+        request = asyncio.ensure_future(
+            service.best_move(board, deadline_ms=deadline_ms)
+        )
+        if rng.random() < cancel_rate:
+            await asyncio.sleep(rng.random() * 0.05)
+            request.cancel()
+        try:
+            move, _ = await request
+        except asyncio.CancelledError:
+            return {"seconds": seconds, "timeouts": timeouts, "cancelled": True}
+        except TimeoutError:
+            timeouts += 1
+            continue
+        seconds.append(time.perf_counter() - start)
+        board.push(move)
+    return {"seconds": seconds, "timeouts": timeouts, "cancelled": False}
+
+
+async def simulate(
+    service: EngineService,
+    games: int,
+    *,
+    seed: int = 0,
+    opening_plies: int = 4,
+    max_plies: int = 20,
+    deadline_ms: float | None = None,
+    cancel_rate: float = 0.0,
+) -> dict[str, Any]:
+    """Play ``games`` concurrent games against a started service.
+
+    Returns:
+        dict[str, Any]: Throughput and latency percentiles of the answered moves.
+    """
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(
+            play_client(
+                service,
+                seed + i,
+                opening_plies=opening_plies,
+                max_plies=max_plies,
+                deadline_ms=deadline_ms,
+                cancel_rate=cancel_rate,
+            )
+            for i in range(games)
+        )
+    )
+    elapsed = time.perf_counter() - start
+    seconds = [latency for result in results for latency in result["seconds"]]
+    return {
+        "games": games,
+        "moves": len(seconds),
+        "seconds": elapsed,
+        "moves_per_second": len(seconds) / elapsed if elapsed else 0.0,
+        **{
+            f"latency_p{pct}_ms": percentile(seconds, pct) * 1000 for pct in PERCENTILES
+        },
+        "latency_max_ms": max(seconds, default=0.0) * 1000,
+        "timeouts": sum(result["timeouts"] for result in results),
+        "cancelled_games": sum(result["cancelled"] for result in results),
+    }
+
+
+async def _run(args: argparse.Namespace) -> dict[str, Any]:
+    """Start a service and play the simulated games against it."""
+    config = EngineConfig(args.depth, tt_size_mb=args.hash_size)
+    async with EngineService(
+        args.game, config, workers=args.workers, max_pending=args.max_pending
+    ) as service:
+        return await simulate(
+            service,
+            args.games,
+            seed=args.seed,
+            opening_plies=args.opening_plies,
+            max_plies=args.max_plies,
+            deadline_ms=args.deadline,
+            cancel_rate=args.cancel_rate,
+        )
+
+
+def main() -> None:
+    """Simulate many concurrent games against a local engine service."""
+    parser = argparse.ArgumentParser(
+        description="Simulate concurrent games against the engine service",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("-g", "--game", choices=GAMES, default="checkers")
+    parser.add_argument("-n", "--games", type=int, default=200, help="Concurrent games")
+    parser.add_argument("-d", "--depth", type=int, default=4, help="Search depth")
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        help="Deadline of each move request, including its wait in the queue",
+        metavar="MS",
+    )
+    parser.add_argument(
+        "--hash-size",
+        type=float,
+        default=16.0,
+        help="Transposition table size of each worker",
+        metavar="MB",
+    )
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Engine processes")
+    parser.add_argument(
+        "--max-pending",
+        type=int,
+        default=None,
+        help="Requests queued or searched at once (default: 4 per worker)",
+        metavar="N",
+    )
+    parser.add_argument(
+        "--cancel-rate",
+        type=float,
+        default=0.0,
+        help="Probability that a client cancels a request and leaves",
+    )
+    parser.add_argument("-s", "--seed", type=int, default=0, help="First game seed")
+    parser.add_argument(
+        "--opening-plies", type=int, default=4, help="Random moves before searching"
+    )
+    parser.add_argument(
+        "--max-plies", type=int, default=20, help="Engine moves per game"
+    )
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(_run(args)), indent=2))
@@ -0,0 +1,214 @@
+"""Search statistics collected by the engines.
+
+Authors: Trevor Arcieri and Demetri Karras
+Course: CS 481 Artificial Intelligence
+Term: Spring 2025
+Project: DualBoard Negamax AI
+"""
+
+import json
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+
+def _bump(counts: list[int], index: int, amount: int = 1) -> None:
+    """Add ``amount`` to ``counts[index]``, growing the list as needed."""
+    if index >= len(counts):
+        counts.extend([0] * (index + 1 - len(counts)))
+    counts[index] += amount
+
+
+@dataclass
+class DepthStats:
+    """Statistics of one completed search depth.
+
+    Attributes:
+        depth (int): The depth searched.
+        seconds (float): Time spent on this depth alone.
+        nodes (int): Nodes searched at this depth alone.
+    """
+
+    depth: int
+    seconds: float
+    nodes: int
+
+
+@dataclass
+class SearchStats:
+    """Statistics of a single `get_best_move` search.
+
+    Per-ply lists are indexed by distance from the root.
+
+    Attributes:
+        nodes (int): Nodes visited, the root included.
+        leaf_evals (int): Calls to ``evaluate`` at the search horizon.
+        quiescence_nodes (int): Nodes searched beyond the horizon by the
+            quiescence search, included in ``nodes``.
+        tt_cutoffs (int): Nodes answered by the transposition table.
+        tt_hits (int): Transposition table probes that found their position.
+        tt_misses (int): Transposition table probes that did not.
+        beta_cutoffs (int): Nodes whose search stopped early on a beta cutoff.
+        pvs_researches (int): Null-window searches that had to be repeated with
+            the full window.
+        aspiration_researches (int): Iterations whose score fell outside the
+            aspiration window and that were searched again.
+        search_draws (int): Positions scored as drawn by repetition or lack of
+            progress inside the search tree.
+        lmr_reductions (int): Late moves searched one ply shallower first.
+        lmr_researches (int): Reduced moves that had to be searched again at
+            full depth.
+        futility_prunes (int): Quiet moves skipped by futility pruning.
+        razorings (int): Positions near the horizon scored without a search by
+            razoring.
+        cutoff_move_index (list[int]): Number of beta cutoffs by the index of the
+            move that caused it, in search order.
+        nodes_per_ply (list[int]): Nodes visited at each ply.
+        expanded_per_ply (list[int]): Nodes at each ply whose moves were searched.
+        moves_per_ply (list[int]): Legal moves of the expanded nodes at each ply.
+        depths (list[DepthStats]): Completed depths, in the order searched.
+        ponder_hits (int): Searches answered by pondering on the opponent's time.
+        ponder_misses (int): Pondering searches cancelled as the opponent played
+            another move.
+        ponder_seconds_saved (float): Search time spent while pondering, before
+            the opponent's move was known.
+        playouts (int): Monte Carlo playouts run by `MctsEngine`.
+        reused_visits (int): Visits of the Monte Carlo tree kept from the last
+            search.
+        book_hits (int): Root positions answered by the opening book.
+        tablebase_hits (int): Root positions answered by the endgame database.
+        seconds (float): Total search time.
+        score (float | None): Value of the chosen move for the side to move, if
+            it was searched.
+    """
+
+    nodes: int = 0
+    leaf_evals: int = 0
+    quiescence_nodes: int = 0
+    tt_cutoffs: int = 0
+    tt_hits: int = 0
+    tt_misses: int = 0
+    beta_cutoffs: int = 0
+    pvs_researches: int = 0
+    aspiration_researches: int = 0
+    search_draws: int = 0
+    lmr_reductions: int = 0
+    lmr_researches: int = 0
+    futility_prunes: int = 0
+    razorings: int = 0
+    cutoff_move_index: list[int] = field(default_factory=list)
+    nodes_per_ply: list[int] = field(default_factory=list)
+    expanded_per_ply: list[int] = field(default_factory=list)
+    moves_per_ply: list[int] = field(default_factory=list)
+    depths: list[DepthStats] = field(default_factory=list)
+    ponder_hits: int = 0
+    ponder_misses: int = 0
+    ponder_seconds_saved: float = 0.0
+    playouts: int = 0
+    reused_visits: int = 0
+    book_hits: int = 0
+    tablebase_hits: int = 0
+    seconds: float = 0.0
+    score: float | None = None
+
+    def count_node(self, ply: int) -> None:
+        """Count a node visited at ``ply``."""
+        self.nodes += 1
+        _bump(self.nodes_per_ply, ply)
+
+    def count_quiescence_node(self) -> None:
+        """Count a node visited by the quiescence search."""
+        self.nodes += 1
+        self.quiescence_nodes += 1
+
+    def count_expansion(self, ply: int, num_moves: int) -> None:
+        """Count a node at ``ply`` whose ``num_moves`` moves are about to be searched."""
+        _bump(self.expanded_per_ply, ply)
+        _bump(self.moves_per_ply, ply, num_moves)
+
+    def count_cutoff(self, move_index: int) -> None:
+        """Count a beta cutoff caused by the move searched at ``move_index``."""
+        self.beta_cutoffs += 1
+        _bump(self.cutoff_move_index, move_index)
+
+    def merge(self, other: "SearchStats") -> None:
+        """Add the counters of ``other``, e.g. from a worker process, to these."""
+        self.nodes += other.nodes
+        self.leaf_evals += other.leaf_evals
+        self.quiescence_nodes += other.quiescence_nodes
+        self.tt_cutoffs += other.tt_cutoffs
+        self.tt_hits += other.tt_hits
+        self.tt_misses += other.tt_misses
+        self.beta_cutoffs += other.beta_cutoffs
+        self.pvs_researches += other.pvs_researches
+        self.aspiration_researches += other.aspiration_researches
+        self.search_draws += other.search_draws
+        self.lmr_reductions += other.lmr_reductions
+        self.lmr_researches += other.lmr_researches
+        self.futility_prunes += other.futility_prunes
+        self.razorings += other.razorings
+        self.ponder_hits += other.ponder_hits
+        self.ponder_misses += other.ponder_misses
+        self.ponder_seconds_saved += other.ponder_seconds_saved
+        self.playouts += other.playouts
+        self.reused_visits += other.reused_visits
+        self.book_hits += other.book_hits
+        self.tablebase_hits += other.tablebase_hits
+        for mine, theirs in (
+            (self.cutoff_move_index, other.cutoff_move_index),
+            (self.nodes_per_ply, other.nodes_per_ply),
+            (self.expanded_per_ply, other.expanded_per_ply),
+            (self.moves_per_ply, other.moves_per_ply),
+        ):
+            for i, count in enumerate(theirs):
+                _bump(mine, i, count)
+
+    @property
+    def nodes_per_second(self) -> float:
+        """Search speed over the whole search."""
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+    @property
+    def ponder_hit_rate(self) -> float:
+        """Fraction of pondering searches whose predicted move was played."""
+        pondered = self.ponder_hits + self.ponder_misses
+        return self.ponder_hits / pondered if pondered else 0.0
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        """Fraction of beta cutoffs caused by the first move searched."""
+        if not self.beta_cutoffs:
+            return 0.0
+        return self.cutoff_move_index[0] / self.beta_cutoffs
+
+    @property
+    def branching_factors(self) -> list[float]:
+        """Average legal moves of the expanded nodes at each ply."""
+        return [
+            moves / expanded
+            for moves, expanded in zip(self.moves_per_ply, self.expanded_per_ply)
+            if expanded
+        ]
+
+    @property
+    def effective_branching_factors(self) -> list[float]:
+        """Average children actually searched per expanded node at each ply."""
+        return [
+            children / expanded
+            for children, expanded in zip(self.nodes_per_ply[1:], self.expanded_per_ply)
+            if expanded
+        ]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the statistics, derived values included, as a plain dict."""
+        return {
+            **asdict(self),
+            "nodes_per_second": self.nodes_per_second,
+            "first_move_cutoff_rate": self.first_move_cutoff_rate,
+            "ponder_hit_rate": self.ponder_hit_rate,
+            "branching_factors": self.branching_factors,
+            "effective_branching_factors": self.effective_branching_factors,
+        }
+
+    def to_json(self, **kwargs: Any) -> str:
+        """Serialize `to_dict` to JSON; ``kwargs`` are passed to `json.dumps`."""
+        return json.dumps(self.to_dict(), **kwargs)
@@ -0,0 +1,148 @@
+"""Bitboard tic-tac-toe board representation.
+
+Authors: Trevor Arcieri and Demetri Karras
+Course: CS 481 Artificial Intelligence
+Term: Spring 2025
+Project: DualBoard Negamax AI
+"""
+
+from collections.abc import Generator
+
+from ai_project.engine import AbstractBoard, AbstractPlayer
+from ai_project.tic_tac_toe.board import (
+    LINE_MASKS,
+    ZOBRIST_MARKS,
+    TttMark,
+    TttMove,
+    TttPlayer,
+)
+from ai_project.transposition import ZOBRIST_TURN
+
+FULL_MASK = 0b111_111_111  # bit i is set when position i holds a mark
+
+# IS_WIN[mask] tells whether the marks in ``mask`` complete a winning line
+IS_WIN = [
+    any(mask & line == line for line in LINE_MASKS) for mask in range(FULL_MASK + 1)
+]
+
+OPPONENT = {
+    AbstractPlayer.MAX: AbstractPlayer.MIN,
+    AbstractPlayer.MIN: AbstractPlayer.MAX,
+}
+
+
+class TttBitboard(AbstractBoard[TttMove]):
+    """Tic-tac-toe board stored as one 9-bit mask per player.
+
+    A drop-in replacement for `TttBoard` with the same indexing, iteration and
+    printing API. Win detection is a table lookup, the draw test a popcount, and
+    the game-over state is cached and refreshed by ``push``/``pop``.
+    """
+
+    def __init__(self):
+        """Initialize the tic-tac-toe board."""
+        self._stack = []
+        self.x_mask = 0
+        self.o_mask = 0
+        self.turn = AbstractPlayer(TttPlayer.x)
+        self.zobrist_key = 0
+        self._update_state()
+
+    def __str__(self):
+        """Return a string representation of the board."""
+        marks = list(self)
+        return "\n".join([
+            " | ".join(marks[i : i + 3]) + "   " + " | ".join(map(str, range(i, i + 3)))
+            for i in range(0, 9, 3)
+        ])
+
+    def __getitem__(self, item: TttMove) -> TttMark:
+        """Get the mark at the specified position."""
+        if self.x_mask >> item & 1:
+            return TttMark.x
+        if self.o_mask >> item & 1:
+            return TttMark.o
+        return TttMark.blank
+
+    def __setitem__(self, key: TttMove, value: TttMark) -> None:
+        """Set the mark at the specified position."""
+        for mark in (self[key], value):
+            if mark != TttMark.blank:
+                self.zobrist_key ^= ZOBRIST_MARKS[key][mark == TttMark.o]
+        bit = 1 << key
+        self.x_mask = self.x_mask | bit if value == TttMark.x else self.x_mask & ~bit
+        self.o_mask = self.o_mask | bit if value == TttMark.o else self.o_mask & ~bit
+        self._update_state()
+
+    def __iter__(self):
+        """Iterate over the board marks."""
+        return (self[i] for i in range(9))
+
+    def reset(self) -> None:
+        """Reset the board to its initial state."""
+        self.__init__()
+
+    def _update_state(self) -> None:
+        """Refresh the cached win, draw and game-over flags."""
+        self._is_win_loss = IS_WIN[self.x_mask] or IS_WIN[self.o_mask]
+        self._is_draw = (
+            not self._is_win_loss and (self.x_mask | self.o_mask).bit_count() == 9
+        )
+        self._game_over = self._is_win_loss or self._is_draw
+
+    @property
+    def is_draw(self) -> bool:
+        """Check if the game is a draw."""
+        return self._is_draw
+
+    @property
+    def is_win_loss(self) -> bool:
+        """Check if the game is a win or loss."""
+        return self._is_win_loss
+
+    @property
+    def game_over(self) -> bool:
+        """Returns `True` if the game is over."""
+        return self._game_over
+
+    @property
+    def legal_moves(self) -> Generator[TttMove, None, None]:
+        """All legal moves for the current player."""
+        empty = FULL_MASK & ~(self.x_mask | self.o_mask)
+        while empty:
+            low = empty & -empty
+            yield low.bit_length() - 1
+            empty ^= low
+
+    def legal_move_list(self) -> list[TttMove]:
+        """Legal moves of the current position.
+
+        Not cached: the game-over test never needs them here, and a bit scan is
+        cheaper than keeping a cache in sync.
+        """
+        self.movegen_calls += 1
+        return list(self.legal_moves)
+
+    def push(self, move: TttMove) -> None:
+        """Apply a move to the board."""
+        if self.turn == TttPlayer.x:
+            self.x_mask |= 1 << move
+            self.zobrist_key ^= ZOBRIST_MARKS[move][0] ^ ZOBRIST_TURN
+        else:
+            self.o_mask |= 1 << move
+            self.zobrist_key ^= ZOBRIST_MARKS[move][1] ^ ZOBRIST_TURN
+        self.turn = OPPONENT[self.turn]
+        self._stack.append(move)
+        self._update_state()
+
+    def pop(self) -> None:
+        """Undo the last move applied to the board."""
+        move = self._stack.pop()
+        self.turn = OPPONENT[self.turn]
+        if self.turn == TttPlayer.x:
+            self.x_mask &= ~(1 << move)
+            self.zobrist_key ^= ZOBRIST_MARKS[move][0] ^ ZOBRIST_TURN
+        else:
+            self.o_mask &= ~(1 << move)
+            self.zobrist_key ^= ZOBRIST_MARKS[move][1] ^ ZOBRIST_TURN
+        self._update_state()
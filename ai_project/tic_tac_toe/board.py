@@ -10,6 +10,7 @@ from collections.abc import Generator
 from enum import Enum, IntEnum
 
 from ai_project.engine import AbstractBoard, AbstractPlayer
+from ai_project.transposition import ZOBRIST_TURN, zobrist_table
 
 type TttMove = int
 
@@ -44,6 +45,10 @@ WINNING_LINES = [
     (2, 4, 6),
 ]
 
+LINE_MASKS = [sum(1 << i for i in line) for line in WINNING_LINES]  # as bitmasks
+
+ZOBRIST_MARKS = zobrist_table(9, 2)  # keys indexed by [position][0 for X, 1 for O]
+
 
 class TttBoard(AbstractBoard[TttMove]):
     """Class for tic-tac-toe board representation."""
@@ -55,6 +60,8 @@ class TttBoard(AbstractBoard[TttMove]):
             TttMark.blank for _ in range(9)
         ]  # 3x3 board represented as a flat list
         self.turn = AbstractPlayer(TttPlayer.x)
+        self.zobrist_key = 0
+        self._legal_move_cache = None
 
     def __str__(self):
         """Return a string representation of the board."""
@@ -71,7 +78,11 @@ class TttBoard(AbstractBoard[TttMove]):
 
     def __setitem__(self, key: TttMove, value: TttMark) -> None:
         """Set the mark at the specified position."""
+        for mark in (self._board[key], value):
+            if mark != TttMark.blank:
+                self.zobrist_key ^= ZOBRIST_MARKS[key][mark == TttMark.o]
         self._board[key] = value
+        self._legal_move_cache = None
 
     def __iter__(self):
         """Iterate over the board marks."""
@@ -81,6 +92,16 @@ class TttBoard(AbstractBoard[TttMove]):
         """Reset the board to its initial state."""
         self.__init__()
 
+    @property
+    def x_mask(self) -> int:
+        """Bitmask of the positions holding an X."""
+        return sum(1 << i for i, s in enumerate(self._board) if s == TttMark.x)
+
+    @property
+    def o_mask(self) -> int:
+        """Bitmask of the positions holding an O."""
+        return sum(1 << i for i, s in enumerate(self._board) if s == TttMark.o)
+
     @property
     def legal_moves(self) -> Generator[TttMove, None, None]:
         """All legal moves for the current player."""
@@ -91,7 +112,7 @@ class TttBoard(AbstractBoard[TttMove]):
     @property
     def is_draw(self) -> bool:
         """Check if the game is a draw."""
-        return not list(self.legal_moves) and not self.is_win_loss
+        return not self.has_legal_moves and not self.is_win_loss
 
     @property
     def is_win_loss(self) -> bool:
@@ -113,12 +134,17 @@ class TttBoard(AbstractBoard[TttMove]):
 
     def push(self, move: TttMove) -> None:
         """Apply a move to the board."""
-        self._board[move] = TttMark.x if self.turn == TttPlayer.x else TttMark.o
+        is_x = self.turn == TttPlayer.x
+        self._board[move] = TttMark.x if is_x else TttMark.o
+        self.zobrist_key ^= ZOBRIST_MARKS[move][not is_x] ^ ZOBRIST_TURN
         self.turn = AbstractPlayer(-self.turn.value)
         self._stack.append(move)
+        self._legal_move_cache = None
 
     def pop(self) -> None:
         """Undo the last move applied to the board."""
         move = self._stack.pop()
         self.turn = AbstractPlayer(-self.turn.value)
+        self.zobrist_key ^= ZOBRIST_MARKS[move][self.turn != TttPlayer.x] ^ ZOBRIST_TURN
         self._board[move] = TttMark.blank
+        self._legal_move_cache = None
@@ -6,8 +6,17 @@ Term: Spring 2025
 Project: DualBoard Negamax AI
 """
 
+from math import floor
+from typing import Any, NamedTuple
+
+import numpy as np
+
 from ai_project.engine import AbstractEngine
-from ai_project.tic_tac_toe.board import WINNING_LINES, TttBoard, TttMark, TttMove
+from ai_project.stats import SearchStats
+from ai_project.tic_tac_toe.bitboard import TttBitboard
+from ai_project.tic_tac_toe.board import LINE_MASKS, TttBoard, TttMove
+from ai_project.tic_tac_toe.solver import SolvedTable, plies_to_end
+from ai_project.weights import load_weights
 
 NUM_MARKS_VALUES = [
     0,
@@ -27,30 +36,132 @@ POS_PRI = [
 ]  # Priority for each position in the board, corners > edges > center
 
 
-class TttEngine(AbstractEngine[TttBoard, TttMove]):
+class TttWeights(NamedTuple):
+    """Values of a line with one or two marks of one player, as in `NUM_MARKS_VALUES`."""
+
+    one_mark: float = NUM_MARKS_VALUES[1]
+    two_marks: float = NUM_MARKS_VALUES[2]
+
+
+LINE_MATRIX = np.array([
+    [line >> position & 1 for line in LINE_MASKS] for position in range(9)
+])  # LINE_MATRIX[position][line] is 1 if the line goes through the position
+
+
+class TttEngine(AbstractEngine[TttBoard | TttBitboard, TttMove]):
     """Class for the Tic-tac-toe AI engine using Negamax and Alpha-Beta Pruning."""
 
-    def evaluate(self, board: TttBoard) -> int:
-        """Evaluate the board state."""
+    def __init__(
+        self,
+        depth: int,
+        *,
+        table: SolvedTable | str | None = None,
+        weights: TttWeights | str | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize the engine, optionally answering moves from a solved table.
+
+        ``table`` is a `SolvedTable` or the path of one, loaded (or solved and
+        saved, if missing) on the first move. ``weights`` replaces the values of
+        `NUM_MARKS_VALUES`, e.g. with a file written by the ``tune`` command.
+        Other arguments are those of `AbstractEngine`.
+        """
+        super().__init__(depth, **kwargs)
+        self.table = table
+        if isinstance(weights, str):
+            weights = load_weights(weights, TttWeights)
+        self.weights = weights or TttWeights()
+        self._mark_values = [NUM_MARKS_VALUES[0], *self.weights]
+
+    def probe_root(
+        self, board: TttBoard | TttBitboard, stats: SearchStats | None
+    ) -> TttMove | None:
+        """Pick a move from the solved table instead of searching.
+
+        Like a search of ``depth`` plies, wins and losses further away than that
+        are not seen and count as draws; the move is drawn at random from the
+        best moves seen. With a time budget, play is perfect.
+        """
+        if self.table is None:
+            return None
+        if isinstance(self.table, str):
+            self.table = SolvedTable.load_or_solve(self.table)
+        scores = self.table.move_scores(board.x_mask, board.o_mask)
+        if not scores:
+            return None
+        if self.time_budget_ms is None:
+            scores = {
+                move: score if (plies_to_end(score) or 0) <= self.depth else 0
+                for move, score in scores.items()
+            }
+        best = max(scores.values())
+        if stats is not None:
+            stats.tablebase_hits += 1
+        return self._rng.choice([
+            move for move, score in scores.items() if score == best
+        ])
+
+    def evaluate(self, board: TttBoard | TttBitboard) -> int:
+        """Evaluate the board state, rounded down if the weights are not whole."""
+        values = self._mark_values
         score = 0
+        x_mask, o_mask = board.x_mask, board.o_mask
 
         # Add to score based on number of marks in winning lines
-        for line in WINNING_LINES:
-            line_str = "".join(board[i] for i in line)
-            num_o = line_str.count(TttMark.o)
-            num_x = line_str.count(TttMark.x)
+        for line in LINE_MASKS:
+            num_o = (o_mask & line).bit_count()
+            num_x = (x_mask & line).bit_count()
             if num_x == 0:
-                score += NUM_MARKS_VALUES[num_o]
+                score += values[num_o]
             if num_o == 0:
-                score -= NUM_MARKS_VALUES[num_x]
+                score -= values[num_x]
+
+        return floor(score)
+
+    def encode(self, board: TttBoard | TttBitboard) -> tuple[int, ...]:
+        """Encode a position as its X and O masks."""
+        return board.x_mask, board.o_mask
+
+    def evaluate_batch(self, positions: np.ndarray) -> np.ndarray:
+        """Evaluate encoded positions like `evaluate`, counting marks per line."""
+        num_x, num_o = self._line_marks(positions)
+        values = np.array(self._mark_values)
+        scores = (
+            np.where(num_x == 0, values[num_o], 0)
+            - np.where(num_o == 0, values[num_x], 0)
+        ).sum(axis=1)
+        return np.floor(scores).astype(np.int64)
+
+    def feature_batch(self, positions: np.ndarray) -> np.ndarray:
+        """Count the lines with one and two marks of only O, minus those of X.
+
+        The counts are in the order of `TttWeights`, of which `evaluate` is the
+        dot product with them.
+        """
+        num_x, num_o = self._line_marks(positions)
+        return np.stack(
+            [
+                ((num_x == 0) & (num_o == marks)).sum(axis=1)
+                - ((num_o == 0) & (num_x == marks)).sum(axis=1)
+                for marks in (1, 2)
+            ],
+            axis=1,
+        ).astype(np.float64)
 
-        return score
+    @staticmethod
+    def _line_marks(positions: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Count the X and the O marks in every line of encoded positions."""
+        bits = np.unpackbits(
+            positions.astype("<u2").view(np.uint8), axis=1, bitorder="little"
+        ).reshape(len(positions), 2, 16)[:, :, :9]
+        num_x, num_o = (bits @ LINE_MATRIX).transpose(1, 0, 2)
+        return num_x, num_o
 
     def get_ordered_moves(
-        self, board: TttBoard, *, is_min_turn: bool = False
+        self, board: TttBoard | TttBitboard, *, is_min_turn: bool = False
     ) -> list[TttMove]:
         """Get legal moves ordered by their potential effectiveness."""
         return sorted(
-            board.legal_moves,
+            board.legal_move_list(),
             key=lambda move: -POS_PRI[move],
         )
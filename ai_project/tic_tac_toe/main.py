@@ -7,20 +7,16 @@ Project: DualBoard Negamax AI
 """
 
 import random
+from collections.abc import Callable
 
-from ai_project.tic_tac_toe.board import TttBoard, TttPlayer
+from ai_project.mcts import ITERATIONS_PER_LEVEL, MctsEngine
+from ai_project.tic_tac_toe.bitboard import TttBitboard
+from ai_project.tic_tac_toe.board import TttPlayer
 from ai_project.tic_tac_toe.engine import TttEngine
-from ai_project.utils import parse_args
+from ai_project.utils import append_stats, parse_args
 
-args = parse_args()
 
-board = TttBoard()
-engine = TttEngine(
-    depth=args.difficulty * 2, randomness=args.randomness, debug=args.debug
-)
-
-
-def handle_game_over(board: TttBoard) -> None:
+def handle_game_over(board: TttBitboard) -> None:
     """Handle the end of the game."""
     if board.is_win_loss:
         print(f"Game over. Winner: {TttPlayer(-board.turn.value)}!")
@@ -41,7 +37,7 @@ def get_user_choice() -> str:
         print("Invalid choice. Please try again.")
 
 
-def get_move_input() -> int:
+def get_move_input(board: TttBitboard) -> int:
     """Get a valid move input from the user."""
     while True:
         try:
@@ -54,14 +50,16 @@ def get_move_input() -> int:
     return move
 
 
-def handle_user_choice(choice: str) -> None:
+def handle_user_choice(
+    choice: str, board: TttBitboard, get_engine_move: Callable[[], int]
+) -> None:
     """Handle the user choice for the next action."""
     match choice:
         case "m":
-            move = get_move_input()
+            move = get_move_input(board)
             board.push(move)
         case "e":
-            move = engine.get_best_move(board)
+            move = get_engine_move()
             print(f"Engine chose move: {move}")
             board.push(move)
         case "u":
@@ -74,7 +72,7 @@ def handle_user_choice(choice: str) -> None:
             while not board.game_over:
                 print(board)
                 print(f"Current turn: {TttPlayer(board.turn.value)}")
-                move = engine.get_best_move(board)
+                move = get_engine_move()
                 print(f"Engine chose move: {move}")
                 board.push(move)
         case "r":
@@ -89,6 +87,46 @@ def handle_user_choice(choice: str) -> None:
 
 def main():
     """Main function to run the tic-tac-toe server."""
+    args = parse_args()
+    board = TttBitboard()
+    engine = TttEngine(
+        depth=args.difficulty * 2,
+        time_budget_ms=args.time_budget_ms,
+        randomness=args.randomness,
+        debug=args.debug,
+        tt_size_mb=args.tt_size_mb,
+        workers=args.workers,
+        collect_stats=args.stats_path is not None,
+        pvs=args.pvs,
+        aspiration_window=args.aspiration_window,
+        quiescence_nodes=args.quiescence_nodes,
+        lmr_moves=args.lmr_moves,
+        futility_margin=args.futility_margin,
+        razor_margin=args.razor_margin,
+        table=args.table_path,
+        weights=args.weights_path,
+        ponder=args.ponder,
+    )
+    if args.mcts:
+        engine = MctsEngine(
+            engine,
+            iterations=ITERATIONS_PER_LEVEL * args.difficulty,
+            time_budget_ms=args.time_budget_ms,
+            exploration=args.exploration,
+            workers=args.workers,
+            collect_stats=args.stats_path is not None,
+        )
+    else:
+        engine.start_workers()  # spares the first move the workers' start-up
+
+    def get_engine_move() -> int:
+        """Search for the engine's move, recording its statistics if requested."""
+        move, stats = engine.search(board)
+        if args.stats_path is not None and stats is not None:
+            append_stats(args.stats_path, stats)
+        engine.start_pondering(board, move)
+        return move
+
     while True:
         print(board)
 
@@ -97,7 +135,8 @@ def main():
 
         print(f"Current turn: {TttPlayer(board.turn.value)}")
         try:
-            handle_user_choice(get_user_choice())
+            handle_user_choice(get_user_choice(), board, get_engine_move)
         except KeyboardInterrupt:
             print("\nGame interrupted. Exiting...")
             break
+    engine.close()
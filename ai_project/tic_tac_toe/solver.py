@@ -0,0 +1,160 @@
+"""Perfect-play table of every reachable tic-tac-toe position.
+
+Authors: Trevor Arcieri and Demetri Karras
+Course: CS 481 Artificial Intelligence
+Term: Spring 2025
+Project: DualBoard Negamax AI
+"""
+
+import argparse
+import os
+from typing import Self
+
+import numpy as np
+
+from ai_project.tic_tac_toe.bitboard import FULL_MASK, IS_WIN
+from ai_project.tic_tac_toe.board import TttMove
+
+WIN_SCORE = 10  # score of a won game; every ply until the end of the game costs 1
+ILLEGAL = -128  # score of an occupied position
+
+ROTATION = (6, 3, 0, 7, 4, 1, 8, 5, 2)  # position i takes the mark of ROTATION[i]
+REFLECTION = (2, 1, 0, 5, 4, 3, 8, 7, 6)
+
+
+def _symmetries() -> list[tuple[int, ...]]:
+    """The 8 symmetries of the board, as position permutations like `ROTATION`."""
+    symmetries = []
+    perm = tuple(range(9))
+    for _ in range(4):
+        symmetries += [perm, tuple(perm[REFLECTION[i]] for i in range(9))]
+        perm = tuple(perm[ROTATION[i]] for i in range(9))
+    return symmetries
+
+
+SYMMETRIES = _symmetries()
+
+# PERMUTED[s][mask] is ``mask`` transformed by the symmetry ``SYMMETRIES[s]``
+PERMUTED = [
+    [
+        sum(1 << i for i in range(9) if mask >> perm[i] & 1)
+        for mask in range(FULL_MASK + 1)
+    ]
+    for perm in SYMMETRIES
+]
+
+
+def canonical(x_mask: int, o_mask: int) -> tuple[int, tuple[int, ...]]:
+    """Return the smallest key of a position over all symmetries, and its symmetry.
+
+    The key is ``x_mask << 9 | o_mask`` of the transformed position; position
+    ``i`` of the transformed board is position ``perm[i]`` of the given one.
+    """
+    return min(
+        (permuted[x_mask] << 9 | permuted[o_mask], perm)
+        for permuted, perm in zip(PERMUTED, SYMMETRIES, strict=True)
+    )
+
+
+def plies_to_end(score: int) -> int | None:
+    """Plies until a won or lost game ends under perfect play; ``None`` for draws."""
+    return WIN_SCORE - abs(score) if score else None
+
+
+class SolvedTable:
+    """Score of every move of every reachable position, up to symmetry.
+
+    Scores are from the point of view of the side to move: ``WIN_SCORE`` minus the
+    plies until the end of the game for a win (as fast as possible), its negation
+    for a loss (as slow as possible), and 0 for a draw.
+    """
+
+    DTYPE = np.dtype([("key", "<u4"), ("scores", "i1", (9,))])
+
+    def __init__(self, records: np.ndarray) -> None:
+        """Initialize the table from its records, one per non-terminal position."""
+        if records.dtype != self.DTYPE:
+            raise ValueError(f"records must have dtype {self.DTYPE}")
+        self.records = records
+        self._scores = {
+            int(key): scores.tolist()
+            for key, scores in zip(records["key"], records["scores"], strict=True)
+        }
+
+    def __len__(self) -> int:
+        """Return the number of positions in the table."""
+        return len(self.records)
+
+    @classmethod
+    def solve(cls) -> Self:
+        """Solve every position reachable from the empty board by negamax."""
+        rows: dict[int, list[int]] = {}
+        _solve(0, 0, {}, rows)
+        records = np.array(sorted(rows.items()), dtype=cls.DTYPE)
+        return cls(records)
+
+    @classmethod
+    def load(cls, path: str) -> Self:
+        """Load a table saved with `save`."""
+        return cls(np.load(path))
+
+    @classmethod
+    def load_or_solve(cls, path: str) -> Self:
+        """Load the table at ``path``, solving and saving it first if it is missing."""
+        if os.path.exists(path):
+            return cls.load(path)
+        table = cls.solve()
+        table.save(path)
+        return table
+
+    def save(self, path: str) -> None:
+        """Write the table to ``path`` in ``.npy`` format."""
+        with open(path, "wb") as file:
+            np.save(file, self.records)
+
+    def move_scores(self, x_mask: int, o_mask: int) -> dict[TttMove, int]:
+        """Return the score of each legal move; empty if the game is over."""
+        key, perm = canonical(x_mask, o_mask)
+        scores = self._scores.get(key)
+        if scores is None:
+            return {}
+        return {perm[i]: score for i, score in enumerate(scores) if score != ILLEGAL}
+
+
+def _solve(
+    x_mask: int, o_mask: int, values: dict[int, int], rows: dict[int, list[int]]
+) -> int:
+    """Return the score of a position, filling ``rows`` with its move scores."""
+    key, perm = canonical(x_mask, o_mask)
+    if key in values:
+        return values[key]
+    if IS_WIN[x_mask] or IS_WIN[o_mask]:
+        value = -WIN_SCORE  # the previous player just completed a line
+    elif x_mask | o_mask == FULL_MASK:
+        value = 0
+    else:
+        x_to_move = x_mask.bit_count() == o_mask.bit_count()
+        scores = [ILLEGAL] * 9
+        for move in range(9):
+            bit = 1 << move
+            if (x_mask | o_mask) & bit:
+                continue
+            if x_to_move:
+                child = _solve(x_mask | bit, o_mask, values, rows)
+            else:
+                child = _solve(x_mask, o_mask | bit, values, rows)
+            scores[move] = -child - 1 if child < 0 else -child + 1 if child else 0
+        rows[key] = [scores[perm[i]] for i in range(9)]
+        value = max(scores)
+    values[key] = value
+    return value
+
+
+def main() -> None:
+    """Solve tic-tac-toe and save the table."""
+    parser = argparse.ArgumentParser(description="Solve tic-tac-toe")
+    parser.add_argument("output", help="File to write the table to")
+    args = parser.parse_args()
+    table = SolvedTable.solve()
+    table.save(args.output)
+    print(f"Wrote {len(table)} positions to {args.output}")
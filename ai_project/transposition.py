@@ -0,0 +1,139 @@
+"""Zobrist hashing and a bounded transposition table for the Negamax search.
+
+Authors: Trevor Arcieri and Demetri Karras
+Course: CS 481 Artificial Intelligence
+Term: Spring 2025
+Project: DualBoard Negamax AI
+"""
+
+import random
+from enum import IntEnum
+from typing import Any, NamedTuple
+
+ZOBRIST_SEED = 481  # Fixed seed so keys are identical across runs and processes
+ENTRY_BYTES = 160  # Approximate memory footprint of one stored entry
+
+
+def zobrist_table(num_squares: int, num_pieces: int) -> list[list[int]]:
+    """Build a table of random 64-bit keys, one per (square, piece) pair.
+
+    Args:
+        num_squares (int): Number of squares on the board.
+        num_pieces (int): Number of distinct piece kinds that can occupy a square.
+
+    Returns:
+        list[list[int]]: Keys indexed by ``[square][piece]``.
+    """
+    rng = random.Random(ZOBRIST_SEED * 1000 + num_squares * 10 + num_pieces)
+    return [
+        [rng.getrandbits(64) for _ in range(num_pieces)] for _ in range(num_squares)
+    ]
+
+
+ZOBRIST_TURN = random.Random(ZOBRIST_SEED).getrandbits(64)  # Toggled every ply
+
+
+class Bound(IntEnum):
+    """Kind of score stored in a transposition table entry."""
+
+    EXACT = 0
+    LOWER = 1  # score is a lower bound (search failed high)
+    UPPER = 2  # score is an upper bound (search failed low)
+
+
+class TtEntry(NamedTuple):
+    """A single transposition table entry."""
+
+    key: int
+    depth: int
+    score: float
+    bound: Bound
+    move: Any
+    generation: int
+
+
+class TranspositionTable:
+    """Fixed-size, depth-preferred transposition table keyed by Zobrist keys.
+
+    Entries live in a power-of-two sized slot array indexed by the low bits of
+    the key. A new entry replaces the resident one when the slot is empty, holds
+    the same position, was written during an older search, or was searched to a
+    depth no greater than the new one.
+    """
+
+    def __init__(self, size_mb: float = 16.0) -> None:
+        """Initialize the table with a memory cap in megabytes."""
+        if size_mb <= 0:
+            raise ValueError("size_mb must be positive")
+
+        capacity = max(1, int(size_mb * 2**20) // ENTRY_BYTES)
+        self.capacity = 1 << (capacity.bit_length() - 1)  # round down to 2^n
+        self._mask = self.capacity - 1
+        self._slots: list[TtEntry | None] = [None] * self.capacity
+        self._generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+
+    def __len__(self) -> int:
+        """Return the number of occupied slots."""
+        return sum(entry is not None for entry in self._slots)
+
+    def new_search(self) -> None:
+        """Age the table so entries from previous searches are replaced first."""
+        self._generation += 1
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        self._slots = [None] * self.capacity
+        self._generation = 0
+        self.reset_counters()
+
+    def reset_counters(self) -> None:
+        """Reset the hit, miss and collision counters."""
+        self.hits = self.misses = self.collisions = 0
+
+    def probe(self, key: int) -> TtEntry | None:
+        """Look up the entry stored for a position.
+
+        Args:
+            key (int): Zobrist key of the position.
+
+        Returns:
+            TtEntry | None: The stored entry, or ``None`` on a miss.
+        """
+        entry = self._slots[key & self._mask]
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.key != key:  # slot taken by a different position
+            self.misses += 1
+            self.collisions += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def store(
+        self, key: int, depth: int, score: float, bound: Bound, move: Any
+    ) -> None:
+        """Store a search result, subject to the replacement policy.
+
+        Args:
+            key (int): Zobrist key of the position.
+            depth (int): Remaining depth the position was searched to.
+            score (float): Score from the side to move's perspective.
+            bound (Bound): Whether ``score`` is exact or a bound.
+            move (Any): Best move found, or ``None``.
+        """
+        index = key & self._mask
+        entry = self._slots[index]
+        if (
+            entry is None
+            or entry.key == key
+            or entry.generation != self._generation
+            or depth >= entry.depth
+        ):
+            self._slots[index] = TtEntry(
+                key, depth, score, bound, move, self._generation
+            )
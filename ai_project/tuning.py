@@ -0,0 +1,296 @@
+"""Texel-style tuning of the evaluation weights from self-play games.
+
+Positions are collected from self-play games and labelled with the result of
+their game. The weights are then fitted so that a logistic function of the
+evaluation predicts those results as well as possible.
+
+Authors: Trevor Arcieri and Demetri Karras
+Course: CS 481 Artificial Intelligence
+Term: Spring 2025
+Project: DualBoard Negamax AI
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import numpy as np
+
+from ai_project.arena import GAMES, EngineConfig, make_engine
+from ai_project.board import AbstractBoard, AbstractPlayer
+from ai_project.checkers.bitboard import CheckersBitboard
+from ai_project.perft import make_board
+from ai_project.weights import save_weights
+
+SCALES = np.geomspace(1e-3, 10, 400)  # logistic scales tried by `fit_scale`
+
+
+def _piece_lead(board: AbstractBoard) -> int:
+    """Pieces the minimizing player has more than the maximizing one, if any."""
+    if isinstance(board, CheckersBitboard):
+        white = board.white_men | board.white_kings
+        black = board.black_men | board.black_kings
+        return white.bit_count() - black.bit_count()
+    return 0
+
+
+def play_labelled_game(
+    game: str,
+    config: EngineConfig,
+    seed: int,
+    opening_plies: int,
+    max_plies: int,
+    adjudicate: int,
+) -> tuple[list[tuple[int, ...]], float]:
+    """Play a self-play game and encode its quiet positions; the pool's unit of work.
+
+    Positions after the random opening moves are kept if no move in them is a
+    capture or other non-quiet move, whose outcome the evaluation cannot see.
+    Drawn or unfinished games where a player leads by ``adjudicate`` pieces or
+    more count as won by that player: the engines often repeat moves instead of
+    converting a won checkers endgame.
+
+    Returns:
+        tuple[list[tuple[int, ...]], float]: The encoded positions, and the
+            result for the minimizing player, whom `evaluate` scores positive:
+            1 for a win, 0.5 for a draw and 0 for a loss.
+    """
+    rng = random.Random(seed)
+    board = make_board(game, "bitboard")
+    engine = make_engine(game, config, seed)
+    positions = []
+    for ply in range(max_plies):
+        if board.game_over:
+            break
+        moves = board.legal_move_list()
+        if ply < opening_plies:
+            board.push(rng.choice(moves))
+            continue
+        if all(engine.is_quiet(move) for move in moves):
+            positions.append(engine.encode(board))
+        board.push(engine.get_best_move(board))
+
+    if board.game_over and not board.is_draw:  # the side to move has lost
+        return positions, 0.0 if board.turn.value == AbstractPlayer.MIN else 1.0
+    lead = _piece_lead(board)
+    if abs(lead) < adjudicate:
+        return positions, 0.5
+    return positions, 1.0 if lead > 0 else 0.0
+
+
+def load_dataset(
+    game: str,
+    cache: str,
+    config: EngineConfig,
+    *,
+    games: int,
+    opening_plies: int = 4,
+    max_plies: int = 200,
+    adjudicate: int = 3,
+    workers: int = 1,
+    seed: int = 0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Features and results of the positions of self-play games, cached on disk.
+
+    The games are only played if ``cache`` does not hold the positions of the
+    same games yet; the features are those of `AbstractEngine.feature_batch`.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: One row of features per position, and
+            the result of its game for the minimizing player.
+    """
+    params = json.dumps({
+        "game": game,
+        "games": games,
+        "depth": config.depth,
+        "randomness": config.randomness,
+        "opening_plies": opening_plies,
+        "max_plies": max_plies,
+        "adjudicate": adjudicate,
+        "seed": seed,
+    })
+    if os.path.exists(cache):
+        with np.load(cache) as data:
+            if str(data["params"]) == params:
+                return data["features"], data["labels"]
+
+    args = (
+        [game] * games,
+        [config] * games,
+        range(seed, seed + games),
+        [opening_plies] * games,
+        [max_plies] * games,
+        [adjudicate] * games,
+    )
+    if workers == 1:
+        results = list(map(play_labelled_game, *args))
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(play_labelled_game, *args, chunksize=16))
+    positions = np.array(
+        [position for game_positions, _ in results for position in game_positions],
+        dtype=np.uint64,
+    )
+    labels = np.array([
+        result for game_positions, result in results for _ in game_positions
+    ])
+    features = make_engine(game, config).feature_batch(positions)
+    with open(cache, "wb") as file:  # a path would get ".npz" appended
+        np.savez_compressed(file, features=features, labels=labels, params=params)
+    return features, labels
+
+
+def predict(features: np.ndarray, weights: np.ndarray, scale: float) -> np.ndarray:
+    """Expected results of positions: the logistic function of their evaluation."""
+    return 0.5 + 0.5 * np.tanh(scale / 2 * (features @ weights))
+
+
+def mean_squared_error(
+    features: np.ndarray, labels: np.ndarray, weights: np.ndarray, scale: float
+) -> float:
+    """Mean squared error of the `predict`-ed results of positions."""
+    return float(np.mean((predict(features, weights, scale) - labels) ** 2))
+
+
+def fit_scale(features: np.ndarray, labels: np.ndarray, weights: np.ndarray) -> float:
+    """The logistic scale that fits the results best with the given weights.
+
+    Fixing it before tuning keeps the tuned weights in the units of the
+    hand-picked ones.
+    """
+    errors = [mean_squared_error(features, labels, weights, k) for k in SCALES]
+    return float(SCALES[np.argmin(errors)])
+
+
+def tune_weights(
+    features: np.ndarray,
+    labels: np.ndarray,
+    weights: np.ndarray,
+    scale: float,
+    *,
+    iterations: int = 2000,
+    learning_rate: float = 0.05,
+) -> np.ndarray:
+    """Minimize the `mean_squared_error` of the weights by gradient descent.
+
+    Every iteration computes the exact gradient over all positions at once, and
+    takes an Adam step along it.
+    """
+    beta1, beta2, epsilon = 0.9, 0.999, 1e-8
+    weights = weights.astype(np.float64)
+    moment = np.zeros_like(weights)
+    variance = np.zeros_like(weights)
+    for step in range(1, iterations + 1):
+        predicted = predict(features, weights, scale)
+        slope = 2 * (predicted - labels) * predicted * (1 - predicted) * scale
+        gradient = slope @ features / len(labels)
+        moment = beta1 * moment + (1 - beta1) * gradient
+        variance = beta2 * variance + (1 - beta2) * gradient**2
+        corrected = moment / (1 - beta1**step)
+        weights -= (
+            learning_rate
+            * corrected
+            / (np.sqrt(variance / (1 - beta2**step)) + epsilon)
+        )
+    return weights
+
+
+def main() -> None:
+    """Tune the evaluation weights of an engine and save them to a file."""
+    parser = argparse.ArgumentParser(
+        description="Tune evaluation weights on the results of self-play games",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("output", help="JSON file to save the tuned weights to")
+    parser.add_argument("-g", "--game", choices=GAMES, default="checkers")
+    parser.add_argument("-n", "--games", type=int, default=2000, help="Games to play")
+    parser.add_argument(
+        "-d", "--depth", type=int, default=2, help="Search depth of the games"
+    )
+    parser.add_argument(
+        "-r",
+        "--randomness",
+        type=float,
+        default=10.0,
+        help="Percentage of random moves in the games",
+    )
+    parser.add_argument(
+        "--opening-plies",
+        type=int,
+        default=4,
+        help="Random moves played at the start of every game",
+    )
+    parser.add_argument(
+        "--max-plies",
+        type=int,
+        default=200,
+        help="Moves after which a game is a draw",
+    )
+    parser.add_argument(
+        "--adjudicate",
+        type=int,
+        default=3,
+        help="Piece lead that wins a drawn or unfinished game",
+        metavar="PIECES",
+    )
+    parser.add_argument(
+        "--cache",
+        default=None,
+        help="File of the positions, reused if it holds the same games"
+        " (default: GAME-positions.npz)",
+        metavar="FILE",
+    )
+    parser.add_argument(
+        "-i", "--iterations", type=int, default=2000, help="Gradient descent steps"
+    )
+    parser.add_argument(
+        "--learning-rate", type=float, default=0.05, help="Gradient descent step size"
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=1, help="Processes playing games"
+    )
+    parser.add_argument("-s", "--seed", type=int, default=0, help="Seed of game 0")
+    args = parser.parse_args()
+
+    config = EngineConfig(args.depth, args.randomness, tt_size_mb=1.0)
+    start = time.perf_counter()
+    features, labels = load_dataset(
+        args.game,
+        args.cache or f"{args.game}-positions.npz",
+        config,
+        games=args.games,
+        opening_plies=args.opening_plies,
+        max_plies=args.max_plies,
+        adjudicate=args.adjudicate,
+        workers=args.workers,
+        seed=args.seed,
+    )
+    loaded = time.perf_counter()
+
+    initial = make_engine(args.game, config).weights
+    weights = np.array(initial, dtype=np.float64)
+    scale = fit_scale(features, labels, weights)
+    tuned = tune_weights(
+        features,
+        labels,
+        weights,
+        scale,
+        iterations=args.iterations,
+        learning_rate=args.learning_rate,
+    )
+    save_weights(args.output, type(initial)(*tuned.tolist()))
+    summary: dict[str, Any] = {
+        "positions": len(labels),
+        "scale": scale,
+        "error": mean_squared_error(features, labels, weights, scale),
+        "tuned_error": mean_squared_error(features, labels, tuned, scale),
+        "weights": initial._asdict(),
+        "tuned_weights": dict(zip(initial._fields, tuned.tolist(), strict=True)),
+        "load_seconds": loaded - start,
+        "tune_seconds": time.perf_counter() - loaded,
+    }
+    print(json.dumps(summary, indent=2))
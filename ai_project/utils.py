@@ -9,6 +9,8 @@ Project: DualBoard Negamax AI
 import argparse
 from dataclasses import dataclass
 
+from ai_project.stats import SearchStats
+
 
 @dataclass(frozen=True)
 class ParsedArgs:
@@ -16,13 +18,54 @@ class ParsedArgs:
 
     Attributes:
         difficulty (int): Difficulty level of the AI (1-5).
+        time_budget_ms (float | None): Per-move search time in milliseconds, used
+            instead of ``difficulty`` when given.
         randomness (float): Randomness percentage for AI moves (0-100).
         debug (bool): Enable debug mode.
+        tt_size_mb (float): Transposition table size in megabytes (0 disables it).
+        workers (int): Number of processes searching root moves in parallel.
+        stats_path (str | None): File to append the statistics of every engine
+            search to, as JSON lines.
+        book_path (str | None): Checkers opening book file.
+        endgame_path (str | None): Checkers endgame database file.
+        table_path (str | None): Solved tic-tac-toe table file.
+        weights_path (str | None): File of tuned evaluation weights.
+        pvs (bool): Use principal variation search.
+        aspiration_window (int | None): Aspiration window half-width of
+            iterative deepening, if any.
+        quiescence_nodes (int): Quiescence search budget per horizon position.
+        lmr_moves (int): Moves searched at full depth before late move
+            reductions start (0 disables them).
+        futility_margin (int): Futility pruning margin per ply (0 disables it).
+        razor_margin (int): Razoring margin per ply (0 disables it).
+        ponder (bool): Search on the opponent's time.
+        detect_draws (bool): Score checkers repetitions inside the search tree
+            as draws.
+        mcts (bool): Search by Monte Carlo Tree Search instead of Negamax.
+        exploration (float): UCT exploration constant of the Monte Carlo search.
     """
 
     difficulty: int
+    time_budget_ms: float | None
     randomness: float
     debug: bool
+    tt_size_mb: float
+    workers: int
+    stats_path: str | None
+    book_path: str | None
+    endgame_path: str | None
+    table_path: str | None
+    weights_path: str | None
+    pvs: bool
+    aspiration_window: int | None
+    quiescence_nodes: int
+    lmr_moves: int
+    futility_margin: int
+    razor_margin: int
+    ponder: bool
+    detect_draws: bool
+    mcts: bool
+    exploration: float
 
 
 def parse_args() -> ParsedArgs:
@@ -31,7 +74,8 @@ def parse_args() -> ParsedArgs:
         description="AI Game Agent",
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
     )
-    parser.add_argument(
+    strength = parser.add_mutually_exclusive_group()
+    strength.add_argument(
         "-d",
         "--difficulty",
         type=int,
@@ -39,6 +83,14 @@ def parse_args() -> ParsedArgs:
         default=3,
         help="Difficulty level of the AI (1-5)",
     )
+    strength.add_argument(
+        "-t",
+        "--time-budget",
+        type=float,
+        default=None,
+        help="Search each move by iterative deepening for this many milliseconds",
+        metavar="MS",
+    )
     parser.add_argument(
         "-r",
         "--randomness",
@@ -47,11 +99,145 @@ def parse_args() -> ParsedArgs:
         help="Randomness percentage for AI moves (0-100)",
         metavar="PERCENTAGE",
     )
+    parser.add_argument(
+        "--hash-size",
+        type=float,
+        default=16.0,
+        help="Transposition table size in megabytes (0 to disable)",
+        metavar="MB",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes searching root moves in parallel",
+        metavar="N",
+    )
+    parser.add_argument(
+        "--stats",
+        default=None,
+        help="Append the search statistics of every engine move to FILE as JSON lines",
+        metavar="FILE",
+    )
+    parser.add_argument(
+        "--book",
+        default=None,
+        help="Play from this checkers opening book while possible (see checkers-db)",
+        metavar="FILE",
+    )
+    parser.add_argument(
+        "--endgame",
+        default=None,
+        help="Play perfectly from this checkers endgame database (see checkers-db)",
+        metavar="FILE",
+    )
+    parser.add_argument(
+        "--table",
+        default=None,
+        help="Answer tic-tac-toe moves from this solved table, created if missing",
+        metavar="FILE",
+    )
+    parser.add_argument(
+        "--weights",
+        default=None,
+        help="Evaluate positions with the weights in this file (see tune)",
+        metavar="FILE",
+    )
+    parser.add_argument(
+        "--pvs",
+        action="store_true",
+        help="Search with null windows after the first move (principal variation search)",
+    )
+    parser.add_argument(
+        "--aspiration",
+        type=int,
+        default=None,
+        help="Search each iterative deepening iteration within this window first",
+        metavar="WIDTH",
+    )
+    parser.add_argument(
+        "-q",
+        "--quiescence",
+        type=int,
+        default=0,
+        help="Search captures past the depth limit, up to NODES per position (0 disables it)",
+        metavar="NODES",
+    )
+    parser.add_argument(
+        "--lmr",
+        type=int,
+        default=0,
+        help="Search quiet moves after the first N one ply shallower first (0 disables it)",
+        metavar="N",
+    )
+    parser.add_argument(
+        "--futility",
+        type=int,
+        default=0,
+        help="Skip quiet moves near the horizon that fall this far per ply below alpha (0 disables it)",
+        metavar="MARGIN",
+    )
+    parser.add_argument(
+        "--razor",
+        type=int,
+        default=0,
+        help="Score positions near the horizon this far per ply below alpha without searching them (0 disables it)",
+        metavar="MARGIN",
+    )
+    parser.add_argument(
+        "--ponder",
+        action="store_true",
+        help="Search the predicted reply while the opponent thinks (needs -w 1)",
+    )
+    parser.add_argument(
+        "--detect-draws",
+        action="store_true",
+        help="Score checkers positions that repeat or make no progress within the search as draws",
+    )
+    parser.add_argument(
+        "--mcts",
+        action="store_true",
+        help="Search by Monte Carlo Tree Search, 500 playouts per difficulty level or for the time budget",
+    )
+    parser.add_argument(
+        "--exploration",
+        type=float,
+        default=1.41,
+        help="UCT exploration constant of --mcts",
+        metavar="C",
+    )
     parser.add_argument("--debug", action="store_true", help="Enable debug mode")
 
     args = parser.parse_args()
+    if args.ponder and args.workers > 1:
+        parser.error("--ponder needs -w 1")
     return ParsedArgs(
         difficulty=args.difficulty,
+        time_budget_ms=args.time_budget,
         randomness=args.randomness,
         debug=args.debug,
+        tt_size_mb=args.hash_size,
+        workers=args.workers,
+        stats_path=args.stats,
+        book_path=args.book,
+        endgame_path=args.endgame,
+        table_path=args.table,
+        weights_path=args.weights,
+        pvs=args.pvs,
+        aspiration_window=args.aspiration,
+        quiescence_nodes=args.quiescence,
+        lmr_moves=args.lmr,
+        futility_margin=args.futility,
+        razor_margin=args.razor,
+        ponder=args.ponder,
+        detect_draws=args.detect_draws,
+        mcts=args.mcts,
+        exploration=args.exploration,
     )
+
+
+def append_stats(path: str, stats: SearchStats) -> None:
+    """Append search statistics to a JSON lines file."""
+    with open(path, "a") as file:
+        file.write(stats.to_json() + "\n")
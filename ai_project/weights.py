@@ -0,0 +1,38 @@
+"""Evaluation weight sets of the engines, saved as JSON files.
+
+Authors: Trevor Arcieri and Demetri Karras
+Course: CS 481 Artificial Intelligence
+Term: Spring 2025
+Project: DualBoard Negamax AI
+"""
+
+import json
+from collections.abc import Callable
+from typing import Any, NamedTuple, TypeVar
+
+WeightsT = TypeVar("WeightsT")
+
+
+def load_weights(path: str, weights_type: Callable[[], WeightsT]) -> WeightsT:
+    """Load a weight set saved by `save_weights`.
+
+    ``weights_type`` is a `NamedTuple` with defaults, which weights missing
+    from the file keep.
+
+    Raises:
+        ValueError: If the file has weights ``weights_type`` does not know.
+    """
+    with open(path) as file:
+        weights = json.load(file)
+    defaults: Any = weights_type()
+    unknown = set(weights) - set(defaults._fields)
+    if unknown:
+        raise ValueError(f"unknown weights in {path}: {', '.join(sorted(unknown))}")
+    return defaults._replace(**weights)
+
+
+def save_weights(path: str, weights: NamedTuple) -> None:
+    """Save a weight set as a JSON object of its fields."""
+    with open(path, "w") as file:
+        json.dump(weights._asdict(), file, indent=2)
+        file.write("\n")
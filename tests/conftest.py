@@ -0,0 +1,35 @@
+import logging
+import random
+
+import pytest
+
+from ai_project.checkers.bitboard import CheckersBitboard
+
+logging.disable(logging.CRITICAL)  # py-draughts logs every move
+
+
+def random_game(seed: int, max_plies: int = 150) -> list[CheckersBitboard]:
+    """Play random moves from the start, returning a copy of every position."""
+    rng = random.Random(seed)
+    board = CheckersBitboard()
+    positions = []
+    for _ in range(max_plies):
+        positions.append(
+            CheckersBitboard(
+                board.white_men,
+                board.white_kings,
+                board.black_men,
+                board.black_kings,
+                board.turn,
+            )
+        )
+        if board.game_over:
+            break
+        board.push(rng.choice(list(board.legal_moves)))
+    return positions
+
+
+@pytest.fixture(scope="session")
+def checkers_positions() -> list[CheckersBitboard]:
+    """Positions of random checkers games, kings and endgames included."""
+    return [position for seed in range(30) for position in random_game(seed)]
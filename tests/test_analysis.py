@@ -0,0 +1,116 @@
+import io
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from ai_project.arena import EngineConfig
+from ai_project.checkers.analysis import (
+    PdnGame,
+    _completed_games,
+    _init_analysis_worker,
+    _to_notation,
+    analyze_game,
+    read_pdn,
+    replay,
+)
+from ai_project.checkers.bitboard import CheckersBitboard
+
+ARCHIVE = """\
+[Event "First"]
+[Round "1"]
+1. 11-15 23-19 {a comment
+that spans lines, with 9-14 in it} 2. 8-11 (2. 9-14 22-17) 22-17!? 1-0
+
+[Event "Second"]
+1.9-13 22-18
+[Event "Third"]
+*
+"""
+
+OPENING = ["11-15", "23-19", "8-11", "22-17"]  # in PDN numbering
+
+
+def test_read_pdn_splits_games_and_skips_non_moves() -> None:
+    """Tags, moves and game ends are read; comments, variations and the rest not."""
+    games = list(read_pdn(io.StringIO(ARCHIVE)))
+    assert games == [
+        PdnGame(0, {"Event": "First", "Round": "1"}, OPENING),
+        PdnGame(1, {"Event": "Second"}, ["9-13", "22-18"]),
+        PdnGame(2, {"Event": "Third"}, []),
+    ]
+
+
+def test_replay_detects_pdn_numbering() -> None:
+    """Games numbered from the first mover's side replay as PDN games."""
+    moves, flipped = replay(PdnGame(0, {}, OPENING))
+    assert flipped
+    assert [_to_notation(move, flipped) for move in moves] == OPENING
+
+
+def test_replay_falls_back_to_draughts_numbering() -> None:
+    """Games that only replay with `py-draughts`' numbering are read that way."""
+    mirrored = [
+        "-".join(str(33 - int(square)) for square in move.split("-"))
+        for move in OPENING
+    ]
+    moves, flipped = replay(PdnGame(0, {}, mirrored))
+    assert not flipped
+    assert moves == replay(PdnGame(0, {}, OPENING))[0]
+
+
+def test_replay_rejects_illegal_moves_and_setups() -> None:
+    """Illegal moves and setup positions raise `ValueError`."""
+    with pytest.raises(ValueError, match="illegal move"):
+        replay(PdnGame(0, {}, ["11-15", "23-19", "8-20"]))
+    with pytest.raises(ValueError, match="setup"):
+        replay(PdnGame(0, {"FEN": "W:W21:B1"}, []))
+
+
+def test_completed_games_truncates_a_partial_line(tmp_path: Path) -> None:
+    """Resuming drops a line cut off by an interruption and keeps the rest."""
+    path = tmp_path / "analysis.jsonl"
+    lines = [json.dumps({"game": 0}), json.dumps({"game": 3})]
+    path.write_text("\n".join(lines) + '\n{"game": 4, "mo')
+    assert _completed_games(str(path)) == {0, 3}
+    assert path.read_text() == "\n".join(lines) + "\n"
+    assert _completed_games(str(tmp_path / "missing.jsonl")) == set()
+
+
+def drawn_game() -> tuple[list[str], CheckersBitboard]:
+    """A random game drawn by repetition, in PDN numbering, and its last position."""
+    for seed in range(1000):
+        rng = random.Random(seed)
+        board = CheckersBitboard()
+        moves = []
+        while not board.game_over:
+            move = rng.choice(board.legal_move_list())
+            moves.append(_to_notation(move, flipped=True))
+            board.push(move)
+        if board.has_legal_moves:
+            return moves, board
+    raise AssertionError("no random game was drawn")
+
+
+def test_analyze_game_scores_every_move() -> None:
+    """Every move gets the scores of the position and of the move played."""
+    _init_analysis_worker(EngineConfig(2, tt_size_mb=1.0))
+    result = analyze_game(PdnGame(5, {}, OPENING), blunder=5)
+    assert result["game"] == 5
+    assert [move["move"] for move in result["moves"]] == OPENING
+    assert result["positions"] == len(OPENING) + 1
+    assert result["ignored_moves"] == 0
+    for move in result["moves"]:
+        assert move["blunder"] == (move["score"] - move["played_score"] >= 5)
+
+
+def test_analyze_game_stops_at_game_over() -> None:
+    """Moves recorded after the game ended are counted, not analyzed."""
+    _init_analysis_worker(EngineConfig(1, tt_size_mb=1.0))
+    moves, board = drawn_game()
+    extra = _to_notation(board.legal_move_list()[0], flipped=True)
+    result = analyze_game(PdnGame(0, {}, [*moves, extra]), blunder=5)
+    assert "error" not in result
+    assert len(result["moves"]) == len(moves)
+    assert result["ignored_moves"] == 1
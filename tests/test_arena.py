@@ -0,0 +1,101 @@
+from ai_project.arena import (
+    EngineConfig,
+    GameRecord,
+    GameSpec,
+    compare_bench,
+    percentile,
+    play_game,
+    run_bench,
+    run_match,
+    summarize,
+)
+
+
+def make_specs(
+    game: str, games: int, depths: tuple[int, int], opening_plies: int = 2
+) -> list[GameSpec]:
+    """Specs of a match of engines of the given depths, alternating the first move."""
+    engines = (EngineConfig(depths[0]), EngineConfig(depths[1]))
+    return [
+        GameSpec(game, i, i, opening_plies, engines, i % 2 == 0, 40)
+        for i in range(games)
+    ]
+
+
+def test_games_replay_exactly() -> None:
+    """A game is fully determined by its spec, in or out of a pool."""
+    specs = make_specs("checkers", 2, (2, 3))
+    records = run_match(specs, 2)
+    assert [record.moves for record in records] == [
+        play_game(spec).moves for spec in specs
+    ]
+
+
+def test_perfect_play_draws() -> None:
+    """Full-depth tic-tac-toe engines draw every game."""
+    records = run_match(make_specs("tic-tac-toe", 4, (9, 9), opening_plies=0), 1)
+    summary = summarize(records)
+    assert summary["games"] == 4
+    assert summary["draw_rate"] == 1.0
+    assert summary["a"]["moves"] + summary["b"]["moves"] == sum(
+        len(record.moves) for record in records
+    )
+
+
+def test_summary_counts_results() -> None:
+    """Rates are from engine A's point of view; each engine's moves are its own."""
+    spec = make_specs("tic-tac-toe", 1, (1, 1))[0]
+    records = [
+        GameRecord(spec, "a", ["0"], [0], [0.002], [10]),
+        GameRecord(spec, "b", ["1", "2"], [0, 1], [0.004, 0.001], [20, 5]),
+        GameRecord(spec, None, [], [], [], []),
+        GameRecord(spec, "a", [], [], [], []),
+    ]
+    summary = summarize(records)
+    assert (summary["win_rate"], summary["draw_rate"], summary["loss_rate"]) == (
+        0.5,
+        0.25,
+        0.25,
+    )
+    assert summary["a"]["moves"] == 2
+    assert summary["a"]["mean_nodes"] == 15
+    assert summary["a"]["latency_max_ms"] == 4
+    assert summary["b"]["nodes_per_second"] == 5000
+
+
+def test_percentile_is_nearest_rank() -> None:
+    """Percentiles pick a value of the list, 0 for an empty one."""
+    values = [float(value) for value in range(1, 11)]
+    assert percentile(values, 50) == 5
+    assert percentile(values, 90) == 9
+    assert percentile(values, 99) == 10
+    assert percentile([], 50) == 0
+
+
+def test_bench_is_reproducible() -> None:
+    """Node counts and moves repeat exactly, so a rerun has no regressions."""
+    results = {"tic-tac-toe": run_bench("tic-tac-toe", EngineConfig(5))}
+    again = {"tic-tac-toe": run_bench("tic-tac-toe", EngineConfig(5))}
+    assert compare_bench(again, results, tolerance=1e9) == []
+
+
+def test_compare_reports_changes() -> None:
+    """Changed node counts or moves and slowdowns beyond the tolerance are reported."""
+    baseline = {
+        "checkers": {
+            "engine": {"depth": 8},
+            "seconds": 1.0,
+            "positions": [{"move": "a", "nodes": 10}, {"move": "b", "nodes": 20}],
+        }
+    }
+    results = {
+        "checkers": {
+            "engine": {"depth": 8},
+            "seconds": 1.2,
+            "positions": [{"move": "a", "nodes": 10}, {"move": "c", "nodes": 20}],
+        }
+    }
+    assert len(compare_bench(results, baseline, tolerance=10)) == 2
+    assert len(compare_bench(results, baseline, tolerance=30)) == 1
+    results["checkers"]["engine"] = {"depth": 6}  # other engines are not compared
+    assert compare_bench(results, baseline, tolerance=10) == []
@@ -0,0 +1,124 @@
+import copy
+
+import numpy as np
+import pytest
+
+from ai_project.arena import EngineConfig, make_engine
+from ai_project.checkers.bitboard import CheckersBitboard
+from ai_project.checkers.engine import CheckersEngine, CheckersWeights, _weighted_sum
+from ai_project.engine import AbstractEngine, AbstractPlayer
+from ai_project.perft import make_board
+from ai_project.tic_tac_toe.bitboard import TttBitboard
+from ai_project.tic_tac_toe.engine import TttEngine, TttWeights
+
+TUNED_CHECKERS = CheckersWeights(9.89, 12.47, -1.33, -0.53)
+TUNED_TTT = TttWeights(7.5, 120.25)
+
+
+class ScalarTttEngine(TttEngine):
+    """A tic-tac-toe engine without batch evaluation."""
+
+    encode = AbstractEngine.encode
+    evaluate_batch = AbstractEngine.evaluate_batch
+
+
+def encode_all(engine: AbstractEngine, boards: list) -> np.ndarray:
+    """Encode positions into the array `evaluate_batch` takes."""
+    return np.array([engine.encode(board) for board in boards], dtype=np.uint64)
+
+
+def ttt_positions() -> list[TttBitboard]:
+    """Every non-terminal tic-tac-toe position reachable from the empty board."""
+    positions: dict[int, TttBitboard] = {}
+
+    def visit(board: TttBitboard) -> None:
+        if board.game_over or board.zobrist_key in positions:
+            return
+        positions[board.zobrist_key] = copy.deepcopy(board)
+        for move in list(board.legal_move_list()):
+            board.push(move)
+            visit(board)
+            board.pop()
+
+    visit(TttBitboard())
+    return list(positions.values())
+
+
+@pytest.mark.parametrize("weights", [None, TUNED_CHECKERS])
+def test_checkers_batch_matches_evaluate(
+    checkers_positions: list[CheckersBitboard], weights: CheckersWeights | None
+) -> None:
+    """Batch scores of checkers positions equal their scalar scores."""
+    engine = CheckersEngine(1, weights=weights)
+    scores = engine.evaluate_batch(encode_all(engine, checkers_positions))
+    assert scores.tolist() == [engine.evaluate(b) for b in checkers_positions]
+
+
+@pytest.mark.parametrize("weights", [None, TUNED_TTT])
+def test_tic_tac_toe_batch_matches_evaluate(weights: TttWeights | None) -> None:
+    """Batch scores of all tic-tac-toe positions equal their scalar scores."""
+    engine = TttEngine(1, weights=weights)
+    positions = ttt_positions()
+    scores = engine.evaluate_batch(encode_all(engine, positions))
+    assert scores.tolist() == [engine.evaluate(board) for board in positions]
+
+
+def test_checkers_features_weigh_to_evaluation(
+    checkers_positions: list[CheckersBitboard],
+) -> None:
+    """The features of a position, weighed, give its unrounded evaluation."""
+    engine = CheckersEngine(1)
+    features = engine.feature_batch(encode_all(engine, checkers_positions))
+    expected = [
+        _weighted_sum(
+            TUNED_CHECKERS,
+            board.white_men.bit_count() - board.black_men.bit_count(),
+            board.white_kings.bit_count() - board.black_kings.bit_count(),
+            board.advance,
+            board.center_dist,
+        )
+        for board in checkers_positions
+    ]
+    assert features @ np.array(TUNED_CHECKERS) == pytest.approx(expected)
+
+
+def test_tic_tac_toe_features_weigh_to_evaluation() -> None:
+    """The features of a position, weighed, give its evaluation."""
+    engine = TttEngine(1, weights=TUNED_TTT)
+    positions = ttt_positions()
+    features = engine.feature_batch(encode_all(engine, positions))
+    assert np.floor(features @ np.array(TUNED_TTT)).tolist() == [
+        engine.evaluate(board) for board in positions
+    ]
+
+
+@pytest.mark.parametrize(
+    ("game", "position", "depth"),
+    [
+        ("checkers", "start", 6),
+        ("checkers", "midgame", 6),
+        ("checkers", "kings", 6),
+        ("tic-tac-toe", "start", 9),
+    ],
+)
+def test_batch_leaves_search_matches_scalar_search(
+    game: str, position: str, depth: int
+) -> None:
+    """Scoring the leaves in batches finds the same move and score."""
+    results = []
+    for batch_leaves in (False, True):
+        engine = make_engine(game, EngineConfig(depth, batch_leaves=batch_leaves))
+        board = make_board(game, "bitboard", position)
+        is_min_turn = board.turn.value == AbstractPlayer.MIN
+        results.append(engine._search_root(board, depth, is_min_turn))
+    assert results[0] == results[1]
+
+
+def test_batch_leaves_needs_batch_hooks() -> None:
+    """Engines without `encode` and `evaluate_batch` search without batches."""
+    engine = ScalarTttEngine(4, batch_leaves=True)
+    assert not engine.batch_leaves
+    assert TttEngine(4, batch_leaves=True).batch_leaves
+    board = TttBitboard()
+    board.push(4)
+    assert engine.get_best_move(board) in board.legal_move_list()
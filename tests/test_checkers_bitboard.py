@@ -0,0 +1,53 @@
+import random
+
+from draughts.boards.american import Board
+
+from ai_project.checkers.bitboard import CheckersBitboard
+from ai_project.checkers.board import CheckersBoard
+from ai_project.checkers.engine import CheckersEngine
+from ai_project.perft import perft
+
+
+def test_moves_match_draughts(checkers_positions: list[CheckersBitboard]) -> None:
+    """Every position has the moves of `py-draughts`, in the same order."""
+    for board in checkers_positions[::5]:
+        draughts = board.to_draughts()
+        assert [move.square_list for move in board.legal_moves] == [
+            tuple(move.square_list) for move in draughts.legal_moves
+        ], board
+        assert board.zobrist_key == draughts.zobrist_key
+
+
+def test_perft_matches_draughts() -> None:
+    """Both boards count the same move sequences from the start."""
+    counts = [perft(CheckersBitboard(), depth) for depth in range(1, 5)]
+    assert counts == [7, 49, 379, 2872]
+    assert perft(CheckersBoard(), 3) == counts[2]
+
+
+def test_push_and_pop_restore_the_position() -> None:
+    """Undoing a random game restores every position and its key."""
+    rng = random.Random(1)
+    board = CheckersBitboard()
+    seen = []
+    while not board.game_over and len(seen) < 150:
+        seen.append((board.position, board.turn, board.zobrist_key))
+        board.push(rng.choice(list(board.legal_moves)))
+        assert board.zobrist_key == board.compute_zobrist_key()
+    while seen:
+        board.pop()
+        assert (board.position, board.turn, board.zobrist_key) == seen.pop()
+
+
+def test_draughts_round_trip(checkers_positions: list[CheckersBitboard]) -> None:
+    """Converting to `py-draughts` and back keeps the position and side to move."""
+    for board in checkers_positions[::25]:
+        copy = CheckersBitboard.from_draughts(board.to_draughts())
+        assert (copy.position, copy.turn) == (board.position, board.turn)
+
+
+def test_engine_returns_draughts_moves() -> None:
+    """A `py-draughts` board gets a legal `py-draughts` move back."""
+    board = Board()
+    move = CheckersEngine(3).get_best_move(board)
+    assert move in list(board.legal_moves)
@@ -0,0 +1,69 @@
+import random
+from math import floor
+
+from draughts.models import Color, Figure
+
+from ai_project.checkers.bitboard import CheckersBitboard
+from ai_project.checkers.engine import (
+    KING_VALUE,
+    MAN_VALUE,
+    SIDE_DIST_VALUE,
+    WALL_DIST_VALUE,
+    CheckersEngine,
+)
+
+
+def baseline_evaluate(board: CheckersBitboard) -> int:
+    """The original evaluation: float terms summed over the squares of the board."""
+    friendly_form = board.to_draughts().friendly_form
+    size = int(len(friendly_form) ** 0.5)
+    score = 0
+    for i, square in enumerate(friendly_form):
+        row, col = i // size, i % size
+        if square == Figure.EMPTY:
+            continue
+        if square == Figure.WHITE_MAN:
+            score += MAN_VALUE
+        elif square == Figure.BLACK_MAN:
+            score -= MAN_VALUE
+        elif square == Figure.WHITE_KING:
+            score += KING_VALUE
+        elif square == Figure.BLACK_KING:
+            score -= KING_VALUE
+        side = SIDE_DIST_VALUE * abs((size - 1) / 2 - col) / ((size - 1) / 2)
+        if square / abs(square) == Color.WHITE.value:
+            score += WALL_DIST_VALUE * (size - 1 - row) / (size - 1)
+            score += side
+        else:
+            score -= WALL_DIST_VALUE * row / (size - 1)
+            score -= side
+    return floor(score)
+
+
+def test_evaluate_matches_baseline(checkers_positions: list[CheckersBitboard]) -> None:
+    """The incremental evaluation scores random positions like the original one."""
+    engine = CheckersEngine(1)
+    for board in checkers_positions:
+        assert engine.evaluate(board) == baseline_evaluate(board), board
+
+
+def test_starting_position_scores_the_float_sum() -> None:
+    """A whole score is rounded down like the float sum, here to -1."""
+    board = CheckersBitboard()
+    assert CheckersEngine(1).evaluate(board) == baseline_evaluate(board) == -1
+
+
+def test_incremental_features_match_recount() -> None:
+    """The features kept by push and pop equal those computed from scratch."""
+    rng = random.Random(0)
+    for _ in range(20):
+        board = CheckersBitboard()
+        plies = 0
+        while not board.game_over and plies < 120:
+            board.push(rng.choice(board.legal_move_list()))
+            plies += 1
+            assert (board.advance, board.center_dist) == board.compute_features()
+        while plies:
+            board.pop()
+            plies -= 1
+            assert (board.advance, board.center_dist) == board.compute_features()
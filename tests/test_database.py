@@ -0,0 +1,173 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ai_project.checkers.bitboard import DST_SHIFT, CheckersBitboard
+from ai_project.checkers.database import (
+    BOOK_MOVE_MASK,
+    EndgameDatabase,
+    OpeningBook,
+    _endgame_positions,
+)
+from ai_project.checkers.engine import CheckersEngine
+
+WIN, DRAW, LOSS = EndgameDatabase.WIN, EndgameDatabase.DRAW, EndgameDatabase.LOSS
+
+
+@pytest.fixture(scope="module")
+def endgame() -> EndgameDatabase:
+    """The database of all positions with two pieces."""
+    return EndgameDatabase.build(2)
+
+
+@pytest.fixture(scope="module")
+def book() -> OpeningBook:
+    """A small opening book, searched shallowly."""
+    return OpeningBook.build(2, CheckersEngine(2))
+
+
+def child_outcomes(
+    board: CheckersBitboard, endgame: EndgameDatabase
+) -> list[tuple[int, int]]:
+    """Database results of the positions after every move, for their side to move."""
+    outcomes = []
+    for move in board.legal_move_list():
+        board.push(move)
+        outcome = endgame.probe(board)
+        board.pop()
+        outcomes.append((LOSS, 0) if outcome is None else outcome)  # no pieces left
+    return outcomes
+
+
+def test_endgame_results_follow_from_children(endgame: EndgameDatabase) -> None:
+    """Every position is won by its best move, lost if all moves lose, else drawn."""
+    for board in _endgame_positions(2):
+        outcomes = child_outcomes(board, endgame)
+        losses = [plies for result, plies in outcomes if result == LOSS]
+        if not outcomes:
+            expected = (LOSS, 0)
+        elif losses:
+            expected = (WIN, min(losses) + 1)
+        elif all(result == WIN for result, _ in outcomes):
+            expected = (LOSS, max(plies for _, plies in outcomes) + 1)
+        else:
+            expected = (DRAW, 0)
+        assert endgame.probe(board) == expected, board
+
+
+def test_capturing_the_last_piece_wins(endgame: EndgameDatabase) -> None:
+    """A man that can jump the only enemy piece wins in one ply."""
+    white_man, black_man = 1 << 21, 1 << 17  # black's man can be jumped
+    board = CheckersBitboard(white_man, 0, black_man, 0)
+    assert any(move.captured for move in board.legal_move_list())
+    assert endgame.probe(board) == (WIN, 1)
+    move = endgame.best_move(board, board.legal_move_list())
+    assert move is not None
+    assert move.captured
+
+
+def test_endgame_round_trip(endgame: EndgameDatabase, tmp_path: Path) -> None:
+    """A saved database loads with the same positions and results."""
+    path = str(tmp_path / "endgame.bin")
+    endgame.save(path)
+    loaded = EndgameDatabase.load(path)
+    assert np.array_equal(loaded.keys, endgame.keys)
+    assert np.array_equal(loaded.values, endgame.values)
+
+
+def book_positions(plies: int) -> list[CheckersBitboard]:
+    """Every position up to ``plies`` moves from the start."""
+    positions = [CheckersBitboard()]
+    frontier = positions
+    for _ in range(plies):
+        children = []
+        for board in frontier:
+            for move in list(board.legal_move_list()):
+                child = CheckersBitboard(
+                    board.white_men,
+                    board.white_kings,
+                    board.black_men,
+                    board.black_kings,
+                    board.turn,
+                )
+                child.push(move)
+                children.append(child)
+        positions += children
+        frontier = children
+    return positions
+
+
+def test_book_round_trip(book: OpeningBook, tmp_path: Path) -> None:
+    """A saved book loads and gives the same legal move for every position."""
+    path = str(tmp_path / "book.bin")
+    book.save(path)
+    loaded = OpeningBook.load(path)
+    assert len(loaded) == len(book)
+    for board in book_positions(2):
+        move = loaded.probe(board)
+        assert move is not None
+        assert move == book.probe(board)
+        assert move in board.legal_move_list()
+
+
+def test_book_stores_packed_moves(book: OpeningBook) -> None:
+    """Book moves are the moves' start, destination and captured squares."""
+    board = CheckersBitboard()
+    move = book.probe(board)
+    value = book.find(board.zobrist_key)
+    assert move is not None
+    assert value is not None
+    assert int(value["move"]) == move & BOOK_MOVE_MASK
+
+
+def test_book_ignores_illegal_moves() -> None:
+    """A stored move that is not legal in the position is not played."""
+    board = CheckersBitboard()
+    impossible = 31 << DST_SHIFT  # from square 0 to square 31
+    book = OpeningBook.from_records({board.zobrist_key: (impossible, 1)})
+    assert book.probe(board) is None
+
+
+def test_book_skips_shallower_moves(book: OpeningBook) -> None:
+    """Moves searched shallower than asked for count as not in the book."""
+    board = CheckersBitboard()
+    assert book.probe(board, 2) == book.probe(board)
+    assert book.probe(board, 3) is None
+
+
+def test_engine_plays_book_moves_of_its_depth(book: OpeningBook) -> None:
+    """A deeper fixed-depth engine searches; one with a time budget uses the book."""
+    for engine, hits in [
+        (CheckersEngine(2, book=book, collect_stats=True), 1),
+        (CheckersEngine(3, book=book, collect_stats=True), 0),
+        (CheckersEngine(3, book=book, time_budget_ms=50, collect_stats=True), 1),
+    ]:
+        stats = engine.search(CheckersBitboard()).stats
+        assert stats is not None
+        assert stats.book_hits == hits
+
+
+def test_endgame_checks_occupied_squares(endgame: EndgameDatabase) -> None:
+    """A record of another position under the same key is not used."""
+    board = CheckersBitboard(1 << 21, 0, 1 << 17, 0)
+    other = CheckersBitboard(1 << 22, 0, 1 << 17, 0)
+    value = endgame.find(board.zobrist_key)
+    assert value is not None
+    collided = EndgameDatabase.from_records({
+        other.zobrist_key: (
+            int(value["result"]),
+            int(value["plies"]),
+            int(value["occupied"]),
+        )
+    })
+    assert endgame.probe(other) is not None
+    assert collided.probe(other) is None
+
+
+def test_load_rejects_other_files(endgame: EndgameDatabase, tmp_path: Path) -> None:
+    """An endgame database is not an opening book."""
+    path = str(tmp_path / "endgame.bin")
+    endgame.save(path)
+    with pytest.raises(ValueError):
+        OpeningBook.load(path)
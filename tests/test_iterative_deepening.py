@@ -0,0 +1,63 @@
+import time
+from math import inf
+
+import pytest
+from draughts.boards.american import Board
+
+from ai_project.checkers.engine import CheckersEngine
+from ai_project.engine import AbstractPlayer
+from ai_project.tic_tac_toe.board import TttBoard
+from ai_project.tic_tac_toe.engine import TttEngine
+
+
+def solved_values(board: TttBoard) -> dict[int, float]:
+    """Value of every move for the side to move, by a full-depth search."""
+    engine = TttEngine(9, tt_size_mb=0)
+    is_min_turn = board.turn.value == AbstractPlayer.MIN
+    values = {}
+    for move in list(board.legal_moves):
+        board.push(move)
+        values[move] = -engine.alpha_beta(
+            board, 9, -inf, inf, is_min_turn=not is_min_turn
+        )
+        board.pop()
+    return values
+
+
+def test_budget_is_respected() -> None:
+    """The search returns soon after its budget runs out, with a legal move."""
+    board = Board()
+    start = time.perf_counter()
+    move = CheckersEngine(1, time_budget_ms=200).get_best_move(board)
+    assert time.perf_counter() - start < 0.5
+    assert move in list(board.legal_moves)
+
+
+def test_deepens_past_the_first_depth(capsys: pytest.CaptureFixture[str]) -> None:
+    """Each completed depth is reported in debug mode."""
+    CheckersEngine(1, time_budget_ms=300, debug=True).get_best_move(Board())
+    out = capsys.readouterr().out
+    assert "Depth 1:" in out
+    assert "Depth 2:" in out
+
+
+def test_solved_game_stops_deepening() -> None:
+    """A solved tic-tac-toe position ends the search early, with a winning move."""
+    board = TttBoard()
+    board.push(4)
+    board.push(1)  # an edge reply to the center loses
+    start = time.perf_counter()
+    move = TttEngine(1, time_budget_ms=5000).get_best_move(board)
+    assert time.perf_counter() - start < 2.5
+    values = solved_values(board)
+    assert values[move] == max(values.values()) == inf
+
+
+def test_aborted_search_restores_the_board() -> None:
+    """A search cut short returns a legal move and leaves the board as it was."""
+    board = TttBoard()
+    board.push(0)
+    before = (list(board), board.turn, board.zobrist_key)
+    move = TttEngine(1, time_budget_ms=1e-3, tt_size_mb=0).get_best_move(board)
+    assert move in list(board.legal_moves)
+    assert (list(board), board.turn, board.zobrist_key) == before
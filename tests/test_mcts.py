@@ -0,0 +1,100 @@
+import pytest
+from draughts.boards.american import Board
+from draughts.move import Move
+
+from ai_project.checkers.engine import CheckersEngine
+from ai_project.mcts import MctsEngine
+from ai_project.tic_tac_toe.bitboard import TttBitboard
+from ai_project.tic_tac_toe.engine import TttEngine
+
+CORNERS_AND_CENTER = {0, 2, 4, 6, 8}
+
+
+def play(*moves: int) -> TttBitboard:
+    """A tic-tac-toe board after ``moves``."""
+    board = TttBitboard()
+    for move in moves:
+        board.push(move)
+    return board
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"iterations": 0},
+        {"time_budget_ms": 0},
+        {"exploration": -1},
+        {"prior_weight": 2},
+        {"playout_plies": -1},
+        {"evaluation_scale": 0},
+        {"workers": 0},
+    ],
+)
+def test_rejects_bad_arguments(kwargs: dict) -> None:
+    """Out-of-range settings raise a ValueError."""
+    with pytest.raises(ValueError):
+        MctsEngine(TttEngine(1), **kwargs)
+
+
+def test_takes_a_win() -> None:
+    """With a line to complete, the engine completes it."""
+    board = play(0, 3, 1, 4)
+    assert MctsEngine(TttEngine(1), iterations=500, seed=0).get_best_move(board) == 2
+
+
+def test_blocks_a_loss() -> None:
+    """With the opponent about to complete a line, the engine blocks it."""
+    board = play(0, 3, 8, 4)
+    assert MctsEngine(TttEngine(1), iterations=500, seed=0).get_best_move(board) == 5
+
+
+def test_seed_makes_searches_reproducible() -> None:
+    """Engines with the same seed play the same move after the same playouts."""
+    results = []
+    for _ in range(2):
+        engine = MctsEngine(TttEngine(1), iterations=200, collect_stats=True, seed=3)
+        move, stats = engine.search(TttBitboard())
+        assert stats is not None
+        results.append((move, stats.playouts, stats.nodes))
+    assert results[0] == results[1]
+    assert results[0][1] == 200
+
+
+def test_reuses_the_tree_of_the_reply() -> None:
+    """After the engine's move and a reply, the search starts from their subtree."""
+    engine = MctsEngine(TttEngine(1), iterations=300, collect_stats=True, seed=0)
+    board = TttBitboard()
+    move = engine.get_best_move(board)
+    board.push(move)
+    board.push(next(square for square in range(9) if square != move))
+    stats = engine.search(board).stats
+    assert stats is not None
+    assert stats.reused_visits > 0
+    engine.reuse_tree = False
+    engine._root = None
+    stats = engine.search(board).stats
+    assert stats is not None
+    assert stats.reused_visits == 0
+
+
+def test_honours_the_engine_randomness() -> None:
+    """At randomness 100, every move is the wrapped engine's random move."""
+    moves = []
+    for seed in range(20):
+        engine = MctsEngine(
+            TttEngine(1, randomness=100, seed=seed), iterations=200, seed=seed
+        )
+        expected = TttEngine(1, randomness=100, seed=seed)._maybe_random_root_move(
+            TttBitboard()
+        )
+        moves.append(engine.get_best_move(TttBitboard()))
+        assert moves[-1] == expected
+    assert not set(moves) <= CORNERS_AND_CENTER
+
+
+def test_plays_draughts_moves_on_draughts_boards() -> None:
+    """Given a `py-draughts` board, the engine answers with one of its moves."""
+    board = Board()
+    move = MctsEngine(CheckersEngine(1), iterations=100, seed=0).get_best_move(board)
+    assert isinstance(move, Move)
+    assert move in board.legal_moves
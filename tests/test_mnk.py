@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from ai_project.mnk.board import DIRECTIONS, MnkBoard, line_value
+from ai_project.mnk.engine import MnkEngine
+from ai_project.tic_tac_toe.bitboard import TttBitboard
+from ai_project.tic_tac_toe.engine import TttEngine
+
+
+def line_masks(board: MnkBoard) -> list[int]:
+    """Masks of the cells of every line of ``k`` cells on the board."""
+    masks = []
+    for row in range(board.rows):
+        for col in range(board.cols):
+            for row_step, col_step in DIRECTIONS:
+                cells = [
+                    (row + row_step * i, col + col_step * i) for i in range(board.k)
+                ]
+                if all(0 <= r < board.rows and 0 <= c < board.cols for r, c in cells):
+                    masks.append(sum(1 << (r * board.cols + c) for r, c in cells))
+    return masks
+
+
+def recount(board: MnkBoard) -> tuple[int, bool]:
+    """The score of every line counted from scratch, and whether one is complete."""
+    score = 0
+    complete = False
+    for mask in line_masks(board):
+        x_marks = (board.x_mask & mask).bit_count()
+        o_marks = (board.o_mask & mask).bit_count()
+        score += line_value(x_marks, o_marks)
+        complete |= board.k in (x_marks, o_marks)
+    return score, complete
+
+
+@pytest.mark.parametrize(("rows", "cols", "k"), [(3, 3, 3), (6, 7, 4), (15, 15, 5)])
+def test_incremental_score_matches_recount(rows: int, cols: int, k: int) -> None:
+    """The score kept by push and pop equals a full recount of the lines."""
+    rng = random.Random(rows * cols + k)
+    for _ in range(3):
+        board = MnkBoard(rows, cols, k)
+        plies = 0
+        while not board.game_over:
+            board.push(rng.choice(board.legal_move_list()))
+            plies += 1
+            assert (board.score, board.is_win_loss) == recount(board)
+        while plies:
+            board.pop()
+            plies -= 1
+            assert (board.score, board.is_win_loss) == recount(board)
+        assert board.zobrist_key == 0
+
+
+def test_three_by_three_scores_like_tic_tac_toe() -> None:
+    """On a 3 by 3 board, the m,n,k-game evaluates like tic-tac-toe."""
+    rng = random.Random(0)
+    mnk_engine, ttt_engine = MnkEngine(1), TttEngine(1)
+    for _ in range(50):
+        mnk, ttt = MnkBoard(3, 3, 3), TttBitboard()
+        while not mnk.game_over:
+            move = rng.choice(mnk.legal_move_list())
+            mnk.push(move)
+            ttt.push(move)
+            if not mnk.game_over:  # tic-tac-toe only evaluates unfinished games
+                assert mnk_engine.evaluate(mnk) == ttt_engine.evaluate(ttt)
+
+
+def test_engine_takes_a_win() -> None:
+    """The engine completes its own line rather than blocking."""
+    board = MnkBoard(7, 7, 4)
+    for move in (0, 24, 1, 25, 2, 26):  # both players have three in a row
+        board.push(move)
+    assert MnkEngine(2).get_best_move(board) == 3
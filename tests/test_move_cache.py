@@ -0,0 +1,61 @@
+from typing import Any
+
+import pytest
+
+from ai_project.board import AbstractBoard
+from ai_project.checkers.bitboard import CheckersBitboard
+from ai_project.checkers.engine import CheckersEngine
+from ai_project.tic_tac_toe.board import TttBoard, TttMark
+
+BOARD_TYPES = [CheckersBitboard, TttBoard]
+
+
+@pytest.mark.parametrize("board_type", BOARD_TYPES)
+def test_moves_are_generated_once_per_position(board_type: type) -> None:
+    """Repeated queries of a position share one move generation."""
+    board: AbstractBoard[Any] = board_type()
+    moves = board.legal_move_list()
+    assert moves == list(board.legal_moves)
+    assert board.has_legal_moves
+    assert not board.game_over
+    assert board.legal_move_list() is moves
+    assert board.movegen_calls == 1
+
+
+@pytest.mark.parametrize("board_type", BOARD_TYPES)
+def test_push_and_pop_invalidate_the_cache(board_type: type) -> None:
+    """Every position gets its own moves."""
+    board: AbstractBoard[Any] = board_type()
+    moves = list(board.legal_move_list())
+    board.push(moves[0])
+    assert board.legal_move_list() == list(board.legal_moves)
+    assert board.legal_move_list() != moves
+    board.pop()
+    assert board.legal_move_list() == moves
+
+
+def test_bitboard_keeps_the_parent_list_on_pop() -> None:
+    """Popping back to a position does not generate its moves again."""
+    board = CheckersBitboard()
+    moves = board.legal_move_list()
+    board.push(moves[0])
+    board.legal_move_list()
+    board.pop()
+    assert board.legal_move_list() is moves
+    assert board.movegen_calls == 2
+
+
+def test_setting_a_mark_invalidates_the_cache() -> None:
+    """Tic-tac-toe marks set directly change the moves too."""
+    board = TttBoard()
+    board.legal_move_list()
+    board[4] = TttMark.x
+    assert 4 not in board.legal_move_list()
+
+
+def test_search_generates_moves_once_per_node() -> None:
+    """Each searched position generates its moves at most once."""
+    board = CheckersBitboard()
+    engine = CheckersEngine(5, tt_size_mb=0)
+    engine.get_best_move(board)
+    assert 0 < board.movegen_calls <= engine._nodes + 1  # the root is not counted
@@ -0,0 +1,57 @@
+from math import inf
+
+from ai_project.checkers.bitboard import CheckersBitboard
+from ai_project.checkers.engine import CheckersEngine
+from ai_project.engine import AbstractPlayer
+from ai_project.tic_tac_toe.bitboard import TttBitboard
+from ai_project.tic_tac_toe.engine import TttEngine
+
+
+def test_ordering_keeps_values_and_saves_nodes(
+    checkers_positions: list[CheckersBitboard],
+) -> None:
+    """Killers and history change which nodes are searched, not the values."""
+    totals = {True: 0, False: 0}
+    for board in checkers_positions[::100]:
+        if board.game_over:
+            continue
+        is_min_turn = board.turn.value == AbstractPlayer.MIN
+        values = set()
+        for dynamic_ordering in totals:
+            engine = CheckersEngine(6, tt_size_mb=0, dynamic_ordering=dynamic_ordering)
+            values.add(engine.alpha_beta(board, 6, -inf, inf, is_min_turn=is_min_turn))
+            totals[dynamic_ordering] += engine._nodes
+        assert len(values) == 1, board
+    assert totals[True] < totals[False]
+
+
+def test_same_moves_with_and_without_ordering() -> None:
+    """A tic-tac-toe self-play game does not depend on the ordering."""
+    engines = [TttEngine(9, dynamic_ordering=flag) for flag in (True, False)]
+    board = TttBitboard()
+    while not board.game_over:
+        move = engines[0].get_best_move(board)
+        assert engines[1].get_best_move(board) == move
+        board.push(move)
+
+
+def test_cutoffs_record_quiet_moves() -> None:
+    """Quiet cutoff moves become killers and earn history; a search resets them."""
+    engine = CheckersEngine(5, tt_size_mb=0)
+    board = CheckersBitboard()
+    engine.alpha_beta(board, 5, -inf, inf)
+    killers = [move for ply in engine._killers for move in ply if move is not None]
+    assert killers
+    assert all(engine.is_quiet(move) for move in killers)
+    assert any(engine._history)
+    engine._reset_ordering()
+    assert all(ply == [None, None] for ply in engine._killers)
+    assert not any(engine._history)
+
+
+def test_captures_are_not_quiet(checkers_positions: list[CheckersBitboard]) -> None:
+    """Only checkers moves that capture nothing are quiet."""
+    engine = CheckersEngine(1)
+    moves = [move for board in checkers_positions for move in board.legal_move_list()]
+    assert any(move.captured for move in moves)
+    assert all(engine.is_quiet(move) == (not move.captured) for move in moves)
@@ -0,0 +1,62 @@
+from ai_project.checkers.bitboard import (
+    BIT,
+    CAPTURED_SHIFT,
+    DST_SHIFT,
+    BitMove,
+    CheckersBitboard,
+)
+
+
+def test_moves_round_trip_through_draughts(
+    checkers_positions: list[CheckersBitboard],
+) -> None:
+    """Every legal move packs and unpacks to the `py-draughts` move's squares."""
+    for board in checkers_positions[::10]:
+        draughts_board = board.to_draughts()
+        draughts_moves = [
+            BitMove.from_draughts(move) for move in draughts_board.legal_moves
+        ]
+        assert sorted(board.legal_move_list()) == sorted(draughts_moves), board
+        for move in board.legal_move_list():
+            draughts_move = board.to_draughts_move(move, draughts_board)
+            assert move.square_list == tuple(draughts_move.square_list)
+            assert move.captured_list == tuple(draughts_move.captured_list)
+            assert BitMove.from_squares(move.square_list) == move
+
+
+def test_fields_are_packed_in_order() -> None:
+    """A move is its start, destination and captured squares, shifted in turn."""
+    quiet = BitMove.from_squares((8, 12))
+    assert quiet == 8 | 12 << DST_SHIFT
+    assert (quiet.src, quiet.dst, quiet.captured) == (8, 12, 0)
+    jump = BitMove.from_squares((8, 17))
+    assert jump.captured == BIT[13]
+    assert jump >> CAPTURED_SHIFT & BIT[13]
+    assert str(jump) == "9x18"
+    assert str(quiet) == "9-13"
+
+
+def test_sorted_moves_follow_the_key(
+    checkers_positions: list[CheckersBitboard],
+) -> None:
+    """The sorted moves are the legal moves in the order of the key."""
+    for board in checkers_positions[::25]:
+        legal = list(board.legal_move_list())
+        moves = board.sorted_move_list(lambda move: -move.dst)
+        assert moves == sorted(legal, key=lambda move: -move.dst)
+        assert board.legal_move_list() == legal  # the shared list is not sorted
+
+
+def test_move_lists_are_reused_per_depth() -> None:
+    """Positions at the same number of pushed moves fill the same list."""
+    board = CheckersBitboard()
+    root_moves = board.legal_move_list()
+    first, second = root_moves[0], root_moves[1]
+    board.push(first)
+    replies = board.legal_move_list()
+    assert replies is not root_moves
+    board.pop()
+    board.push(second)
+    assert board.legal_move_list() is replies
+    board.pop()
+    assert board.legal_move_list() == list(CheckersBitboard().legal_move_list())
@@ -0,0 +1,65 @@
+import time
+from collections.abc import Iterator
+
+import pytest
+
+from ai_project.checkers.bitboard import CheckersBitboard
+from ai_project.checkers.engine import CheckersEngine
+from ai_project.tic_tac_toe.bitboard import TttBitboard
+from ai_project.tic_tac_toe.engine import TttEngine
+
+
+@pytest.fixture(scope="module")
+def parallel_engine() -> Iterator[CheckersEngine]:
+    """A started two-process checkers engine, shared by the tests below."""
+    engine = CheckersEngine(5, workers=2, exact_tt_depth=True)
+    engine.start_workers()
+    yield engine
+    engine.close()
+
+
+def test_parallel_move_equals_serial(
+    parallel_engine: CheckersEngine, checkers_positions: list[CheckersBitboard]
+) -> None:
+    """The workers find the serial search's move in every position."""
+    for board in [CheckersBitboard(), *checkers_positions[::400]]:
+        if board.game_over:
+            continue
+        serial = CheckersEngine(5, exact_tt_depth=True).get_best_move(board)
+        assert parallel_engine.get_best_move(board) == serial, board
+
+
+def test_parallel_game_equals_serial() -> None:
+    """A parallel tic-tac-toe self-play game is the serial one."""
+    serial, parallel = TttEngine(9), TttEngine(9, workers=2)
+    board = TttBitboard()
+    try:
+        while not board.game_over:
+            move = serial.get_best_move(board)
+            assert parallel.get_best_move(board) == move
+            board.push(move)
+    finally:
+        parallel.close()
+
+
+def test_started_workers_keep_the_budget() -> None:
+    """With the workers started beforehand, a move takes about its time budget."""
+    engine = CheckersEngine(1, time_budget_ms=200, workers=2)
+    try:
+        engine.start_workers()
+        pool = engine._pool
+        engine.start_workers()
+        assert engine._pool is pool is not None
+        start = time.perf_counter()
+        engine.get_best_move(CheckersBitboard())
+        assert time.perf_counter() - start < 0.5
+    finally:
+        engine.close()
+    assert engine._pool is None
+
+
+def test_serial_engine_starts_no_workers() -> None:
+    """An engine with one worker searches in its own process."""
+    engine = CheckersEngine(3)
+    engine.start_workers()
+    assert engine._pool is None
@@ -0,0 +1,53 @@
+import pytest
+
+from ai_project.checkers.bitboard import CheckersBitboard
+from ai_project.perft import KNOWN_COUNTS, POSITIONS, divide, make_board, perft
+
+MAX_DEPTH = 6  # deeper counts take too long for the test suite
+
+NAMED_POSITIONS = [
+    (game, position) for game in POSITIONS for position in POSITIONS[game]
+]
+
+
+@pytest.mark.parametrize(("game", "position"), NAMED_POSITIONS)
+def test_bitboard_matches_known_counts(game: str, position: str) -> None:
+    """Perft of the bitboards gives the known counts of every named position."""
+    known = KNOWN_COUNTS[game][position][:MAX_DEPTH]
+    board = make_board(game, "bitboard", position)
+    assert [perft(board, depth) for depth in range(1, len(known) + 1)] == known
+
+
+@pytest.mark.parametrize(("game", "position"), NAMED_POSITIONS)
+def test_hashed_perft_matches_known_counts(game: str, position: str) -> None:
+    """Reusing the counts of transpositions does not change them."""
+    known = KNOWN_COUNTS[game][position][:MAX_DEPTH]
+    board = make_board(game, "bitboard", position)
+    cache: dict[tuple[int, int], int] = {}
+    counts = [perft(board, depth, cache=cache) for depth in range(1, len(known) + 1)]
+    assert counts == known
+
+
+@pytest.mark.parametrize("position", POSITIONS["checkers"])
+def test_bitboard_matches_draughts_at_depth_4(position: str) -> None:
+    """The bitboard and `py-draughts` count the same nodes below every root move."""
+    bitboard = divide(make_board("checkers", "bitboard", position), 4, bulk=False)
+    draughts = divide(make_board("checkers", "draughts", position), 4, bulk=False)
+    assert sorted(bitboard) == sorted(draughts)
+
+
+@pytest.mark.parametrize("position", POSITIONS["tic-tac-toe"])
+def test_tic_tac_toe_bitboard_matches_list_board(position: str) -> None:
+    """Both tic-tac-toe boards count the same nodes below every root move."""
+    bitboard = divide(make_board("tic-tac-toe", "bitboard", position), 4)
+    list_board = divide(make_board("tic-tac-toe", "draughts", position), 4)
+    assert bitboard == list_board
+
+
+def test_perft_restores_the_board() -> None:
+    """Counting leaves the position and its key as they were."""
+    board = make_board("checkers", "bitboard", "kings")
+    assert isinstance(board, CheckersBitboard)
+    before = (board.zobrist_key, board.position, board.turn)
+    perft(board, 3, bulk=False)
+    assert (board.zobrist_key, board.position, board.turn) == before
@@ -0,0 +1,72 @@
+from ai_project.checkers.bitboard import BitMove, CheckersBitboard
+from ai_project.checkers.engine import CheckersEngine
+
+
+def replies(engine: CheckersEngine, board: CheckersBitboard) -> tuple[BitMove, BitMove]:
+    """The opponent's reply the engine ponders on, and another one."""
+    pondered = other = None
+    for reply in board.legal_move_list():
+        board.push(reply)
+        if board.zobrist_key == engine._ponder_key:
+            pondered = reply
+        else:
+            other = reply
+        board.pop()
+    assert pondered is not None
+    assert other is not None
+    return pondered, other
+
+
+def test_ponder_hit_reuses_the_search() -> None:
+    """When the predicted reply is played, the pondered result is returned."""
+    engine = CheckersEngine(5, ponder=True, collect_stats=True)
+    board = CheckersBitboard()
+    move = engine.get_best_move(board)
+    engine.start_pondering(board, move)
+    assert engine._ponder_thread is not None
+    board.push(move)
+    board.push(replies(engine, board)[0])
+    result = engine.search(board)
+    assert result.stats is not None
+    assert result.stats.ponder_hits == 1
+    assert result.stats.ponder_misses == 0
+    assert engine._ponder_thread is None
+    assert result.move == CheckersEngine(5).get_best_move(board)
+
+
+def test_ponder_miss_searches_again() -> None:
+    """Another reply cancels the pondering, which counts as a miss."""
+    engine = CheckersEngine(5, ponder=True, collect_stats=True)
+    board = CheckersBitboard()
+    move = engine.get_best_move(board)
+    engine.start_pondering(board, move)
+    board.push(move)
+    board.push(replies(engine, board)[1])
+    result = engine.search(board)
+    assert result.stats is not None
+    assert result.stats.ponder_hits == 0
+    assert result.stats.ponder_misses == 1
+    assert result.move == CheckersEngine(5).get_best_move(board)
+
+
+def test_stop_pondering_cancels_the_thread() -> None:
+    """A stopped pondering search ends at once and leaves the board alone."""
+    engine = CheckersEngine(30, ponder=True, collect_stats=True)
+    board = CheckersBitboard()
+    move = board.legal_move_list()[0]
+    engine.start_pondering(board, move)
+    thread = engine._ponder_thread
+    assert thread is not None
+    engine.stop_pondering()
+    assert not thread.is_alive()
+    assert engine._ponder_thread is None
+    assert board.zobrist_key == CheckersBitboard().zobrist_key
+    engine.close()
+
+
+def test_no_pondering_unless_enabled() -> None:
+    """Engines created without ``ponder`` never search in the background."""
+    engine = CheckersEngine(5)
+    board = CheckersBitboard()
+    engine.start_pondering(board, engine.get_best_move(board))
+    assert engine._ponder_thread is None
@@ -0,0 +1,125 @@
+import sys
+from math import inf
+
+import pytest
+
+from ai_project.arena import bench_positions
+from ai_project.checkers.bitboard import CheckersBitboard
+from ai_project.checkers.engine import CheckersEngine
+from ai_project.engine import AbstractPlayer, _null_bound
+from ai_project.tic_tac_toe.bitboard import TttBitboard
+from ai_project.tic_tac_toe.engine import TttEngine
+
+
+class WindowRecorder(CheckersEngine):
+    """A checkers engine recording the windows its root moves are searched with."""
+
+    windows: list[tuple[float, float]]
+
+    def alpha_beta(
+        self,
+        board: CheckersBitboard,
+        depth: int,
+        alpha: float,
+        beta: float,
+        *,
+        is_min_turn: bool = False,
+        ply: int = 0,
+    ) -> float:
+        """Record the window of every search of a root move."""
+        if ply == 1:
+            self.windows.append((alpha, beta))
+        return super().alpha_beta(
+            board, depth, alpha, beta, is_min_turn=is_min_turn, ply=ply
+        )
+
+
+def test_null_bound_is_the_next_score() -> None:
+    """The null window of alpha ends one point above it, past -inf and the max."""
+    assert _null_bound(3) == 4
+    assert _null_bound(-inf) == -sys.float_info.max
+    assert _null_bound(sys.float_info.max) == inf
+
+
+def test_null_windows_start_after_the_first_root_move() -> None:
+    """Every root move after the first is tested with a null window first."""
+    engine = WindowRecorder(4, pvs=True, tt_size_mb=0)
+    engine.windows = []
+    board = CheckersBitboard()
+    engine.search(board)
+    first, *others = engine.windows
+    assert first == (-inf, inf)
+    null_windows = [
+        (alpha, beta) for alpha, beta in others if -alpha == _null_bound(-beta)
+    ]
+    assert len(null_windows) == len(board.legal_move_list()) - 1
+
+
+@pytest.mark.parametrize("tt_size_mb", [0, 1])
+def test_pvs_keeps_root_move_and_value(
+    checkers_positions: list[CheckersBitboard], tt_size_mb: float
+) -> None:
+    """Principal variation search finds the move and value of plain alpha-beta."""
+    for board in checkers_positions[::150]:
+        if board.game_over:
+            continue
+        is_min_turn = board.turn.value == AbstractPlayer.MIN
+        results = [
+            CheckersEngine(
+                5, pvs=pvs, tt_size_mb=tt_size_mb, exact_tt_depth=True
+            )._search_root(board, 5, is_min_turn)
+            for pvs in (False, True)
+        ]
+        assert results[0] == results[1], board
+
+
+def test_pvs_keeps_tic_tac_toe_values() -> None:
+    """Every position of a perfect game has the same value with and without PVS."""
+    board = TttBitboard()
+    while not board.game_over:
+        is_min_turn = board.turn.value == AbstractPlayer.MIN
+        results = [
+            TttEngine(9, pvs=pvs, tt_size_mb=0)._search_root(board, 9, is_min_turn)
+            for pvs in (False, True)
+        ]
+        assert results[0] == results[1]
+        move, _ = results[0]
+        assert move is not None
+        board.push(move)
+
+
+def test_pvs_saves_nodes_with_the_same_value() -> None:
+    """On the checkers bench positions, PVS searches fewer nodes for the same result."""
+    nodes = {}
+    moves = {}
+    for pvs in (False, True):
+        nodes[pvs] = 0
+        moves[pvs] = []
+        for board in bench_positions("checkers"):
+            assert isinstance(board, CheckersBitboard)
+            engine = CheckersEngine(6, pvs=pvs)
+            moves[pvs].append(engine.search(board).move)
+            nodes[pvs] += engine._nodes
+    assert moves[True] == moves[False]
+    assert nodes[True] < nodes[False]
+
+
+@pytest.mark.parametrize("previous_offset", [0, 3, 100])
+def test_aspiration_keeps_move_and_value(
+    checkers_positions: list[CheckersBitboard], previous_offset: int
+) -> None:
+    """A window around the true value or away from it gives the same result."""
+    for board in checkers_positions[::300]:
+        if board.game_over:
+            continue
+        is_min_turn = board.turn.value == AbstractPlayer.MIN
+        expected = CheckersEngine(4, tt_size_mb=0)._search_root(board, 4, is_min_turn)
+        if abs(expected[1]) == inf:
+            continue
+        engine = CheckersEngine(
+            4, aspiration_window=2, tt_size_mb=0, collect_stats=True
+        )
+        result = engine._aspiration_search(
+            board, 4, is_min_turn, expected[1] + previous_offset
+        )
+        assert result == expected, board
@@ -0,0 +1,92 @@
+from math import inf
+
+from ai_project.checkers.bitboard import CheckersBitboard
+from ai_project.checkers.engine import CheckersEngine
+from ai_project.engine import AbstractPlayer
+from ai_project.tic_tac_toe.bitboard import TttBitboard
+from ai_project.tic_tac_toe.engine import TttEngine
+
+UNLIMITED = 10**9
+
+
+def capture_search(
+    engine: CheckersEngine, board: CheckersBitboard, is_min_turn: bool
+) -> float:
+    """Best of standing pat and every capture, searched to the end without pruning."""
+    if board.game_over:
+        return engine.terminal_score(board)
+    best = engine._leaf_score(board, is_min_turn)
+    for move in board.legal_move_list():
+        if move.captured:
+            board.push(move)
+            best = max(best, -capture_search(engine, board, not is_min_turn))
+            board.pop()
+    return best
+
+
+def non_terminal(positions: list[CheckersBitboard]) -> list[CheckersBitboard]:
+    """The positions whose game is not over."""
+    return [board for board in positions if not board.game_over]
+
+
+def test_quiescence_matches_full_capture_search(
+    checkers_positions: list[CheckersBitboard],
+) -> None:
+    """With no budget limit, pruning does not change the value of the captures."""
+    engine = CheckersEngine(1, quiescence_nodes=UNLIMITED)
+    positions = [
+        board
+        for board in non_terminal(checkers_positions)
+        if any(move.captured for move in board.legal_move_list())
+    ]
+    assert positions
+    for board in positions[::10]:
+        is_min_turn = board.turn.value == AbstractPlayer.MIN
+        engine._quiescence_left = UNLIMITED
+        value = engine.quiescence(board, -inf, inf, is_min_turn=is_min_turn)
+        assert value == capture_search(engine, board, is_min_turn), board
+
+
+def test_quiet_positions_score_their_evaluation(
+    checkers_positions: list[CheckersBitboard],
+) -> None:
+    """Without captures, a horizon position scores its static evaluation."""
+    engine = CheckersEngine(1, quiescence_nodes=64)
+    for board in non_terminal(checkers_positions)[::20]:
+        if any(move.captured for move in board.legal_move_list()):
+            continue
+        is_min_turn = board.turn.value == AbstractPlayer.MIN
+        assert engine.alpha_beta(
+            board, 0, -inf, inf, is_min_turn=is_min_turn
+        ) == engine._leaf_score(board, is_min_turn)
+
+
+def test_budget_limits_each_horizon_position(
+    checkers_positions: list[CheckersBitboard],
+) -> None:
+    """A horizon position searches at most its budget of capture nodes."""
+    for board in non_terminal(checkers_positions)[::50]:
+        engine = CheckersEngine(1, quiescence_nodes=2)
+        is_min_turn = board.turn.value == AbstractPlayer.MIN
+        engine.alpha_beta(board, 0, -inf, inf, is_min_turn=is_min_turn)
+        assert engine._nodes <= 1 + 2  # the horizon position and its budget
+
+
+def test_quiescence_nodes_are_counted_apart() -> None:
+    """Quiescence nodes count toward the nodes, but not toward any ply."""
+    engine = CheckersEngine(6, quiescence_nodes=64, collect_stats=True)
+    _, stats = engine.search(CheckersBitboard())
+    assert stats is not None
+    assert stats.quiescence_nodes > 0
+    assert sum(stats.nodes_per_ply) + stats.quiescence_nodes == stats.nodes
+
+
+def test_tic_tac_toe_is_unaffected() -> None:
+    """Tic-tac-toe has no captures, so quiescence does not change its search."""
+    board = TttBitboard()
+    board.push(4)
+    results = []
+    for quiescence_nodes in (0, 64):
+        engine = TttEngine(4, quiescence_nodes=quiescence_nodes, tt_size_mb=0)
+        results.append((engine.get_best_move(board), engine._nodes))
+    assert results[0] == results[1]
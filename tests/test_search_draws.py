@@ -0,0 +1,96 @@
+import random
+from math import inf
+
+from ai_project.checkers.bitboard import NO_PROGRESS_PLIES, BitMove, CheckersBitboard
+from ai_project.checkers.engine import CheckersEngine
+from ai_project.engine import AbstractPlayer
+
+
+def kings() -> CheckersBitboard:
+    """A white king against a black king, free to move back and forth."""
+    return CheckersBitboard(0, 1 << 21, 0, 1 << 10)
+
+
+def shuffle(board: CheckersBitboard) -> list[BitMove]:
+    """Play both kings away and back, so the position repeats; return the moves."""
+    moves = []
+    for _ in range(2):
+        move = board.legal_move_list()[0]
+        moves.append(move)
+        board.push(move)
+    for move in moves[:]:
+        back = BitMove.from_squares((move.dst, move.src))
+        moves.append(back)
+        board.push(back)
+    return moves
+
+
+def test_repetitions_match_a_replay() -> None:
+    """The occurrence counts match the keys of the positions played so far."""
+    rng = random.Random(0)
+    for _ in range(20):
+        board = CheckersBitboard()
+        keys = [board.zobrist_key]
+        while not board.game_over and len(keys) < 200:
+            board.push(rng.choice(board.legal_move_list()))
+            keys.append(board.zobrist_key)
+            assert board.repetitions == keys.count(board.zobrist_key) - 1
+        while keys[1:]:
+            board.pop()
+            keys.pop()
+            assert board.repetitions == keys.count(board.zobrist_key) - 1
+        assert board._key_counts == {board.zobrist_key: 1}
+
+
+def test_shuffling_kings_repeat_the_position() -> None:
+    """Moving both kings away and back repeats the position once."""
+    board = kings()
+    shuffle(board)
+    assert board.repetitions == 1
+    board.pop()
+    assert board.repetitions == 0
+
+
+def test_conversion_keeps_the_repetitions() -> None:
+    """A `py-draughts` board's positions since the last man move are counted."""
+    board = kings()
+    draughts_board = board.to_draughts()
+    for move in shuffle(board):
+        draughts_board.push(board.to_draughts_move(move, draughts_board))
+    assert CheckersBitboard.from_draughts(draughts_board).repetitions == 1
+
+
+def test_no_progress_after_the_ply_limit() -> None:
+    """Only `NO_PROGRESS_PLIES` plies without progress draw the position."""
+    board = kings()
+    board.halfmove_clock = NO_PROGRESS_PLIES - 1
+    assert not board.is_no_progress
+    board.halfmove_clock = NO_PROGRESS_PLIES
+    assert board.is_no_progress
+
+
+def test_repeated_positions_score_as_draws() -> None:
+    """With ``detect_draws``, a repeated position inside the tree scores 0."""
+    board = kings()
+    shuffle(board)
+    is_min_turn = board.turn.value == AbstractPlayer.MIN
+    values = [
+        CheckersEngine(4, detect_draws=detect_draws, tt_size_mb=0).alpha_beta(
+            board, 4, -inf, inf, is_min_turn=is_min_turn, ply=1
+        )
+        for detect_draws in (False, True)
+    ]
+    assert values[0] != 0
+    assert values[1] == 0
+
+
+def test_draws_are_counted_only_when_detected() -> None:
+    """Search draws are found in king endgames, and only with ``detect_draws``."""
+    draws = {}
+    for detect_draws in (False, True):
+        engine = CheckersEngine(6, detect_draws=detect_draws, collect_stats=True)
+        stats = engine.search(kings()).stats
+        assert stats is not None
+        draws[detect_draws] = stats.search_draws
+    assert draws[False] == 0
+    assert draws[True] > 0
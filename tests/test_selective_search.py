@@ -0,0 +1,81 @@
+import pytest
+
+from ai_project.checkers.bitboard import CheckersBitboard
+from ai_project.checkers.engine import CheckersEngine
+from ai_project.engine import AbstractPlayer
+from ai_project.tic_tac_toe.bitboard import TttBitboard
+from ai_project.tic_tac_toe.engine import TttEngine
+
+OPTIONS = [(1, 0, 0), (0, 1, 0), (0, 0, 1), (1, 1, 1)]
+
+
+@pytest.mark.parametrize("options", [(-1, 0, 0), (0, -1, 0), (0, 0, -1)])
+def test_rejects_negative_options(options: tuple[int, int, int]) -> None:
+    """Negative move counts and margins raise a ValueError."""
+    lmr_moves, futility_margin, razor_margin = options
+    with pytest.raises(ValueError):
+        CheckersEngine(
+            4,
+            lmr_moves=lmr_moves,
+            futility_margin=futility_margin,
+            razor_margin=razor_margin,
+        )
+
+
+@pytest.mark.parametrize("options", OPTIONS)
+def test_selective_search_takes_a_win(
+    checkers_positions: list[CheckersBitboard], options: tuple[int, int, int]
+) -> None:
+    """A move that ends the game is never reduced or pruned away."""
+    positions = []
+    for board in checkers_positions:
+        if board.game_over:
+            continue
+        for move in board.legal_move_list():
+            board.push(move)
+            game_over = board.game_over
+            board.pop()
+            if game_over:
+                positions.append(board)
+                break
+    assert positions
+    for board in positions:
+        is_min_turn = board.turn.value == AbstractPlayer.MIN
+        lmr_moves, futility_margin, razor_margin = options
+        engine = CheckersEngine(
+            6,
+            tt_size_mb=0,
+            lmr_moves=lmr_moves,
+            futility_margin=futility_margin,
+            razor_margin=razor_margin,
+        )
+        move, _ = engine._search_root(board, 6, is_min_turn)
+        assert move is not None
+        board.push(move)
+        assert board.game_over, board
+        board.pop()
+
+
+def test_selective_tic_tac_toe_still_draws() -> None:
+    """Self-play of a fully selective engine keeps the perfect-play draw."""
+    engine = TttEngine(9, tt_size_mb=0, lmr_moves=1, futility_margin=1, razor_margin=1)
+    board = TttBitboard()
+    while not board.game_over:
+        board.push(engine.get_best_move(board))
+    assert board.is_draw
+
+
+def test_selective_search_searches_fewer_nodes() -> None:
+    """Each option prunes the opening search and counts what it did."""
+    plain = CheckersEngine(6, collect_stats=True)
+    plain.search(CheckersBitboard())
+    engine = CheckersEngine(
+        6, collect_stats=True, lmr_moves=1, futility_margin=1, razor_margin=1
+    )
+    stats = engine.search(CheckersBitboard()).stats
+    assert stats is not None
+    assert engine._nodes < plain._nodes
+    assert stats.lmr_reductions > 0
+    assert stats.lmr_researches <= stats.lmr_reductions
+    assert stats.futility_prunes > 0
+    assert stats.razorings > 0
@@ -0,0 +1,160 @@
+import asyncio
+import time
+from collections.abc import Callable
+from types import SimpleNamespace
+
+import pytest
+
+from ai_project.arena import EngineConfig
+from ai_project.checkers.bitboard import CheckersBitboard
+from ai_project.checkers.engine import CheckersEngine
+from ai_project.perft import make_board
+from ai_project.service import DEADLINE_GRACE_S, EngineService, ServiceBusy
+
+ENDLESS = EngineConfig(50, tt_size_mb=1.0)  # searches until cancelled or timed out
+
+
+async def wait_until(condition: Callable[[], bool], timeout: float = 60) -> None:
+    """Poll ``condition`` on the event loop until it holds."""
+    end = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < end, "condition not reached in time"
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_full_service_rejects_or_times_out_requests() -> None:
+    """With every slot taken, requests fail fast or when their deadline passes."""
+    board = make_board("checkers", "bitboard")
+    async with EngineService("checkers", ENDLESS, max_pending=1) as service:
+        running = asyncio.create_task(service.best_move(board))
+        await wait_until(lambda: service.pending == 1)
+
+        with pytest.raises(ServiceBusy):
+            await service.best_move(board, wait=False)
+        assert service.rejected == 1
+        with pytest.raises(TimeoutError):
+            await service.best_move(board, deadline_ms=100)
+        assert service.pending == 1
+
+        running.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await running
+        assert service.cancelled == 1
+        await wait_until(lambda: service.pending == 0)  # the search stopped
+
+
+@pytest.mark.asyncio
+async def test_waiting_request_gets_the_freed_slot() -> None:
+    """A request waits for the slot of the one before it, then is answered."""
+    board = make_board("checkers", "bitboard")
+    async with EngineService("checkers", ENDLESS, max_pending=1) as service:
+        first, second = await asyncio.gather(
+            service.best_move(board, deadline_ms=300),
+            service.best_move(board, deadline_ms=3000),
+        )
+        legal = board.legal_move_list()
+        assert first.move in legal
+        assert second.move in legal
+        assert service.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_deadline_answers_with_best_move_so_far() -> None:
+    """A search past its deadline is answered in time with a legal move."""
+    board = make_board("checkers", "bitboard")
+    async with EngineService("checkers", ENDLESS) as service:
+        await service.best_move(board, deadline_ms=100)  # start up the worker
+        start = time.monotonic()
+        result = await service.best_move(board, deadline_ms=300)
+        assert time.monotonic() - start < 0.3 + DEADLINE_GRACE_S
+        assert result.move in board.legal_move_list()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_request_frees_its_slot_for_the_next() -> None:
+    """Cancelling a search lets a request that must not wait take its slot."""
+    board = make_board("tic-tac-toe", "bitboard")
+    async with EngineService("tic-tac-toe", EngineConfig(9), max_pending=1) as service:
+        request = asyncio.create_task(service.best_move(board))
+        await asyncio.sleep(0)
+        request.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await request
+        await wait_until(lambda: service.pending == 0)
+        result = await service.best_move(board, wait=False)
+        assert result.move in board.legal_move_list()
+
+
+@pytest.mark.asyncio
+async def test_failed_submit_frees_its_slot(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A request the pool refuses does not keep its slot."""
+    board = make_board("tic-tac-toe", "bitboard")
+    async with EngineService("tic-tac-toe", EngineConfig(2), max_pending=1) as service:
+
+        def broken_submit(*args: object, **kwargs: object) -> None:
+            raise RuntimeError("cannot schedule new futures")
+
+        monkeypatch.setattr(service._pool, "submit", broken_submit)
+        with pytest.raises(RuntimeError):
+            await service.best_move(board)
+        assert service.pending == 0
+        monkeypatch.undo()
+        result = await service.best_move(board, wait=False)
+        assert result.move in board.legal_move_list()
+
+
+@pytest.mark.asyncio
+async def test_requests_need_a_started_service() -> None:
+    """A service that is not started refuses requests."""
+    service = EngineService("tic-tac-toe", EngineConfig(2))
+    with pytest.raises(RuntimeError):
+        await service.best_move(make_board("tic-tac-toe", "bitboard"))
+
+
+def test_max_pending_must_cover_workers() -> None:
+    """Every worker needs a slot."""
+    with pytest.raises(ValueError):
+        EngineService("tic-tac-toe", EngineConfig(2), workers=2, max_pending=1)
+
+
+def test_time_limit_never_lengthens_a_search() -> None:
+    """A fixed-depth search well within its time limit ends at its own depth."""
+    board = CheckersBitboard()
+    engine = CheckersEngine(2, collect_stats=True)
+    start = time.perf_counter()
+    result = engine.search_cancellable(board, SimpleNamespace(value=False), 300)
+    assert time.perf_counter() - start < 0.1
+    assert result is not None
+    assert result.stats is not None
+    assert max(depth.depth for depth in result.stats.depths) == 2
+    assert result.move == CheckersEngine(2).get_best_move(board)
+
+
+def test_time_limit_stops_a_deep_search() -> None:
+    """A search longer than its time limit returns its deepest completed iteration."""
+    board = CheckersBitboard()
+    engine = CheckersEngine(50, collect_stats=True)
+    start = time.perf_counter()
+    result = engine.search_cancellable(board, SimpleNamespace(value=False), 200)
+    assert time.perf_counter() - start < 0.4
+    assert result is not None
+    assert result.move in board.legal_move_list()
+    assert engine._time_limit is None
+
+
+def test_time_budget_within_the_limit_is_kept() -> None:
+    """An engine's own time budget ends its search before a later limit."""
+    engine = CheckersEngine(1, time_budget_ms=50)
+    start = time.perf_counter()
+    engine.search_cancellable(CheckersBitboard(), SimpleNamespace(value=False), 5000)
+    assert time.perf_counter() - start < 0.3
+
+
+def test_cancelled_search_returns_nothing() -> None:
+    """A search whose flag is set returns no result."""
+    engine = CheckersEngine(50)
+    assert (
+        engine.search_cancellable(CheckersBitboard(), SimpleNamespace(value=True))
+        is None
+    )
@@ -0,0 +1,155 @@
+from functools import cache
+from pathlib import Path
+
+import pytest
+
+from ai_project.tic_tac_toe.bitboard import TttBitboard
+from ai_project.tic_tac_toe.engine import TttEngine
+from ai_project.tic_tac_toe.solver import SYMMETRIES, WIN_SCORE, SolvedTable
+
+LINES = [
+    (0, 1, 2),
+    (3, 4, 5),
+    (6, 7, 8),
+    (0, 3, 6),
+    (1, 4, 7),
+    (2, 5, 8),
+    (0, 4, 8),
+    (2, 4, 6),
+]
+
+
+def has_line(mask: int) -> bool:
+    """Whether the marks of ``mask`` complete a line."""
+    return any(all(mask >> i & 1 for i in line) for line in LINES)
+
+
+@cache
+def outcome(mover: int, waiter: int) -> tuple[int, int]:
+    """Result (1, 0 or -1) and plies left of a position for the side to move.
+
+    Wins are taken as fast as possible and losses delayed as long as possible.
+    """
+    if has_line(waiter):
+        return -1, 0
+    if mover | waiter == 0x1FF:
+        return 0, 0
+    return max(
+        (
+            move_outcome(mover, waiter, move)
+            for move in range(9)
+            if not (mover | waiter) >> move & 1
+        ),
+        key=lambda result: (result[0], -result[1] if result[0] > 0 else result[1]),
+    )
+
+
+def move_outcome(mover: int, waiter: int, move: int) -> tuple[int, int]:
+    """Result and plies left after ``move``, for the side making it."""
+    result, plies = outcome(waiter, mover | 1 << move)
+    return -result, plies + 1
+
+
+def expected_scores(x_mask: int, o_mask: int) -> dict[int, int]:
+    """Score of every legal move, in the units of `SolvedTable`."""
+    x_to_move = x_mask.bit_count() == o_mask.bit_count()
+    mover, waiter = (x_mask, o_mask) if x_to_move else (o_mask, x_mask)
+    scores = {}
+    for move in range(9):
+        if not (x_mask | o_mask) >> move & 1:
+            result, plies = move_outcome(mover, waiter, move)
+            scores[move] = result * (WIN_SCORE - plies)
+    return scores
+
+
+def reachable() -> list[tuple[int, int]]:
+    """Masks of every non-terminal position reachable from the empty board."""
+    positions = set()
+
+    def visit(x_mask: int, o_mask: int) -> None:
+        if has_line(x_mask) or has_line(o_mask) or x_mask | o_mask == 0x1FF:
+            return
+        if (x_mask, o_mask) in positions:
+            return
+        positions.add((x_mask, o_mask))
+        x_to_move = x_mask.bit_count() == o_mask.bit_count()
+        for move in range(9):
+            if not (x_mask | o_mask) >> move & 1:
+                if x_to_move:
+                    visit(x_mask | 1 << move, o_mask)
+                else:
+                    visit(x_mask, o_mask | 1 << move)
+
+    visit(0, 0)
+    return sorted(positions)
+
+
+def transform(mask: int, perm: tuple[int, ...]) -> int:
+    """Apply a symmetry: square ``i`` gets the mark of square ``perm[i]``."""
+    return sum(1 << i for i in range(9) if mask >> perm[i] & 1)
+
+
+@pytest.fixture(scope="module")
+def table() -> SolvedTable:
+    """The solved table of tic-tac-toe."""
+    return SolvedTable.solve()
+
+
+def test_scores_match_exhaustive_search(table: SolvedTable) -> None:
+    """Every move of every reachable position has its perfect-play score."""
+    positions = reachable()
+    assert len(positions) == 4520
+    for x_mask, o_mask in positions:
+        assert table.move_scores(x_mask, o_mask) == expected_scores(x_mask, o_mask)
+
+
+def test_empty_board_is_a_draw(table: SolvedTable) -> None:
+    """No first move wins or loses."""
+    assert set(table.move_scores(0, 0).values()) == {0}
+
+
+def test_finished_games_have_no_moves(table: SolvedTable) -> None:
+    """Positions after a completed line are not in the table."""
+    assert table.move_scores(0b111, 0b11000) == {}
+
+
+def test_symmetries_are_distinct() -> None:
+    """The 8 symmetries of the board are different permutations."""
+    assert len(set(SYMMETRIES)) == 8
+    assert all(sorted(perm) == list(range(9)) for perm in SYMMETRIES)
+
+
+def test_symmetric_positions_score_alike(table: SolvedTable) -> None:
+    """A move scores the same as its image in every symmetric position."""
+    for x_mask, o_mask in reachable()[::37]:
+        scores = table.move_scores(x_mask, o_mask)
+        for perm in SYMMETRIES:
+            transformed = table.move_scores(
+                transform(x_mask, perm), transform(o_mask, perm)
+            )
+            assert transformed == {
+                i: scores[perm[i]] for i in range(9) if perm[i] in scores
+            }
+
+
+def test_save_and_load(table: SolvedTable, tmp_path: Path) -> None:
+    """A saved table loads with the same scores."""
+    path = str(tmp_path / "table.npy")
+    table.save(path)
+    loaded = SolvedTable.load(path)
+    assert len(loaded) == len(table)
+    assert loaded.move_scores(1 << 4, 1) == table.move_scores(1 << 4, 1)
+
+
+def test_engine_plays_perfectly_from_the_table(table: SolvedTable) -> None:
+    """An engine with the table plays a best move each turn, drawing against itself."""
+    engine = TttEngine(9, table=table, collect_stats=True)
+    board = TttBitboard()
+    while not board.game_over:
+        scores = table.move_scores(board.x_mask, board.o_mask)
+        move, stats = engine.search(board)
+        assert stats is not None
+        assert stats.tablebase_hits == 1
+        assert scores[move] == max(scores.values())
+        board.push(move)
+    assert board.is_draw
@@ -0,0 +1,92 @@
+import json
+from pathlib import Path
+
+from ai_project.checkers.bitboard import CheckersBitboard
+from ai_project.checkers.engine import CheckersEngine
+from ai_project.stats import SearchStats
+from ai_project.tic_tac_toe.bitboard import TttBitboard
+from ai_project.tic_tac_toe.engine import TttEngine
+from ai_project.utils import append_stats
+
+
+def test_counters_and_derived_values() -> None:
+    """Per-ply counts grow as needed and give the branching factors."""
+    stats = SearchStats()
+    stats.count_node(0)
+    stats.count_expansion(0, 3)
+    for _ in range(3):
+        stats.count_node(1)
+    stats.count_expansion(1, 4)
+    stats.count_node(2)
+    stats.count_cutoff(0)
+    stats.count_cutoff(2)
+    assert stats.nodes == 5
+    assert stats.nodes_per_ply == [1, 3, 1]
+    assert stats.branching_factors == [3, 4]
+    assert stats.effective_branching_factors == [3, 1]
+    assert stats.cutoff_move_index == [1, 0, 1]
+    assert stats.first_move_cutoff_rate == 0.5
+    assert stats.nodes_per_second == 0.0  # no time measured
+
+
+def test_merge_adds_counters() -> None:
+    """Merging adds every counter and per-ply count."""
+    stats, other = SearchStats(), SearchStats()
+    stats.count_node(0)
+    other.count_node(0)
+    other.count_node(1)
+    other.count_cutoff(1)
+    other.leaf_evals = 2
+    stats.merge(other)
+    assert stats.nodes == 3
+    assert stats.nodes_per_ply == [2, 1]
+    assert stats.cutoff_move_index == [0, 1]
+    assert stats.leaf_evals == 2
+
+
+def test_json_has_counters_and_derived_values(tmp_path: Path) -> None:
+    """Statistics are appended to a file as one JSON object per line."""
+    _, stats = TttEngine(3, collect_stats=True).search(TttBitboard())
+    assert stats is not None
+    path = tmp_path / "stats.jsonl"
+    append_stats(str(path), stats)
+    append_stats(str(path), stats)
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2
+    record = json.loads(lines[0])
+    assert record["nodes"] == stats.nodes
+    assert [(depth["depth"], depth["nodes"]) for depth in record["depths"]] == [
+        (3, stats.nodes)
+    ]
+    assert record["branching_factors"] == stats.branching_factors
+
+
+def test_search_counts_its_nodes() -> None:
+    """The statistics count the nodes the search visits, one root included."""
+    engine = CheckersEngine(4, collect_stats=True)
+    nodes = engine._nodes
+    _, stats = engine.search(CheckersBitboard())
+    assert stats is not None
+    assert stats.nodes_per_ply[0] == 1
+    assert sum(stats.nodes_per_ply) == stats.nodes
+    assert stats.nodes == engine._nodes - nodes + 1  # the root is not a node
+    assert stats.leaf_evals > 0
+    assert stats.beta_cutoffs == sum(stats.cutoff_move_index)
+    assert stats.tt_hits + stats.tt_misses > 0
+    assert stats.seconds > 0
+
+
+def test_iterative_deepening_records_each_depth() -> None:
+    """Every completed depth is recorded in order, with its own nodes."""
+    engine = CheckersEngine(1, time_budget_ms=100, collect_stats=True)
+    _, stats = engine.search(CheckersBitboard())
+    assert stats is not None
+    depths = [depth.depth for depth in stats.depths]
+    assert depths == list(range(1, len(depths) + 1))
+    assert len(depths) > 1
+    assert sum(depth.nodes for depth in stats.depths) <= stats.nodes
+
+
+def test_no_statistics_by_default() -> None:
+    """Engines that do not collect statistics return none."""
+    assert TttEngine(3).search(TttBitboard()).stats is None
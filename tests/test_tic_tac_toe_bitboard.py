@@ -0,0 +1,80 @@
+from ai_project.tic_tac_toe.bitboard import TttBitboard
+from ai_project.tic_tac_toe.board import WINNING_LINES, TttBoard, TttMark
+from ai_project.tic_tac_toe.engine import NUM_MARKS_VALUES, TttEngine
+
+
+def baseline_evaluate(board: TttBoard) -> int:
+    """The original evaluation, counting the marks of each line as a string."""
+    score = 0
+    for line in WINNING_LINES:
+        line_str = "".join(board[i] for i in line)
+        num_o = line_str.count(TttMark.o)
+        num_x = line_str.count(TttMark.x)
+        if num_x == 0:
+            score += NUM_MARKS_VALUES[num_o]
+        if num_o == 0:
+            score -= NUM_MARKS_VALUES[num_x]
+    return score
+
+
+def compare_subtree(
+    bitboard: TttBitboard, board: TttBoard, engine: TttEngine, seen: set[int]
+) -> None:
+    """Check that both boards agree on every position below not ``seen`` yet."""
+    if board.zobrist_key in seen:
+        return
+    seen.add(board.zobrist_key)
+    assert list(bitboard) == list(board)
+    assert str(bitboard) == str(board)
+    assert bitboard.turn == board.turn
+    assert bitboard.zobrist_key == board.zobrist_key
+    assert (bitboard.is_draw, bitboard.is_win_loss, bitboard.game_over) == (
+        board.is_draw,
+        board.is_win_loss,
+        board.game_over,
+    )
+    moves = list(bitboard.legal_moves)
+    assert moves == list(board.legal_moves)
+    if bitboard.game_over:
+        return
+    assert engine.evaluate(bitboard) == engine.evaluate(board)
+    assert engine.evaluate(board) == baseline_evaluate(board)
+    for move in moves:
+        bitboard.push(move)
+        board.push(move)
+        compare_subtree(bitboard, board, engine, seen)
+        bitboard.pop()
+        board.pop()
+
+
+def test_bitboard_matches_list_board() -> None:
+    """Both boards agree on every reachable position, and push/pop restore them."""
+    bitboard, board = TttBitboard(), TttBoard()
+    seen: set[int] = set()
+    compare_subtree(bitboard, board, TttEngine(1), seen)
+    assert len(seen) == 5478  # every reachable position
+    assert list(bitboard) == [TttMark.blank] * 9
+
+
+def test_set_marks_like_list_board() -> None:
+    """Setting marks directly updates the masks, the key and the game state."""
+    bitboard, board = TttBitboard(), TttBoard()
+    for position, mark in ((0, TttMark.x), (1, TttMark.x), (2, TttMark.x)):
+        bitboard[position] = board[position] = mark
+    assert bitboard.is_win_loss
+    assert board.is_win_loss
+    assert bitboard.zobrist_key == board.zobrist_key
+    bitboard[1] = board[1] = TttMark.o
+    assert not bitboard.is_win_loss
+    assert bitboard.zobrist_key == board.zobrist_key
+
+
+def test_engine_plays_the_same_moves() -> None:
+    """The engine picks the same moves on both boards."""
+    bitboard, board = TttBitboard(), TttBoard()
+    engine = TttEngine(9)
+    while not board.game_over:
+        move = engine.get_best_move(board)
+        assert engine.get_best_move(bitboard) == move
+        board.push(move)
+        bitboard.push(move)
@@ -0,0 +1,198 @@
+import random
+from math import inf
+
+import pytest
+
+from ai_project.checkers.bitboard import CheckersBitboard
+from ai_project.checkers.board import CheckersBoard
+from ai_project.checkers.engine import CheckersEngine
+from ai_project.engine import AbstractPlayer
+from ai_project.tic_tac_toe.board import TttBoard
+from ai_project.tic_tac_toe.engine import TttEngine
+from ai_project.transposition import ZOBRIST_TURN, Bound, TranspositionTable
+
+
+def test_probe_returns_stored_entry() -> None:
+    """A stored entry is found by its key and counted as a hit."""
+    table = TranspositionTable(0.01)
+    table.store(42, 3, 1.5, Bound.EXACT, "move")
+    entry = table.probe(42)
+    assert entry is not None
+    assert (entry.depth, entry.score, entry.bound, entry.move) == (
+        3,
+        1.5,
+        Bound.EXACT,
+        "move",
+    )
+    assert table.probe(43) is None
+    assert (table.hits, table.misses) == (1, 1)
+
+
+def test_other_position_in_slot_is_a_collision() -> None:
+    """A key sharing a slot with a stored one misses and counts a collision."""
+    table = TranspositionTable(0.01)
+    table.store(1, 3, 0, Bound.EXACT, None)
+    assert table.probe(1 + table.capacity) is None
+    assert table.collisions == 1
+
+
+def test_replacement_prefers_depth() -> None:
+    """A shallower entry does not replace a deeper one of the same search."""
+    table = TranspositionTable(0.01)
+    other = 7 + table.capacity  # same slot as key 7
+    table.store(7, 5, 1, Bound.EXACT, None)
+    table.store(other, 4, 2, Bound.EXACT, None)
+    assert table.probe(other) is None
+    table.store(other, 5, 3, Bound.EXACT, None)
+    entry = table.probe(other)
+    assert entry is not None
+    assert entry.score == 3
+
+
+def test_replacement_of_same_position_and_older_searches() -> None:
+    """The same position and entries of older searches are always replaced."""
+    table = TranspositionTable(0.01)
+    table.store(7, 5, 1, Bound.EXACT, None)
+    table.store(7, 2, 2, Bound.LOWER, None)
+    entry = table.probe(7)
+    assert entry is not None
+    assert (entry.depth, entry.score) == (2, 2)
+
+    table.store(9, 8, 1, Bound.EXACT, None)
+    table.new_search()
+    other = 9 + table.capacity
+    table.store(other, 1, 2, Bound.EXACT, None)
+    assert table.probe(other) is not None
+
+
+def test_clear_removes_entries() -> None:
+    """Clearing empties the table and resets its counters."""
+    table = TranspositionTable(0.01)
+    table.store(1, 1, 0, Bound.EXACT, None)
+    table.probe(1)
+    table.clear()
+    assert len(table) == 0
+    assert table.hits == 0
+
+
+def test_size_must_be_positive() -> None:
+    """A table needs some memory."""
+    with pytest.raises(ValueError):
+        TranspositionTable(0)
+
+
+@pytest.mark.parametrize(
+    ("bound", "score", "cutoff"),
+    [
+        (Bound.EXACT, 5, True),
+        (Bound.LOWER, 10, True),
+        (Bound.LOWER, 9, False),
+        (Bound.UPPER, 0, True),
+        (Bound.UPPER, 1, False),
+    ],
+)
+def test_bounds_cut_off_outside_window(
+    bound: Bound, score: float, cutoff: bool
+) -> None:
+    """Lower bounds cut off at beta and above, upper bounds at alpha and below."""
+    engine = TttEngine(4, tt_size_mb=0.01)
+    board = TttBoard()
+    assert engine.tt is not None
+    engine.tt.store(board.zobrist_key, 4, score, bound, 4)
+    probed, move = engine._probe_tt(board, 4, 0, 10)
+    assert probed == (score if cutoff else None)
+    assert move == 4
+
+
+def test_shallower_entries_do_not_cut_off() -> None:
+    """Only scores searched at least as deep as the node cut it off."""
+    engine = TttEngine(4, tt_size_mb=0.01)
+    board = TttBoard()
+    assert engine.tt is not None
+    engine.tt.store(board.zobrist_key, 3, 5, Bound.EXACT, None)
+    assert engine._probe_tt(board, 4, -inf, inf)[0] is None
+    assert engine._probe_tt(board, 3, -inf, inf)[0] == 5
+
+
+def test_table_keeps_solved_values() -> None:
+    """Solving tic-tac-toe with the table gives the values of the plain search."""
+    board = TttBoard()
+    for first in range(9):
+        board.push(first)
+        values = [
+            TttEngine(9, tt_size_mb=tt_size_mb).alpha_beta(
+                board, 8, -inf, inf, is_min_turn=True
+            )
+            for tt_size_mb in (0, 1)
+        ]
+        board.pop()
+        assert values[0] == values[1], first
+
+
+def test_tic_tac_toe_key_is_incremental() -> None:
+    """The key kept by push and pop is that of the marks and the side to move."""
+    board = TttBoard()
+    moves = random.Random(0).sample(range(9), 7)
+    for move in moves:
+        board.push(move)
+    direct = TttBoard()
+    for move in moves:
+        direct[move] = board[move]
+    assert board.zobrist_key == direct.zobrist_key ^ ZOBRIST_TURN  # O to move
+    for _ in moves:
+        board.pop()
+    assert board.zobrist_key == 0
+
+
+def test_checkers_key_is_incremental() -> None:
+    """The key kept by push and pop equals the key computed from scratch."""
+    rng = random.Random(0)
+    board = CheckersBoard()
+    plies = 0
+    while not board.game_over and plies < 80:
+        board.push(rng.choice(list(board.legal_moves)))
+        plies += 1
+        assert board.zobrist_key == board.compute_zobrist_key()
+    while plies:
+        board.pop()
+        plies -= 1
+        assert board.zobrist_key == board.compute_zobrist_key()
+
+
+@pytest.mark.parametrize(
+    ("exact_tt_depth", "stored_depth", "cutoff"),
+    [
+        (False, 5, True),
+        (False, 4, True),
+        (False, 3, False),
+        (True, 5, False),
+        (True, 4, True),
+        (True, 1000, True),
+    ],
+)
+def test_depth_of_entries_that_cut_off(
+    exact_tt_depth: bool, stored_depth: int, cutoff: bool
+) -> None:
+    """Deeper entries cut off, unless only the same depth (or a solved one) may."""
+    engine = TttEngine(4, tt_size_mb=0.01, exact_tt_depth=exact_tt_depth)
+    board = TttBoard()
+    assert engine.tt is not None
+    engine.tt.store(board.zobrist_key, stored_depth, 5, Bound.EXACT, None)
+    probed, _ = engine._probe_tt(board, 4, -inf, inf)
+    assert (probed is not None) == cutoff
+
+
+def test_exact_depth_table_does_not_change_search(
+    checkers_positions: list[CheckersBitboard],
+) -> None:
+    """With exact_tt_depth, the table only saves nodes."""
+    for board in checkers_positions[::300]:
+        results = []
+        for tt_size_mb in (0, 1):
+            engine = CheckersEngine(5, tt_size_mb=tt_size_mb, exact_tt_depth=True)
+            is_min_turn = board.turn.value == AbstractPlayer.MIN
+            value = engine.alpha_beta(board, 5, -inf, inf, is_min_turn=is_min_turn)
+            results.append((value, engine._nodes))
+        (value, nodes), (tt_value, tt_nodes) = results
+        assert tt_value == value, board
+        assert tt_nodes <= nodes
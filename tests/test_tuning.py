@@ -0,0 +1,79 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ai_project import tuning
+from ai_project.arena import EngineConfig
+from ai_project.checkers.engine import CheckersEngine, CheckersWeights
+from ai_project.tic_tac_toe.engine import TttWeights
+from ai_project.tuning import (
+    fit_scale,
+    load_dataset,
+    mean_squared_error,
+    play_labelled_game,
+    tune_weights,
+)
+from ai_project.weights import load_weights, save_weights
+
+CONFIG = EngineConfig(1)
+
+
+def test_dataset_is_cached_at_the_given_path(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A second load with the same games reads the cache instead of playing."""
+    cache = str(tmp_path / "positions.cache")  # no ".npz" is appended
+    features, labels = load_dataset("tic-tac-toe", cache, CONFIG, games=4)
+    assert [path.name for path in tmp_path.iterdir()] == ["positions.cache"]
+    assert len(features) == len(labels) > 0
+
+    def fail(*args: object) -> None:
+        raise AssertionError("the games were played again")
+
+    monkeypatch.setattr(tuning, "play_labelled_game", fail)
+    cached = load_dataset("tic-tac-toe", cache, CONFIG, games=4)
+    np.testing.assert_array_equal(cached[0], features)
+    np.testing.assert_array_equal(cached[1], labels)
+    with pytest.raises(AssertionError):
+        load_dataset("tic-tac-toe", cache, CONFIG, games=5)
+
+
+def test_labelled_games_replay_exactly() -> None:
+    """A game is determined by its seed; its result is a win, draw or loss."""
+    games = [play_labelled_game("checkers", CONFIG, 7, 4, 60, 3) for _ in range(2)]
+    assert games[0] == games[1]
+    positions, result = games[0]
+    assert positions
+    assert result in (0.0, 0.5, 1.0)
+
+
+def test_tuning_lowers_the_error(tmp_path: Path) -> None:
+    """Gradient descent from the hand-picked weights fits the results better."""
+    features, labels = load_dataset(
+        "checkers", str(tmp_path / "positions.npz"), CONFIG, games=6, max_plies=80
+    )
+    weights = np.array(CheckersEngine(1).weights, dtype=np.float64)
+    scale = fit_scale(features, labels, weights)
+    tuned = tune_weights(features, labels, weights, scale, iterations=200)
+    assert mean_squared_error(features, labels, tuned, scale) < mean_squared_error(
+        features, labels, weights, scale
+    )
+
+
+def test_weights_round_trip(tmp_path: Path) -> None:
+    """Saved weights load back; missing ones keep their defaults."""
+    path = str(tmp_path / "weights.json")
+    weights = CheckersWeights(9.89, 12.47, -1.33, -0.53)
+    save_weights(path, weights)
+    assert load_weights(path, CheckersWeights) == weights
+    (tmp_path / "weights.json").write_text('{"two_marks": 2.5}')
+    assert load_weights(path, TttWeights) == TttWeights()._replace(two_marks=2.5)
+
+
+def test_unknown_weights_are_rejected(tmp_path: Path) -> None:
+    """Weights of another game raise a ValueError."""
+    path = str(tmp_path / "weights.json")
+    save_weights(path, CheckersWeights())
+    with pytest.raises(ValueError):
+        load_weights(path, TttWeights)